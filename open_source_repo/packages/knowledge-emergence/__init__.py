@@ -9,7 +9,17 @@ from .quality_assessor import QualityAssessor, QualityScore
 from .pattern_recognizer import PatternRecognizer, Pattern
 from .value_assessor import ValueAssessor, ValueAssessment
 from .visualizer import Visualizer
-from .report_generator import ReportGenerator
+from .report_generator import ReportGenerator, ReportModel
+from .document_cache import DocumentCache, AnalyzedDocument
+from .state_store import AnalysisStateStore
+from .stage_executor import StageExecutor, Stage
+from .profiler import PipelineProfiler
+from .minhash import MinHasher
+from .near_duplicates import NearDuplicateFilter
+from .emergence_stream import StreamingEmergenceCalculator
+from .sampling import StratifiedReservoirSampler
+from .concept_graph import ConceptGraph
+from .time_index import TimeIndex
 from .main import KnowledgeEmergenceAnalyzer
 
 __version__ = '1.0.0'
@@ -28,5 +38,18 @@ __all__ = [
     'ValueAssessment',
     'Visualizer',
     'ReportGenerator',
+    'ReportModel',
+    'DocumentCache',
+    'AnalyzedDocument',
+    'AnalysisStateStore',
+    'StageExecutor',
+    'Stage',
+    'PipelineProfiler',
+    'MinHasher',
+    'NearDuplicateFilter',
+    'StreamingEmergenceCalculator',
+    'StratifiedReservoirSampler',
+    'ConceptGraph',
+    'TimeIndex',
     'KnowledgeEmergenceAnalyzer'
 ]
\ No newline at end of file
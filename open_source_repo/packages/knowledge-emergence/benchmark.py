@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+知识涌现分析工具性能基准
+生成指定规模的合成语料，测量各分析模块的耗时和吞吐量，输出机器可读的 JSON 结果，
+并可与上一版本的结果对比以发现性能回退
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable
+from datetime import datetime, timedelta
+
+# 添加当前目录到Python路径
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+import numpy as np
+
+from data_collector import compute_data_hash
+from document_cache import DocumentCache
+from metrics_calculator import MetricsCalculator
+from quality_assessor import QualityAssessor
+from pattern_recognizer import PatternRecognizer
+from value_assessor import ValueAssessor
+from report_generator import ReportGenerator
+from profiler import get_peak_rss_mb
+
+
+BENCHMARK_VERSION = '1.0'
+
+# 合成语料词表：领域 -> (中文术语, 英文术语)
+DOMAIN_TERMS = {
+    'technology': (
+        ['人工智能', '深度学习', '神经网络', '算法', '大模型', '云计算', '芯片', '数据平台', '开源软件'],
+        ['artificial', 'intelligence', 'learning', 'neural', 'network', 'algorithm', 'computing',
+         'software', 'platform', 'processor']
+    ),
+    'healthcare': (
+        ['医疗诊断', '医学影像', '临床试验', '基因治疗', '药物研发', '疾病预测', '健康管理'],
+        ['medical', 'diagnosis', 'clinical', 'therapy', 'genome', 'patient', 'treatment', 'health']
+    ),
+    'finance': (
+        ['金融风控', '量化投资', '区块链', '数字货币', '市场分析', '信用评估', '支付系统'],
+        ['finance', 'market', 'investment', 'blockchain', 'credit', 'trading', 'payment', 'economic']
+    ),
+    'education': (
+        ['在线教育', '个性化学习', '教学评估', '知识图谱', '课程设计', '学习分析'],
+        ['education', 'learning', 'student', 'course', 'teaching', 'knowledge', 'curriculum']
+    ),
+    'environment': (
+        ['气候变化', '碳排放', '可再生能源', '生态保护', '环境监测', '储能技术'],
+        ['climate', 'carbon', 'renewable', 'energy', 'ecosystem', 'emission', 'sustainability']
+    )
+}
+
+ZH_TEMPLATES = [
+    '{a}技术在{b}领域展现出巨大潜力。',
+    '研究表明，{a}能够显著提升{b}的效率。',
+    '数据显示，{a}与{b}的结合带来了创新的解决方案。',
+    '根据实验结果，{a}方法在{b}任务上优于传统方法。',
+    '然而，{a}在{b}中的应用仍面临成本和可行性挑战。',
+    '专家认为，{a}将推动{b}行业的发展。',
+    '首先需要分析{a}的原理，其次评估{b}的市场价值。'
+]
+
+EN_TEMPLATES = [
+    'Recent research shows that {a} improves {b} significantly.',
+    'According to the data, {a} and {b} create innovative solutions.',
+    'The study analyzes how {a} methods outperform traditional {b} approaches.',
+    'However, applying {a} to {b} still faces cost and feasibility challenges.',
+    'Experts believe {a} will drive the development of the {b} industry.',
+    'First we evaluate the {a} principle, then the market value of {b}.'
+]
+
+SOURCES = ['学术期刊', '研究报告', '行业白皮书', 'Journal of Applied Science', 'Tech Review', '新闻报道', '技术博客']
+AUTHORS = ['张研究员', '李教授', '王博士', 'Dr. Smith', 'Prof. Chen', 'Analyst Team']
+
+
+def generate_synthetic_corpus(n_items: int, seed: int = 42, zh_ratio: float = 0.5,
+                              start: str = '2024-01-01', days: int = 365) -> List[Dict[str, Any]]:
+    """生成合成知识项
+
+    文本由领域术语和模板句子组合而成，中英文按 zh_ratio 混合；采集时间在 [start, start + days)
+    内分布，叠加少量突发时段，使时间模式检测有可识别的信号
+    """
+    rng = random.Random(seed)
+    domains = list(DOMAIN_TERMS)
+    start_time = datetime.fromisoformat(start)
+    span = days * 86400
+
+    # 突发时段：少数几天集中了更多知识项
+    burst_centers = [rng.uniform(0, span) for _ in range(max(1, days // 60))]
+
+    items = []
+    for i in range(n_items):
+        domain = rng.choice(domains)
+        related = rng.choice(domains)
+        zh_terms, en_terms = DOMAIN_TERMS[domain]
+        is_zh = rng.random() < zh_ratio
+
+        if is_zh:
+            terms = zh_terms + DOMAIN_TERMS[related][0]
+            sentences = [rng.choice(ZH_TEMPLATES).format(a=rng.choice(terms), b=rng.choice(terms))
+                         for _ in range(rng.randint(3, 8))]
+            content = ''.join(sentences)
+            title = f"{rng.choice(zh_terms)}与{rng.choice(DOMAIN_TERMS[related][0])}的研究进展"
+        else:
+            terms = en_terms + DOMAIN_TERMS[related][1]
+            sentences = [rng.choice(EN_TEMPLATES).format(a=rng.choice(terms), b=rng.choice(terms))
+                         for _ in range(rng.randint(3, 8))]
+            content = ' '.join(sentences)
+            title = f"Advances in {rng.choice(en_terms)} and {rng.choice(DOMAIN_TERMS[related][1])}"
+
+        if rng.random() < 0.2:
+            offset = rng.gauss(rng.choice(burst_centers), 86400 * 2)
+        else:
+            offset = rng.uniform(0, span)
+        collection_time = start_time + timedelta(seconds=min(max(offset, 0), span - 1))
+
+        item = {
+            'title': title,
+            'content': content,
+            'source': rng.choice(SOURCES),
+            'author': rng.choice(AUTHORS),
+            'publication_date': (collection_time - timedelta(days=rng.randint(0, 30))).strftime('%Y-%m-%d'),
+            'tags': rng.sample(zh_terms if is_zh else en_terms, 3),
+            'importance': rng.randint(1, 10),
+            'citations': int(rng.expovariate(1 / 20)),
+            'category': domain,
+            'keywords': rng.sample(en_terms, 2),
+            'quality_score': round(rng.uniform(0.4, 1.0), 2),
+            'relevance_score': round(rng.uniform(0.3, 1.0), 2)
+        }
+        item['_source'] = 'synthetic'
+        item['_collection_time'] = collection_time.isoformat()
+        item['_data_hash'] = compute_data_hash(item)
+        items.append(item)
+
+    return items
+
+
+def _measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """多次执行并记录耗时，返回最短耗时等统计和最后一次的结果"""
+    wall_times = []
+    cpu_times = []
+    result = None
+    status = 'success'
+    error = None
+
+    for _ in range(repeat):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            result = func()
+        except Exception as e:
+            status = 'error'
+            error = str(e)
+        wall_times.append(time.perf_counter() - wall_start)
+        cpu_times.append(time.process_time() - cpu_start)
+
+    measurement = {
+        'status': status,
+        'wall_time': round(min(wall_times), 6),
+        'wall_time_median': round(statistics.median(wall_times), 6),
+        'cpu_time': round(min(cpu_times), 6),
+        'repeat': repeat,
+        'peak_rss_mb': get_peak_rss_mb(),
+        'result': result
+    }
+    if error:
+        measurement['error'] = error
+    return measurement
+
+
+def _as_dicts(objects: List[Any]) -> List[Any]:
+    """把评估结果数据类转换为字典"""
+    return [obj.__dict__ if hasattr(obj, '__dict__') else obj for obj in objects]
+
+
+class BenchmarkRunner:
+    """基准测试执行器"""
+
+    def __init__(self, repeat: int = 1, only: List[str] = None, use_document_cache: bool = True,
+                 output_dir: str = None):
+        self.repeat = max(1, repeat)
+        self.only = only or []
+        self.use_document_cache = use_document_cache
+        self.output_dir = output_dir or tempfile.mkdtemp(prefix='ke_benchmark_')
+
+    def _selected(self, name: str) -> bool:
+        return not self.only or any(name.startswith(prefix) for prefix in self.only)
+
+    def run_size(self, n_items: int, seed: int = 42) -> List[Dict[str, Any]]:
+        """在一个语料规模上运行全部基准"""
+        records = []
+
+        def record(name: str, func: Callable[[], Any], items: int = n_items, force: bool = False) -> Any:
+            """执行基准；force 为 True 时即使未被选中也执行（为后续基准准备输入），但不记录"""
+            selected = self._selected(name)
+            if not selected and not force:
+                return None
+
+            measurement = _measure(func, self.repeat if selected else 1)
+            result = measurement.pop('result')
+            if selected:
+                wall_time = measurement['wall_time']
+                measurement.update({
+                    'benchmark': name,
+                    'size': n_items,
+                    'items_per_second': round(items / wall_time, 2) if wall_time > 0 else None
+                })
+                records.append(measurement)
+                print(f"{name} [{n_items}]: {wall_time:.3f}s ({measurement['status']})")
+            return result
+
+        generation_start = time.perf_counter()
+        knowledge_items = generate_synthetic_corpus(n_items, seed=seed)
+        print(f"生成 {n_items} 条合成知识项，耗时 {time.perf_counter() - generation_start:.2f}s")
+
+        metrics_calculator = MetricsCalculator({})
+        quality_assessor = QualityAssessor({})
+        pattern_recognizer = PatternRecognizer({})
+        value_assessor = ValueAssessor({})
+        report_generator = ReportGenerator({'output_dir': str(Path(self.output_dir) / f'reports_{n_items}')})
+
+        # 与分析器一致：构建一次文档缓存并注入各模块
+        if self.use_document_cache:
+            document_cache = record('document_cache.build', lambda: DocumentCache(knowledge_items), force=True)
+            for module in (metrics_calculator, quality_assessor, pattern_recognizer, value_assessor):
+                module.document_cache = document_cache
+
+        need_reports = self._selected('reports.')
+
+        metrics = record('metrics.calculate_all_metrics',
+                         lambda: metrics_calculator.calculate_all_metrics(knowledge_items),
+                         force=need_reports)
+        quality_scores = record('quality.assess_batch_quality',
+                                lambda: quality_assessor.assess_batch_quality(knowledge_items),
+                                force=need_reports)
+
+        # 模式识别按子检测方法分别计时，时间模式检测使用按采集时间排序后的知识项
+        sorted_items = sorted(knowledge_items, key=lambda x: x.get('_collection_time', ''))
+        detectors = {
+            'temporal': ['_detect_periodic_patterns', '_detect_trend_patterns',
+                         '_detect_burst_patterns', '_detect_convergence_patterns'],
+            'content': ['_detect_topic_evolution', '_detect_concept_associations',
+                        '_detect_domain_patterns', '_detect_quality_patterns'],
+            'structural': ['_detect_network_patterns', '_detect_hierarchy_patterns',
+                           '_detect_clustering_patterns'],
+            'emergence': ['_detect_self_organization', '_detect_synergy_effects',
+                          '_detect_phase_transitions', '_detect_critical_points']
+        }
+        patterns = []
+        for group, methods in detectors.items():
+            group_items = sorted_items if group == 'temporal' else knowledge_items
+            for method_name in methods:
+                detector = getattr(pattern_recognizer, method_name)
+                found = record(f'patterns.{method_name.lstrip("_")}',
+                               lambda detector=detector, group_items=group_items: detector(group_items),
+                               force=need_reports)
+                patterns.extend(_as_dicts(found or []))
+
+        value_assessments = record('value.assess_batch_value',
+                                   lambda: value_assessor.assess_batch_value(knowledge_items),
+                                   force=need_reports)
+
+        if need_reports:
+            analysis_results = {
+                'knowledge_items': knowledge_items,
+                'metrics': metrics or {},
+                'quality_scores': _as_dicts(quality_scores or []),
+                'patterns': patterns,
+                'value_assessments': _as_dicts(value_assessments or [])
+            }
+            record('reports.generate_batch_reports',
+                   lambda: report_generator.generate_batch_reports(analysis_results))
+
+        return records
+
+
+def run_benchmarks(sizes: List[int], repeat: int = 1, only: List[str] = None, seed: int = 42,
+                   use_document_cache: bool = True, output_dir: str = None) -> Dict[str, Any]:
+    """在多个语料规模上运行基准，返回可序列化的结果"""
+    runner = BenchmarkRunner(repeat=repeat, only=only, use_document_cache=use_document_cache,
+                             output_dir=output_dir)
+    start = time.perf_counter()
+
+    results = []
+    for size in sizes:
+        results.extend(runner.run_size(size, seed=seed))
+
+    return {
+        'metadata': {
+            'benchmark_version': BENCHMARK_VERSION,
+            'generation_time': datetime.now().isoformat(),
+            'python_version': platform.python_version(),
+            'numpy_version': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'sizes': sizes,
+            'repeat': repeat,
+            'seed': seed,
+            'document_cache': use_document_cache,
+            'total_time': round(time.perf_counter() - start, 3)
+        },
+        'results': results
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2,
+                    min_time: float = 0.01) -> List[Dict[str, Any]]:
+    """与基线结果对比，返回耗时增加超过 threshold 的基准
+
+    基线耗时低于 min_time 的基准噪声较大，不参与比较
+    """
+    baseline_times = {
+        (record['benchmark'], record['size']): record['wall_time']
+        for record in baseline.get('results', [])
+        if record.get('status') == 'success'
+    }
+
+    regressions = []
+    for record in current.get('results', []):
+        key = (record['benchmark'], record['size'])
+        base_time = baseline_times.get(key)
+        if base_time is None or base_time < min_time or record.get('status') != 'success':
+            continue
+
+        ratio = record['wall_time'] / base_time
+        if ratio > 1 + threshold:
+            regressions.append({
+                'benchmark': record['benchmark'],
+                'size': record['size'],
+                'baseline_time': base_time,
+                'current_time': record['wall_time'],
+                'ratio': round(ratio, 3)
+            })
+
+    return regressions
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='知识涌现分析工具性能基准')
+    parser.add_argument('--sizes', type=str, default='1000,10000',
+                        help='语料规模列表（用逗号分隔），如 1000,10000,100000')
+    parser.add_argument('--repeat', type=int, default=1, help='每个基准的重复次数，取最短耗时')
+    parser.add_argument('--only', type=str,
+                        help='只运行名称以指定前缀开头的基准（用逗号分隔），如 metrics.,patterns.')
+    parser.add_argument('--seed', type=int, default=42, help='合成语料随机种子')
+    parser.add_argument('--no-document-cache', action='store_true', help='不向各模块注入文档缓存')
+    parser.add_argument('--output', '-o', type=str, default='benchmark_results.json', help='结果文件路径')
+    parser.add_argument('--compare', type=str, help='基线结果文件，耗时增加超过阈值时以非零状态退出')
+    parser.add_argument('--threshold', type=float, default=0.2, help='回退判定阈值（相对增幅）')
+    parser.add_argument('--save-corpus', type=str, help='只生成合成语料并保存为 JSON Lines 文件')
+
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+    if args.save_corpus:
+        with open(args.save_corpus, 'w', encoding='utf-8') as f:
+            for item in generate_synthetic_corpus(sizes[0], seed=args.seed):
+                f.write(json.dumps(item, ensure_ascii=False) + '\n')
+        print(f"合成语料已保存: {args.save_corpus}")
+        return 0
+
+    only = [prefix.strip() for prefix in args.only.split(',')] if args.only else None
+    results = run_benchmarks(sizes, repeat=args.repeat, only=only, seed=args.seed,
+                             use_document_cache=not args.no_document_cache)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"基准结果已保存: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"性能回退: {regression['benchmark']} [{regression['size']}] "
+                  f"{regression['baseline_time']:.3f}s -> {regression['current_time']:.3f}s "
+                  f"(x{regression['ratio']})")
+        if regressions:
+            return 1
+        print("未发现性能回退")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,297 @@
+"""
+列式存储
+以 Parquet 或 Arrow IPC 格式读写知识项和评估结果，需要安装可选依赖 pyarrow
+"""
+
+import json
+import numbers
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 为可选依赖
+    pa = None
+    pq = None
+
+
+logger = logging.getLogger(__name__)
+
+# 格式 -> 默认扩展名
+COLUMNAR_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# 扩展名 -> 格式
+FORMAT_BY_SUFFIX = {'.parquet': 'parquet', '.arrow': 'arrow', '.feather': 'arrow', '.ipc': 'arrow'}
+
+# 写入 schema 元信息的键，记录需要还原的列
+_METADATA_KEY = b'knowledge_emergence'
+
+# 存在缺失键时附加的列，逐行记录该行缺失的键（JSON 列表），用于区分缺失的键和值为 None 的键
+_MISSING_KEYS_COLUMN = '__missing_keys__'
+
+
+def is_available() -> bool:
+    """是否安装了 pyarrow"""
+    return pa is not None
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("列式存储需要安装 pyarrow: pip install pyarrow")
+
+
+def format_for_path(path: str) -> Optional[str]:
+    """根据扩展名判断列式格式，非列式文件返回 None"""
+    return FORMAT_BY_SUFFIX.get(Path(path).suffix.lower())
+
+
+def _column_kind(values: List[Any]) -> str:
+    """推断列类型：bool、int、float、string、null 或 json（列表、字典及混合类型序列化为 JSON 字符串）"""
+    kinds = set()
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            kinds.add('bool')
+        elif isinstance(value, numbers.Integral):
+            kinds.add('int')
+        elif isinstance(value, numbers.Real):
+            kinds.add('float')
+        elif isinstance(value, str):
+            kinds.add('string')
+        else:
+            return 'json'
+
+    if not kinds:
+        return 'null'
+    if kinds == {'int', 'float'}:
+        return 'float'
+    if len(kinds) == 1:
+        return kinds.pop()
+    return 'json'
+
+
+def _infer_schema(records: List[Dict[str, Any]]) -> Tuple[Any, Dict[str, Any]]:
+    """按全部记录推断 schema，返回 (schema, 还原信息)"""
+    columns: Dict[str, List[Any]] = {}
+    present: Dict[str, int] = {}
+    for record in records:
+        for key, value in record.items():
+            columns.setdefault(key, []).append(value)
+            present[key] = present.get(key, 0) + 1
+
+    arrow_types = {
+        'bool': pa.bool_(),
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'string': pa.large_string(),
+        'json': pa.large_string(),
+        'null': pa.null()
+    }
+
+    fields = []
+    json_columns = []
+    for key, values in columns.items():
+        kind = _column_kind(values)
+        # 超出 int64 范围的整数按 JSON 保存
+        if kind == 'int' and any(value is not None and not -2 ** 63 <= value < 2 ** 63 for value in values):
+            kind = 'json'
+        if kind == 'json':
+            json_columns.append(key)
+        fields.append(pa.field(key, arrow_types[kind]))
+
+    restore = {
+        'json_columns': json_columns,
+        # 部分记录中缺失的列，读取时按缺失键列删除对应的键
+        'sparse_columns': [key for key, count in present.items() if count < len(records)]
+    }
+    if restore['sparse_columns']:
+        restore['missing_keys_column'] = _MISSING_KEYS_COLUMN
+        fields.append(pa.field(_MISSING_KEYS_COLUMN, pa.large_string()))
+    metadata = {_METADATA_KEY: json.dumps(restore, ensure_ascii=False).encode('utf-8')}
+    return pa.schema(fields, metadata=metadata), restore
+
+
+def _to_record_batch(records: List[Dict[str, Any]], schema, restore: Dict[str, Any]):
+    """把一批记录转换为 RecordBatch"""
+    json_set = set(restore['json_columns'])
+    arrays = []
+    for field in schema:
+        if field.name == restore.get('missing_keys_column'):
+            values = []
+            for record in records:
+                missing = [key for key in restore['sparse_columns'] if key not in record]
+                values.append(json.dumps(missing, ensure_ascii=False) if missing else None)
+            arrays.append(pa.array(values, type=field.type))
+            continue
+
+        values = [record.get(field.name) for record in records]
+        if field.name in json_set:
+            values = [None if value is None else json.dumps(value, ensure_ascii=False, default=str)
+                      for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_records(records: List[Dict[str, Any]], path: str, format: str = None,
+                  batch_size: int = 50000) -> str:
+    """把记录列表写入 Parquet 或 Arrow IPC 文件，按批转换以限制内存峰值"""
+    _require_pyarrow()
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    format = format or format_for_path(str(path)) or 'parquet'
+    if format not in COLUMNAR_FORMATS:
+        raise ValueError(f"不支持的列式格式: {format}")
+
+    schema, restore = _infer_schema(records)
+    batches = (
+        _to_record_batch(records[i:i + batch_size], schema, restore)
+        for i in range(0, len(records), batch_size)
+    )
+
+    if format == 'parquet':
+        with pq.ParquetWriter(str(path), schema, compression='zstd') as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+    else:
+        with pa.OSFile(str(path), 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+
+    logger.info(f"已写入 {len(records)} 条记录到 {path}")
+    return str(path)
+
+
+def _restore_info(schema) -> Dict[str, Any]:
+    """读取 schema 中记录的还原信息"""
+    metadata = schema.metadata or {}
+    if _METADATA_KEY in metadata:
+        return json.loads(metadata[_METADATA_KEY].decode('utf-8'))
+    return {'json_columns': [], 'sparse_columns': []}
+
+
+def _restore_records(records: List[Dict[str, Any]], restore: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """还原 JSON 列和缺失的键
+
+    没有缺失键列时（旧版本写入的文件）按丢弃稀疏列空值的方式还原
+    """
+    json_columns = restore.get('json_columns', [])
+    sparse_columns = restore.get('sparse_columns', [])
+    missing_keys_column = restore.get('missing_keys_column')
+    if not json_columns and not sparse_columns:
+        return records
+
+    for record in records:
+        if missing_keys_column in record:
+            missing = record.pop(missing_keys_column)
+            for key in json.loads(missing) if missing else ():
+                record.pop(key, None)
+        else:
+            for key in sparse_columns:
+                if key in record and record[key] is None:
+                    del record[key]
+        for key in json_columns:
+            value = record.get(key)
+            if value is not None:
+                record[key] = json.loads(value)
+    return records
+
+
+def read_schema(path: str):
+    """读取文件的 schema"""
+    _require_pyarrow()
+
+    if format_for_path(path) == 'arrow':
+        with pa.memory_map(str(path), 'r') as source:
+            return pa.ipc.open_file(source).schema
+    return pq.read_schema(str(path))
+
+
+def read_table(path: str, memory_map: bool = True, columns: List[str] = None):
+    """读取为 pyarrow.Table；Arrow IPC 文件以内存映射方式零拷贝读取，存在缺失键时表中含缺失键列"""
+    _require_pyarrow()
+
+    if format_for_path(path) == 'arrow':
+        source = pa.memory_map(str(path), 'r') if memory_map else pa.OSFile(str(path), 'rb')
+        table = pa.ipc.open_file(source).read_all()
+        return table.select(columns) if columns else table
+
+    return pq.read_table(str(path), columns=columns, memory_map=memory_map)
+
+
+def _project_columns(path: str, columns: Optional[List[str]]) -> Optional[List[str]]:
+    """只保留文件中存在的列；存在缺失键列时一并读取，以便还原缺失的键"""
+    if columns is None:
+        return None
+    schema = read_schema(path)
+    projected = [column for column in columns if column in schema.names]
+    missing_keys_column = _restore_info(schema).get('missing_keys_column')
+    if missing_keys_column and missing_keys_column not in projected:
+        projected.append(missing_keys_column)
+    return projected
+
+
+def read_records(path: str, memory_map: bool = True, columns: List[str] = None) -> List[Dict[str, Any]]:
+    """读取为记录列表，还原写入时序列化的嵌套字段；指定 columns 时只读取其中存在的列"""
+    table = read_table(path, memory_map=memory_map, columns=_project_columns(path, columns))
+    return _restore_records(table.to_pylist(), _restore_info(table.schema))
+
+
+def iter_record_batches(path: str, batch_size: int = 1000,
+                        columns: List[str] = None) -> Iterator[List[Dict[str, Any]]]:
+    """按批流式读取记录；指定 columns 时只读取其中存在的列"""
+    _require_pyarrow()
+    columns = _project_columns(path, columns)
+
+    if format_for_path(path) == 'arrow':
+        with pa.memory_map(str(path), 'r') as source:
+            reader = pa.ipc.open_file(source)
+            restore = _restore_info(reader.schema)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for offset in range(0, batch.num_rows, batch_size):
+                    yield _restore_records(batch.slice(offset, batch_size).to_pylist(), restore)
+        return
+
+    parquet_file = pq.ParquetFile(str(path), memory_map=True)
+    restore = _restore_info(parquet_file.schema_arrow)
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        yield _restore_records(batch.to_pylist(), restore)
+
+
+def count_records(path: str) -> int:
+    """读取文件元信息中的记录数，不读取数据"""
+    _require_pyarrow()
+
+    if format_for_path(path) == 'arrow':
+        with pa.memory_map(str(path), 'r') as source:
+            reader = pa.ipc.open_file(source)
+            return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+    return pq.ParquetFile(str(path)).metadata.num_rows
+
+
+class RecordTable:
+    """列式文件的只读记录序列
+
+    长度取自文件元信息，每次迭代按批读取并转换记录，不在内存中保留完整的记录列表；
+    用于只需顺序遍历一次的场景（例如把完整记录写入 JSON 报告）
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000, columns: List[str] = None):
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.columns = columns
+        self._length = count_records(self.path)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for batch in iter_record_batches(self.path, self.batch_size, columns=self.columns):
+            yield from batch
@@ -0,0 +1,19 @@
+"""
+pytest 配置
+包目录名含连字符，__init__.py 中的相对导入无法按包加载；测试模块以同级导入的方式使用各模块，
+因此跳过 pytest 对本目录 __init__.py 的包级 setup（其中没有 setup_module）
+"""
+
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_DIR = Path(__file__).parent
+
+
+def pytest_collection_modifyitems(items):
+    for item in items:
+        for node in item.listchain():
+            if isinstance(node, pytest.Package) and node.path == PACKAGE_DIR:
+                node.setup = lambda: None
@@ -7,14 +7,29 @@ import json
 import csv
 import sqlite3
 import logging
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator
 from datetime import datetime
 import requests
 from pathlib import Path
 import hashlib
 import re
+import time
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
+from columnar_store import (
+    COLUMNAR_FORMATS, FORMAT_BY_SUFFIX, read_records, write_records, iter_record_batches
+)
+from near_duplicates import NearDuplicateFilter
+
+
+def compute_data_hash(item: Dict[str, Any]) -> str:
+    """计算数据项内容哈希，忽略以下划线开头的元信息字段，保证同一内容多次采集哈希不变"""
+    content = {key: value for key, value in item.items() if not key.startswith('_')}
+    return hashlib.md5(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
 
 @dataclass
 class DataSource:
@@ -35,6 +50,37 @@ class DataCollector:
         self.raw_data = []
         self.processed_data = []
         
+        # 流式采集的批大小和读取块大小
+        self.batch_size = self.config.get('batch_size', 1000)
+        self.read_chunk_size = self.config.get('read_chunk_size', 1024 * 1024)
+        
+        # 并发采集配置：'concurrent' 或 'sequential'
+        self.collection_mode = self.config.get('collection_mode', 'concurrent')
+        self.max_workers = self.config.get('max_workers', 8)
+        self.concurrency_limits = {'file': 4, 'api': 8, 'database': 2, 'web': 8}
+        self.concurrency_limits.update(self.config.get('concurrency_limits', {}))
+        self._semaphores = {
+            source_type: threading.BoundedSemaphore(max(1, limit))
+            for source_type, limit in self.concurrency_limits.items()
+        }
+        
+        # 复用HTTP连接的会话
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # 各数据源采集耗时统计
+        self.source_stats = {}
+        self.collection_time = 0.0
+        
+        # 近似重复过滤（需显式启用）：内容相似度不低于阈值的知识项只保留最先出现的一项
+        dedup_config = self.config.get('near_duplicates', {})
+        self.near_duplicate_filter = NearDuplicateFilter(
+            threshold=dedup_config.get('threshold', 0.9),
+            num_perm=dedup_config.get('num_perm', 128),
+            shingle_size=dedup_config.get('shingle_size', 5)
+        ) if dedup_config.get('enabled', False) else None
+        self.dedup_stats = {}
+        
     def _load_data_sources(self) -> List[DataSource]:
         """加载数据源配置"""
         default_sources = [
@@ -87,18 +133,11 @@ class DataCollector:
                     else:
                         data = [content]
                         
-            elif file_type == '.csv':
-                with open(path, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    data = list(reader)
-                    
-            elif file_type in ['.txt', '.md']:
-                with open(path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # 简单的文本分割和结构化
-                    lines = content.split('\n')
-                    data = [{"text": line.strip(), "source": str(path)} 
-                           for line in lines if line.strip()]
+            elif file_type in ['.csv', '.jsonl', '.ndjson', '.txt', '.md']:
+                data = list(self._iter_file_records(path, file_type))
+            
+            elif file_type in FORMAT_BY_SUFFIX:
+                data = read_records(str(path))
             
             self.logger.info(f"从文件 {file_path} 采集到 {len(data)} 条数据")
             return data
@@ -107,6 +146,151 @@ class DataCollector:
             self.logger.error(f"从文件采集数据失败: {e}")
             return []
     
+    def iter_file_batches(self, file_path: str, file_type: str = 'auto',
+                          batch_size: int = None, source_name: str = None) -> Iterator[List[Dict[str, Any]]]:
+        """流式采集文件数据，按批返回预处理后的数据项
+        
+        支持 JSON Lines、JSON 数组（增量解析）、CSV、Parquet/Arrow 和文本文件，内存占用与批大小成正比
+        """
+        path = Path(file_path)
+        if not path.exists():
+            self.logger.warning(f"文件不存在: {file_path}")
+            return
+        
+        if file_type == 'auto':
+            file_type = path.suffix.lower()
+        
+        batch_size = batch_size or self.batch_size
+        batch = []
+        total_raw = 0
+        total_valid = 0
+        
+        # 去重索引跨批次保留，后续批次中的重复项同样会被折叠
+        if self.near_duplicate_filter is not None:
+            self.near_duplicate_filter.reset()
+        
+        try:
+            for item in self._iter_file_records(path, file_type):
+                total_raw += 1
+                if source_name:
+                    self._add_metadata(item, source_name)
+                
+                try:
+                    processed_item = self._clean_item(item)
+                except Exception as e:
+                    self.logger.warning(f"预处理数据项失败: {e}")
+                    continue
+                
+                if processed_item and self._keep_item(processed_item):
+                    batch.append(processed_item)
+                    if len(batch) >= batch_size:
+                        total_valid += len(batch)
+                        yield batch
+                        batch = []
+            
+            if batch:
+                total_valid += len(batch)
+                yield batch
+                
+        except Exception as e:
+            self.logger.error(f"流式采集文件 {file_path} 失败: {e}")
+            return
+        
+        self.logger.info(f"从文件 {file_path} 流式采集到 {total_raw} 条数据，有效 {total_valid} 条")
+        self._record_dedup_stats()
+    
+    def _iter_file_records(self, path: Path, file_type: str) -> Iterator[Dict[str, Any]]:
+        """逐条读取文件中的原始数据项"""
+        if file_type in ['.jsonl', '.ndjson']:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        self.logger.warning(f"跳过无法解析的第 {line_number} 行: {e}")
+                        
+        elif file_type == '.json':
+            with open(path, 'r', encoding='utf-8') as f:
+                yield from self._iter_json_array(f)
+                
+        elif file_type == '.csv':
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                yield from csv.DictReader(f)
+                
+        elif file_type in FORMAT_BY_SUFFIX:
+            for batch in iter_record_batches(str(path), self.batch_size):
+                yield from batch
+                
+        elif file_type in ['.txt', '.md']:
+            with open(path, 'r', encoding='utf-8') as f:
+                # 简单的文本分割和结构化
+                for line in f:
+                    if line.strip():
+                        yield {"text": line.strip(), "source": str(path)}
+        
+        else:
+            self.logger.warning(f"不支持流式读取的文件类型: {file_type}")
+    
+    def _iter_json_array(self, f) -> Iterator[Any]:
+        """增量解析 JSON 数组，顶层为单个对象时返回该对象"""
+        decoder = json.JSONDecoder()
+        whitespace = re.compile(r'\s*')
+        buffer = ''
+        pos = 0
+        eof = False
+        in_array = None
+        
+        def fill() -> bool:
+            nonlocal buffer, pos, eof
+            chunk = f.read(self.read_chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+        
+        while True:
+            pos = whitespace.match(buffer, pos).end()
+            
+            if pos >= len(buffer):
+                if eof or not fill():
+                    break
+                continue
+            
+            if in_array is None:
+                in_array = buffer[pos] == '['
+                if in_array:
+                    pos += 1
+                continue
+            
+            if in_array and buffer[pos] in ',]':
+                if buffer[pos] == ']':
+                    break
+                pos += 1
+                continue
+            
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # 数据项跨越读取块边界，继续读取
+                if eof or not fill():
+                    raise
+                continue
+            
+            # 位于缓冲区末尾的值（例如数字）可能尚未读取完整
+            if end == len(buffer) and not eof and fill():
+                continue
+            
+            pos = end
+            yield value
+            
+            if not in_array:
+                break
+    
     def collect_from_api(self, api_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """从API采集数据"""
         try:
@@ -114,7 +298,7 @@ class DataCollector:
             headers = api_config.get('headers', {})
             params = api_config.get('params', {})
             
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = self._get_session().get(url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -154,87 +338,151 @@ class DataCollector:
     
     def collect_from_web(self, urls: List[str], max_depth: int = 1) -> List[Dict[str, Any]]:
         """从网页采集数据（简化版）"""
-        data = []
+        if self.collection_mode == 'concurrent' and len(urls) > 1:
+            workers = min(self.concurrency_limits.get('web', 1), len(urls))
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                pages = list(executor.map(self._fetch_web_page, urls))
+        else:
+            pages = [self._fetch_web_page(url) for url in urls]
         
-        for url in urls:
-            try:
-                response = requests.get(url, timeout=30)
-                response.raise_for_status()
-                
-                # 简单的文本提取（实际应用中应使用更专业的爬虫）
-                content = response.text
-                
-                # 提取标题
-                title_match = re.search(r'<title>(.*?)</title>', content, re.IGNORECASE)
-                title = title_match.group(1) if title_match else "Unknown"
-                
-                # 提取正文文本
-                text_content = re.sub(r'<[^>]+>', '', content)
-                text_content = re.sub(r'\s+', ' ', text_content).strip()
-                
-                data.append({
-                    "url": url,
-                    "title": title,
-                    "content": text_content[:1000],  # 限制长度
-                    "timestamp": datetime.now().isoformat()
-                })
-                
-            except Exception as e:
-                self.logger.error(f"从网页 {url} 采集数据失败: {e}")
+        data = [page for page in pages if page]
         
         self.logger.info(f"从网页采集到 {len(data)} 条数据")
         return data
     
+    def _fetch_web_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """采集单个网页"""
+        try:
+            with self._limit('web'):
+                response = self._get_session().get(url, timeout=30)
+                response.raise_for_status()
+            
+            # 简单的文本提取（实际应用中应使用更专业的爬虫）
+            content = response.text
+            
+            # 提取标题
+            title_match = re.search(r'<title>(.*?)</title>', content, re.IGNORECASE)
+            title = title_match.group(1) if title_match else "Unknown"
+            
+            # 提取正文文本
+            text_content = re.sub(r'<[^>]+>', '', content)
+            text_content = re.sub(r'\s+', ' ', text_content).strip()
+            
+            return {
+                "url": url,
+                "title": title,
+                "content": text_content[:1000],  # 限制长度
+                "timestamp": datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            self.logger.error(f"从网页 {url} 采集数据失败: {e}")
+            return None
+    
+    def _get_session(self) -> requests.Session:
+        """获取共享的HTTP会话，在各数据源之间复用连接"""
+        with self._session_lock:
+            if self._session is None:
+                pool_size = max(self.concurrency_limits.get('api', 1),
+                                self.concurrency_limits.get('web', 1))
+                adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size,
+                                                        pool_maxsize=pool_size)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+    
+    def _limit(self, source_type: str):
+        """获取数据源类型的并发限制"""
+        semaphore = self._semaphores.get(source_type)
+        return semaphore if semaphore is not None else nullcontext()
+    
     def collect_data(self, source_name: str = None) -> List[Dict[str, Any]]:
         """统一的数据采集接口"""
-        all_data = []
-        
         sources_to_collect = (
             [source for source in self.data_sources if source.name == source_name]
             if source_name
             else [source for source in self.data_sources if source.enabled]
         )
         
-        for source in sources_to_collect:
-            try:
-                if source.type == 'file':
-                    data = self.collect_from_file(
-                        source.config['path'],
-                        source.config.get('file_type', 'auto')
-                    )
-                    
-                elif source.type == 'api':
-                    data = self.collect_from_api(source.config)
-                    
-                elif source.type == 'database':
-                    data = self.collect_from_database(source.config)
-                    
-                elif source.type == 'web':
-                    urls = source.config.get('urls', [])
-                    depth = source.config.get('crawl_depth', 1)
-                    data = self.collect_from_web(urls, depth)
-                    
-                else:
-                    self.logger.warning(f"未知的数据源类型: {source.type}")
-                    continue
-                
-                # 为数据添加元信息
-                for item in data:
-                    item['_source'] = source.name
-                    item['_collection_time'] = datetime.now().isoformat()
-                    item['_data_hash'] = hashlib.md5(
-                        json.dumps(item, sort_keys=True).encode()
-                    ).hexdigest()
-                
-                all_data.extend(data)
-                
-            except Exception as e:
-                self.logger.error(f"采集数据源 {source.name} 失败: {e}")
+        start = time.perf_counter()
+        self.source_stats = {}
+        
+        if self.collection_mode == 'concurrent' and len(sources_to_collect) > 1:
+            workers = min(self.max_workers, len(sources_to_collect))
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                results = list(executor.map(self._collect_source, sources_to_collect))
+        else:
+            results = [self._collect_source(source) for source in sources_to_collect]
+        
+        # 按数据源顺序合并，保证结果与顺序采集一致
+        all_data = []
+        for data in results:
+            all_data.extend(data)
+        self.source_stats = {
+            source.name: self.source_stats[source.name]
+            for source in sources_to_collect if source.name in self.source_stats
+        }
         
+        self.collection_time = time.perf_counter() - start
         self.raw_data = all_data
-        self.logger.info(f"总共采集到 {len(all_data)} 条数据")
+        self.logger.info(f"总共采集到 {len(all_data)} 条数据，耗时 {self.collection_time:.2f}s")
         return all_data
     
+    def _collect_source(self, source: DataSource) -> List[Dict[str, Any]]:
+        """采集单个数据源并记录耗时"""
+        start = time.perf_counter()
+        status = 'success'
+        data = []
+        
+        try:
+            if source.type == 'web':
+                # 网页按URL粒度限流
+                urls = source.config.get('urls', [])
+                depth = source.config.get('crawl_depth', 1)
+                data = self.collect_from_web(urls, depth)
+                
+            elif source.type in ['file', 'api', 'database']:
+                with self._limit(source.type):
+                    if source.type == 'file':
+                        data = self.collect_from_file(
+                            source.config['path'],
+                            source.config.get('file_type', 'auto')
+                        )
+                    elif source.type == 'api':
+                        data = self.collect_from_api(source.config)
+                    else:
+                        data = self.collect_from_database(source.config)
+                        
+            else:
+                self.logger.warning(f"未知的数据源类型: {source.type}")
+                status = 'skipped'
+            
+            # 为数据添加元信息
+            for item in data:
+                self._add_metadata(item, source.name)
+                
+        except Exception as e:
+            self.logger.error(f"采集数据源 {source.name} 失败: {e}")
+            status = 'error'
+            data = []
+        
+        self.source_stats[source.name] = {
+            'type': source.type,
+            'status': status,
+            'items': len(data),
+            'elapsed': round(time.perf_counter() - start, 4)
+        }
+        
+        return data
+    
+    def _add_metadata(self, item: Dict[str, Any], source_name: str):
+        """为数据项添加来源、采集时间和哈希等元信息"""
+        item['_source'] = source_name
+        item['_collection_time'] = datetime.now().isoformat()
+        item['_data_hash'] = compute_data_hash(item)
+    
     def preprocess_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """数据预处理"""
         processed = []
@@ -248,10 +496,42 @@ class DataCollector:
             except Exception as e:
                 self.logger.warning(f"预处理数据项失败: {e}")
         
+        # 折叠近似重复项
+        if self.near_duplicate_filter is not None:
+            self.near_duplicate_filter.reset()
+            processed = [item for item in processed if self._keep_item(item)]
+            self._record_dedup_stats()
+        
         self.processed_data = processed
         self.logger.info(f"预处理完成，得到 {len(processed)} 条有效数据")
         return processed
     
+    def _keep_item(self, item: Dict[str, Any]) -> bool:
+        """近似重复检查，未启用去重或检查失败时保留"""
+        if self.near_duplicate_filter is None:
+            return True
+        
+        start = time.perf_counter()
+        try:
+            return self.near_duplicate_filter.add(item)
+        except Exception as e:
+            self.logger.warning(f"近似重复检查失败: {e}")
+            return True
+        finally:
+            self.near_duplicate_filter.filter_time += time.perf_counter() - start
+    
+    def _record_dedup_stats(self):
+        """记录去重统计"""
+        if self.near_duplicate_filter is None:
+            return
+        
+        self.dedup_stats = self.near_duplicate_filter.get_stats()
+        if self.dedup_stats['collapsed']:
+            self.logger.info(
+                f"折叠 {self.dedup_stats['collapsed']} 条近似重复数据"
+                f"（{self.dedup_stats['duplicate_groups']} 组，相似度阈值 {self.dedup_stats['threshold']}）"
+            )
+    
     def _clean_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """清洗单个数据项"""
         if not isinstance(item, dict):
@@ -279,7 +559,7 @@ class DataCollector:
         return cleaned
     
     def save_data(self, data: List[Dict[str, Any]], output_path: str, format: str = 'json'):
-        """保存采集的数据"""
+        """保存采集的数据，format 为 json、csv、parquet 或 arrow（后两者需要 pyarrow）"""
         try:
             path = Path(output_path)
             path.parent.mkdir(parents=True, exist_ok=True)
@@ -298,6 +578,9 @@ class DataCollector:
                     writer.writeheader()
                     writer.writerows(data)
             
+            elif format in COLUMNAR_FORMATS:
+                write_records(data, str(path), format)
+            
             self.logger.info(f"数据已保存到 {output_path}")
             
         except Exception as e:
@@ -328,4 +611,12 @@ class DataCollector:
         
         stats["fields"] = list(stats["fields"])
         
+        # 各数据源采集耗时
+        stats["source_timing"] = dict(self.source_stats)
+        stats["collection_time"] = round(self.collection_time, 4)
+        
+        # 近似重复折叠情况
+        if self.dedup_stats:
+            stats["near_duplicates"] = dict(self.dedup_stats)
+        
         return stats
\ No newline at end of file
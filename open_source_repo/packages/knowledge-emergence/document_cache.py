@@ -0,0 +1,140 @@
+"""
+知识项文本分析缓存
+在一次分析运行中只对每个知识项分词一次，供各分析阶段共享
+"""
+
+import time
+import logging
+from typing import Dict, List, Any, Optional, Set, Tuple
+from datetime import datetime
+from dataclasses import dataclass, field
+
+
+
+@dataclass
+class AnalyzedDocument:
+    """预处理后的知识项文本"""
+    text: str
+    text_lower: str
+    tokens: List[str]
+    lower_tokens: List[str]
+    topic_words: List[str]
+    topic_set: Set[str]
+    concepts: List[str]
+    concept_set: Set[str]
+    collection_time: Optional[datetime] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def parse_collection_time(time_str: Any) -> Optional[datetime]:
+    """解析 _collection_time 字段，失败时返回 None"""
+    if not time_str or not isinstance(time_str, str):
+        return None
+
+    try:
+        return datetime.fromisoformat(time_str.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def analyze_document(knowledge_item: Dict[str, Any]) -> AnalyzedDocument:
+    """对单个知识项进行分词和概念提取"""
+    text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+    tokens = text.split()
+    lower_tokens = [token.lower() for token in tokens]
+
+    # 与各模块原有规则保持一致：长度大于3的词为主题词，纯字母的主题词为概念
+    topic_words = [word for word in lower_tokens if len(word) > 3]
+    concepts = [token.lower() for token in tokens if len(token) > 3 and token.isalpha()]
+
+    return AnalyzedDocument(
+        text=text,
+        text_lower=text.lower(),
+        tokens=tokens,
+        lower_tokens=lower_tokens,
+        topic_words=topic_words,
+        topic_set=set(topic_words),
+        concepts=concepts,
+        concept_set=set(concepts),
+        collection_time=parse_collection_time(knowledge_item.get('_collection_time', ''))
+    )
+
+
+class DocumentCache:
+    """一次分析运行内共享的文档缓存"""
+
+    def __init__(self, knowledge_items: List[Dict[str, Any]] = None):
+        self.logger = logging.getLogger(__name__)
+        self._documents: Dict[int, Tuple[Dict[str, Any], AnalyzedDocument]] = {}
+
+        # 运行统计
+        self.build_time = 0.0
+        self.miss_time = 0.0
+        self.hits = 0
+        self.misses = 0
+
+        if knowledge_items:
+            self.build(knowledge_items)
+
+    def build(self, knowledge_items: List[Dict[str, Any]]):
+        """批量预处理知识项"""
+        start = time.perf_counter()
+
+        for item in knowledge_items:
+            self._documents[id(item)] = (item, analyze_document(item))
+
+        self.build_time += time.perf_counter() - start
+        self.logger.info(f"文档缓存构建完成，共 {len(self._documents)} 项，耗时 {self.build_time:.3f}s")
+
+    def get(self, knowledge_item: Dict[str, Any]) -> AnalyzedDocument:
+        """获取知识项的分析结果，未命中时即时分析并缓存"""
+        entry = self._documents.get(id(knowledge_item))
+        if entry is not None and entry[0] is knowledge_item:
+            self.hits += 1
+            return entry[1]
+
+        start = time.perf_counter()
+        document = analyze_document(knowledge_item)
+        self._documents[id(knowledge_item)] = (knowledge_item, document)
+        self.miss_time += time.perf_counter() - start
+        self.misses += 1
+
+        return document
+
+    def get_documents(self, knowledge_items: List[Dict[str, Any]]) -> List[AnalyzedDocument]:
+        """批量获取知识项的分析结果"""
+        return [self.get(item) for item in knowledge_items]
+
+    def clear(self):
+        """清空缓存"""
+        self._documents.clear()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取分词耗时统计
+
+        extrapolated_uncached_time 是平均分词耗时乘以查询次数的外推值，并非实测；
+        缓存实际节省的时间用 benchmark.py 的 --no-document-cache 对比测量
+        """
+        tokenization_time = self.build_time + self.miss_time
+        lookups = self.hits + self.misses
+        documents = len(self._documents)
+        avg_time = tokenization_time / documents if documents else 0.0
+
+        return {
+            'documents': documents,
+            'lookups': lookups,
+            'hits': self.hits,
+            'misses': self.misses,
+            'tokenization_time': round(tokenization_time, 4),
+            'extrapolated_uncached_time': round(avg_time * lookups, 4)
+        }
+
+
+def get_document(document_cache: Optional[DocumentCache], knowledge_item: Dict[str, Any]) -> AnalyzedDocument:
+    """获取知识项的分析结果：注入了缓存时从缓存读取，否则即时分析（不做缓存，知识项内容可能被修改）"""
+    if document_cache is not None:
+        return document_cache.get(knowledge_item)
+    return analyze_document(knowledge_item)
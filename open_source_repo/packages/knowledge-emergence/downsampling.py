@@ -0,0 +1,67 @@
+"""
+大序列降采样
+为绘图把任意长度的序列压缩到固定点数：LTTB 降采样保留折线形状，分箱分位数带展示分布
+"""
+
+import numpy as np
+from typing import Sequence, Tuple
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets 降采样，返回保留点的下标
+
+    首尾点始终保留，中间的点均分为 threshold - 2 个桶，每个桶保留与上一个保留点和下一个桶均值
+    构成三角形面积最大的点。序列长度不超过 threshold 时返回全部下标
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # 桶间距不小于 1，取整后的边界严格递增，每个桶非空
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+
+        # 下一个桶的均值，最后一个桶之后是末尾点
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected]) -
+            (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(np.argmax(areas))
+        indices[bucket + 1] = selected
+
+    return indices
+
+
+def percentile_bands(values: np.ndarray, n_bins: int,
+                     percentiles: Sequence[float] = (10, 25, 50, 75, 90)) -> Tuple[np.ndarray, np.ndarray]:
+    """按顺序把序列均分为 n_bins 个区间，计算每个区间的分位数
+
+    返回 (区间中心下标, 形状为 (len(percentiles), n_bins) 的分位数矩阵)，忽略缺失值
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    n_bins = max(1, min(int(n_bins), n))
+
+    edges = np.linspace(0, n, n_bins + 1).astype(np.int64)
+    centers = (edges[:-1] + edges[1:] - 1) / 2
+    bands = np.empty((len(percentiles), n_bins))
+    for i in range(n_bins):
+        bands[:, i] = np.nanpercentile(values[edges[i]:edges[i + 1]], percentiles)
+
+    return centers, bands
@@ -0,0 +1,147 @@
+"""
+流式涌现性指标
+按时间顺序逐条消费知识项，只保留当前窗口的概念集合和历史窗口的 MinHash 草图，
+可随实时数据持续输出涌现强度、创新度和整合度
+"""
+
+import logging
+from typing import Dict, List, Any, Callable, Optional, Set, Iterable
+from collections import deque
+
+import numpy as np
+
+from document_cache import analyze_document
+from minhash import MinHasher
+
+
+class StreamingEmergenceCalculator:
+    """在线涌现性指标计算器
+
+    知识项按 window_size 条划分为滚动窗口，各指标的定义与 MetricsCalculator.calculate_emergence_metrics 一致：
+    - 每个窗口的新概念为该窗口概念集合减去上一窗口的新概念集合
+    - 涌现强度为相邻窗口概念数增长率的均值，按累计和在线更新
+    - 创新度为新概念总数与所有新概念并集大小之比，并集大小由合并后的 MinHash 签名估计
+    - 整合度为所有窗口新概念集合两两 Jaccard 相似度的均值，由各窗口的 MinHash 签名估计
+
+    历史窗口签名最多保留 max_sketches 个（默认 1000），整合度只统计每个窗口与最近 max_sketches 个窗口之间的相似度，
+    每个窗口的计算量和内存不随数据量增长；窗口数不超过 max_sketches 时与统计全部窗口对一致。
+    max_sketches 为 None 时保留全部签名，总计算量随窗口数平方增长
+    """
+
+    def __init__(self, window_size: int = 100, num_perm: int = 128, seed: int = 1,
+                 max_sketches: Optional[int] = 1000, trend_length: int = 1000,
+                 concept_extractor: Callable[[Dict[str, Any]], Set[str]] = None):
+        self.window_size = max(1, int(window_size))
+        self.max_sketches = max_sketches
+        self.hasher = MinHasher(num_perm=num_perm, seed=seed)
+        self.concept_extractor = concept_extractor or (lambda item: analyze_document(item).topic_set)
+        self.logger = logging.getLogger(__name__)
+
+        # 当前窗口
+        self._window_concepts: Set[str] = set()
+        self._window_count = 0
+
+        # 上一窗口的新概念集合（计算下一窗口新概念所需的唯一精确集合）
+        self._prev_new_concepts: Optional[Set[str]] = None
+        self._prev_growth: Optional[int] = None
+
+        # 在线累计量
+        self.items_seen = 0
+        self.windows_closed = 0
+        self._growth_rate_sum = 0.0
+        self._growth_rate_count = 0
+        self._total_new_concepts = 0
+        self._union_signature = self.hasher.empty()
+        self._integration_sum = 0.0
+        self._integration_count = 0
+
+        # 历史窗口新概念集合的签名，以及集合是否为空（两个空集合的 Jaccard 无定义，批量计算中跳过）
+        self._signatures = deque(maxlen=max_sketches)
+        self._empty_flags = deque(maxlen=max_sketches)
+
+        self.knowledge_growth = deque(maxlen=trend_length)
+
+    def update(self, knowledge_item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """消费一条知识项，窗口结束时返回最新指标，否则返回 None"""
+        self._window_concepts.update(self.concept_extractor(knowledge_item))
+        self._window_count += 1
+        self.items_seen += 1
+
+        if self._window_count >= self.window_size:
+            return self._close_window()
+        return None
+
+    def update_many(self, knowledge_items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """消费多条知识项，返回期间每个结束窗口的指标"""
+        snapshots = []
+        for item in knowledge_items:
+            snapshot = self.update(item)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        return snapshots
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """结束未满的当前窗口（数据结束时调用），返回最新指标"""
+        if self._window_count == 0:
+            return None
+        return self._close_window()
+
+    def _close_window(self) -> Dict[str, Any]:
+        """结束当前窗口并更新累计量"""
+        window_concepts = self._window_concepts
+        growth = len(window_concepts)
+
+        if self._prev_growth is not None and self._prev_growth > 0:
+            self._growth_rate_sum += (growth - self._prev_growth) / self._prev_growth
+            self._growth_rate_count += 1
+        self._prev_growth = growth
+        self.knowledge_growth.append(growth)
+
+        new_concepts = window_concepts if self._prev_new_concepts is None \
+            else window_concepts - self._prev_new_concepts
+        self._total_new_concepts += len(new_concepts)
+
+        signature = self.hasher.signature(new_concepts)
+        self._union_signature = self.hasher.merge(self._union_signature, signature)
+
+        # 与历史窗口的整合度：两个集合都为空时跳过
+        is_empty = not new_concepts
+        if self._signatures:
+            similarities = self.hasher.jaccard_many(np.vstack(self._signatures), signature)
+            if is_empty:
+                valid = ~np.fromiter(self._empty_flags, dtype=bool, count=len(self._empty_flags))
+                similarities = similarities[valid]
+            self._integration_sum += float(similarities.sum())
+            self._integration_count += len(similarities)
+
+        self._signatures.append(signature)
+        self._empty_flags.append(is_empty)
+
+        self._prev_new_concepts = new_concepts
+        self._window_concepts = set()
+        self._window_count = 0
+        self.windows_closed += 1
+
+        return self.get_metrics()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """获取当前指标，键与批量计算的涌现性指标一致"""
+        emergence_intensity = self._growth_rate_sum / self._growth_rate_count \
+            if self._growth_rate_count else 0
+
+        total_concepts = self.hasher.cardinality(self._union_signature)
+        innovation_rate = self._total_new_concepts / total_concepts if total_concepts > 0 else 0
+
+        avg_integration = self._integration_sum / self._integration_count \
+            if self._integration_count else 0
+
+        return {
+            "emergence_intensity": round(emergence_intensity, 4),
+            "innovation_rate": round(innovation_rate, 4),
+            "avg_integration": round(avg_integration, 4),
+            "knowledge_growth_trend": list(self.knowledge_growth),
+            "total_growth_points": self.windows_closed,
+            "emergence_score": round((emergence_intensity + innovation_rate + avg_integration) / 3 * 100, 2),
+            "items_seen": self.items_seen,
+            "estimated": True
+        }
@@ -0,0 +1,104 @@
+"""
+多关键词匹配器
+把评估器的全部关键词列表编译为一个前缀树形状的正则表达式，每个文本只扫描一次，命中的关键词再映射回所属的列表
+"""
+
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Iterable, Set, FrozenSet, Tuple
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """由关键词构建前缀树形状的正则表达式，同一位置总是匹配最长的关键词
+
+    同一层的分支首字符互不相同，正则引擎在每个位置最多进入一个分支；
+    关键词结尾处的后续分支是贪婪的可选组，匹配失败时回退到较短的关键词
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """多个关键词列表的联合匹配器
+
+    在评估器初始化时由全部关键词列表构建一次；每个文本只扫描一次，最近扫描过的文本的结果会被缓存，
+    同一知识项在各评估维度中的多次查询共用一次扫描。结果与逐个关键词判断 `keyword in text` 一致：
+    count 按列表条目计数（重复的关键词重复计数），空关键词总是视为出现
+    """
+
+    def __init__(self, keyword_lists: Dict[str, Iterable[str]], cache_size: int = 16):
+        self.keyword_lists: Dict[str, List[str]] = {
+            name: list(keywords) for name, keywords in keyword_lists.items()
+        }
+
+        # 关键词 -> [(列表名, 在列表中出现的次数)]
+        memberships: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for name, keywords in self.keyword_lists.items():
+            for keyword in keywords:
+                memberships[keyword][name] += 1
+        self._memberships = {keyword: list(names.items()) for keyword, names in memberships.items()}
+
+        # 空关键词总是出现
+        self._always_found = frozenset({''}) if '' in memberships else frozenset()
+
+        words = sorted(keyword for keyword in memberships if keyword)
+        self._pattern = re.compile(_trie_pattern(words)) if words else None
+
+        # 最长匹配 -> 以同一位置开始的全部关键词（其中也是关键词的前缀）
+        word_set = set(words)
+        self._prefixes = {
+            word: frozenset(word[:end] for end in range(1, len(word) + 1) if word[:end] in word_set)
+            for word in words
+        }
+
+        self._scan = lru_cache(maxsize=cache_size)(self._scan_text)
+
+    def _scan_text(self, text: str) -> Tuple[FrozenSet[str], Dict[str, int]]:
+        """扫描文本，返回 (出现的关键词, 列表名 -> 出现的条目数)"""
+        found = set(self._always_found)
+        if self._pattern is not None:
+            search = self._pattern.search
+            position = 0
+            while True:
+                match = search(text, position)
+                if match is None:
+                    break
+                found.update(self._prefixes[match.group()])
+                position = match.start() + 1
+
+        counts: Dict[str, int] = defaultdict(int)
+        for keyword in found:
+            for name, occurrences in self._memberships[keyword]:
+                counts[name] += occurrences
+        return frozenset(found), dict(counts)
+
+    def find_all(self, name: str, text: str) -> Set[str]:
+        """返回列表中出现在文本中的关键词"""
+        found = self._scan(text)[0]
+        return {keyword for keyword in self.keyword_lists[name] if keyword in found}
+
+    def count(self, name: str, text: str) -> int:
+        """统计列表中出现在文本中的关键词个数"""
+        return self._scan(text)[1].get(name, 0)
+
+    def contains_any(self, name: str, text: str) -> bool:
+        """文本中是否出现列表中的任一关键词"""
+        return name in self._scan(text)[1]
+
+    def keywords(self, name: str) -> List[str]:
+        """列表中的关键词"""
+        return self.keyword_lists[name]
@@ -4,13 +4,18 @@
 """
 
 import os
+import re
 import sys
 import json
+import time
 import logging
 import argparse
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from contextlib import nullcontext
+from functools import partial
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import warnings
 
 # 添加当前目录到Python路径
@@ -24,18 +29,68 @@ from quality_assessor import QualityAssessor, QualityScore
 from pattern_recognizer import PatternRecognizer, Pattern
 from value_assessor import ValueAssessor, ValueAssessment
 from visualizer import Visualizer
-from report_generator import ReportGenerator
+from report_generator import ReportGenerator, QUALITY_DIMENSIONS, VALUE_DIMENSIONS
+from document_cache import DocumentCache
+from state_store import AnalysisStateStore, item_key
+from stage_executor import StageExecutor
+from profiler import PipelineProfiler
+from parallel import resolve_workers, submit_method_call
+from sampling import StratifiedReservoirSampler, jackknife_intervals
+from columnar_store import (
+    COLUMNAR_FORMATS, RecordTable, read_records, write_records, is_available as columnar_available
+)
 
 # 忽略警告
 warnings.filterwarnings('ignore')
 
 
+def _analyze_batch_source(config: Dict[str, Any], data_source: str, output_dir: str) -> Dict[str, Any]:
+    """在工作进程中用独立的分析器分析一个数据源，输出写入该数据源自己的目录"""
+    # 清除从父进程继承的日志处理器，日志写入该数据源输出目录下的 logs/
+    logging.getLogger('KnowledgeEmergence').handlers.clear()
+    
+    config['output']['base_dir'] = output_dir
+    config['visualizer']['output_dir'] = str(Path(output_dir) / 'visualizations')
+    config['report_generator']['output_dir'] = str(Path(output_dir) / 'reports')
+    
+    analyzer = KnowledgeEmergenceAnalyzer(config=config)
+    start_time = time.perf_counter()
+    result = analyzer.analyze(data_source)
+    return analyzer._summarize_batch_result(data_source, output_dir, result,
+                                            time.perf_counter() - start_time)
+
+
+def _create_stage_component(name: str, config: Dict[str, Any]) -> Any:
+    """在工作进程中新建分析模块，并注入按需填充的文档缓存，同一次调用内每个知识项只分词一次"""
+    component = KnowledgeEmergenceAnalyzer.STAGE_COMPONENTS[name](config)
+    component.document_cache = DocumentCache()
+    return component
+
+
 class KnowledgeEmergenceAnalyzer:
     """知识涌现分析器主类"""
     
-    def __init__(self, config_path: str = None):
-        """初始化分析器"""
-        self.config = self._load_config(config_path)
+    # 列式存储格式下按列保存的分析数据
+    COLUMNAR_TABLES = ('knowledge_items', 'quality_scores', 'value_assessments')
+    
+    # 重新生成报告和图表时从列式表中读取的列，完整记录只在写入JSON报告时按批读取
+    REPORT_COLUMNS = {
+        'knowledge_items': ['_source', '_collection_time'],
+        'quality_scores': ['overall_score', *QUALITY_DIMENSIONS],
+        'value_assessments': ['overall_value', *VALUE_DIMENSIONS]
+    }
+    
+    # 阶段在进程中执行时，工作进程按模块名和同名配置节新建模块实例
+    STAGE_COMPONENTS = {
+        'metrics_calculator': MetricsCalculator,
+        'quality_assessor': QualityAssessor,
+        'pattern_recognizer': PatternRecognizer,
+        'value_assessor': ValueAssessor
+    }
+    
+    def __init__(self, config_path: str = None, config: Dict[str, Any] = None):
+        """初始化分析器，config 为已合并的完整配置时不再读取配置文件"""
+        self.config = config if config is not None else self._load_config(config_path)
         self.logger = self._setup_logging()
         
         # 初始化各个模块
@@ -47,6 +102,19 @@ class KnowledgeEmergenceAnalyzer:
         self.visualizer = Visualizer(self.config.get('visualizer', {}))
         self.report_generator = ReportGenerator(self.config.get('report_generator', {}))
         
+        # 增量分析状态库，仅在增量模式下打开
+        self.state_store = None
+        
+        # 最近一次分析的阶段执行器和性能剖析器
+        self.stage_executor = None
+        self.profiler = None
+        # 阶段在进程中执行时使用的进程池，仅在执行阶段期间存在
+        self._stage_pool = None
+        self.profile_file = None
+        
+        # 最近一次并行批量分析的汇总
+        self.batch_summary = None
+        
         self.logger.info("知识涌现分析器初始化完成")
     
     def _load_config(self, config_path: str = None) -> Dict[str, Any]:
@@ -64,7 +132,10 @@ class KnowledgeEmergenceAnalyzer:
             },
             'metrics_calculator': {
                 'min_pattern_strength': 0.3,
-                'time_window_days': 7
+                'time_window_days': 7,
+                'max_concept_postings': 1000,
+                'coherence_mode': 'auto',
+                'sparse_coherence_threshold': 2000
             },
             'quality_assessor': {
                 'quality_weights': {
@@ -105,7 +176,39 @@ class KnowledgeEmergenceAnalyzer:
             },
             'output': {
                 'base_dir': 'output',
-                'create_subdirs': True
+                'create_subdirs': True,
+                # 分析结果格式：json，或 parquet / arrow（知识项和评估结果按列存储，需要 pyarrow）
+                'results_format': 'json'
+            },
+            'incremental': {
+                'enabled': False,
+                'state_db': None
+            },
+            # 近似分析：分层抽样后计算指标和模式，并给出刀切法置信区间
+            'approximate': {
+                'sample_size': 1000,
+                'replicates': 10,
+                'confidence_level': 0.95,
+                'time_bucket': 'month',
+                'seed': 42
+            },
+            'performance': {
+                'batch_size': 100,
+                'max_workers': None,
+                'parallel_processing': False,
+                # 阶段并发：thread 模式受 GIL 限制只能重叠 I/O 和释放 GIL 的数值计算，
+                # process 模式在进程池中执行指标、质量、模式和价值的计算
+                'parallel_stages': False,
+                'stage_mode': 'thread',
+                'stage_workers': None,
+                # 命令行批量模式中每个数据源在独立进程中分析（batch_analysis_parallel）
+                'batch_parallel': False,
+                'batch_workers': None
+            },
+            'profiling': {
+                'enabled': False,
+                'cprofile': False,
+                'cprofile_path': None
             }
         }
         
@@ -162,8 +265,13 @@ class KnowledgeEmergenceAnalyzer:
         
         return logger
     
-    def analyze(self, data_source: str = None, output_dir: str = None) -> Dict[str, Any]:
-        """执行完整的知识涌现分析"""
+    def analyze(self, data_source: str = None, output_dir: str = None,
+                incremental: bool = None, profile: bool = None) -> Dict[str, Any]:
+        """执行完整的知识涌现分析
+        
+        incremental 为 True 时只评估状态库中没有的知识项，未指定时使用配置中的设置；
+        profile 为 True 时记录各阶段和子检测方法的耗时，写入 run_stats.profile
+        """
         try:
             self.logger.info("开始知识涌现分析...")
             
@@ -177,61 +285,58 @@ class KnowledgeEmergenceAnalyzer:
             # 创建输出目录结构
             self._create_output_directories()
             
+            self.profiler = None
+            self.profile_file = None
+            if profile is None:
+                profile = self.config['profiling']['enabled']
+            if profile:
+                self._start_profiler()
+            
             # 1. 数据采集
             self.logger.info("步骤 1: 数据采集")
-            knowledge_items = self._collect_data(data_source)
+            with self._profile_stage('collect'):
+                knowledge_items = self._collect_data(data_source)
             
             if not knowledge_items:
                 raise ValueError("未能采集到任何数据")
             
             self.logger.info(f"成功采集 {len(knowledge_items)} 条知识项")
             
-            # 2. 指标计算
-            self.logger.info("步骤 2: 指标计算")
-            metrics_results = self._calculate_metrics(knowledge_items)
+            if incremental is None:
+                incremental = self.config['incremental']['enabled']
+            if incremental:
+                self._open_state_store()
+                # 重新采集的内容沿用首次采集的时间
+                self.state_store.assign_first_seen_times(knowledge_items)
             
-            # 3. 质量评估
-            self.logger.info("步骤 3: 质量评估")
-            quality_scores = self._assess_quality(knowledge_items)
+            # 预处理文本，供后续各阶段共享
+            with self._profile_stage('document_cache', len(knowledge_items)):
+                document_cache = self._build_document_cache(knowledge_items)
             
-            # 4. 模式识别
-            self.logger.info("步骤 4: 模式识别")
-            patterns = self._recognize_patterns(knowledge_items)
+            # 2-7. 按依赖关系执行分析阶段，互不依赖的阶段并发运行
+            stage_results = self._run_stages(knowledge_items)
+            metrics_results = stage_results['metrics']
+            quality_scores = stage_results['quality_scores']
+            patterns = stage_results['patterns']
+            value_assessments = stage_results['value_assessments']
+            visualization_files = stage_results['visualizations']
+            report_files = stage_results['reports']
             
-            # 5. 价值评估
-            self.logger.info("步骤 5: 价值评估")
-            value_assessments = self._assess_value(knowledge_items)
-            
-            # 6. 可视化生成
-            self.logger.info("步骤 6: 生成可视化")
-            visualization_files = self._generate_visualizations({
-                'metrics': metrics_results,
-                'quality_scores': quality_scores,
-                'patterns': patterns,
-                'value_assessments': value_assessments
-            })
-            
-            # 7. 报告生成
-            self.logger.info("步骤 7: 生成报告")
-            report_files = self._generate_reports({
-                'knowledge_items': knowledge_items,
-                'metrics': metrics_results,
-                'quality_scores': quality_scores,
-                'patterns': patterns,
-                'value_assessments': value_assessments
-            })
+            self._finish_profiler()
             
             # 8. 保存分析结果
             self.logger.info("步骤 8: 保存分析结果")
-            results_file = self._save_analysis_results({
-                'knowledge_items': knowledge_items,
-                'metrics': metrics_results,
-                'quality_scores': quality_scores,
-                'patterns': patterns,
-                'value_assessments': value_assessments,
-                'visualization_files': visualization_files,
-                'report_files': report_files
-            })
+            with self._profile_stage('save'):
+                results_file = self._save_analysis_results({
+                    'knowledge_items': knowledge_items,
+                    'metrics': metrics_results,
+                    'quality_scores': quality_scores,
+                    'patterns': patterns,
+                    'value_assessments': value_assessments,
+                    'visualization_files': visualization_files,
+                    'report_files': report_files,
+                    'run_stats': self._get_run_stats(document_cache, self.stage_executor)
+                })
             
             self.logger.info("知识涌现分析完成!")
             
@@ -245,6 +350,7 @@ class KnowledgeEmergenceAnalyzer:
                 'visualization_files': visualization_files,
                 'report_files': report_files,
                 'results_file': results_file,
+                'run_stats': self._get_run_stats(document_cache, self.stage_executor),
                 'analysis_time': datetime.now().isoformat()
             }
             
@@ -255,6 +361,11 @@ class KnowledgeEmergenceAnalyzer:
                 'error': str(e),
                 'analysis_time': datetime.now().isoformat()
             }
+        
+        finally:
+            self._close_state_store()
+            self._finish_profiler()
+            self._detach_document_cache()
     
     def _collect_data(self, data_source: str = None) -> List[Dict[str, Any]]:
         """采集数据"""
@@ -265,9 +376,12 @@ class KnowledgeEmergenceAnalyzer:
                     # API数据源
                     knowledge_items = self.data_collector.collect_from_api({'url': data_source})
                 elif os.path.isfile(data_source):
-                    # 文件数据源
+                    # 文件数据源：流式读取并逐批预处理，避免同时保留原始数据和预处理副本
                     file_ext = Path(data_source).suffix.lower()
-                    knowledge_items = self.data_collector.collect_from_file(data_source, file_ext)
+                    processed_data = []
+                    for batch in self.data_collector.iter_file_batches(data_source, file_ext):
+                        processed_data.extend(batch)
+                    return processed_data
                 else:
                     # 假设是数据库或API配置
                     knowledge_items = self.data_collector.collect_data(data_source)
@@ -284,10 +398,193 @@ class KnowledgeEmergenceAnalyzer:
             self.logger.error(f"数据采集失败: {e}")
             return []
     
+    def _build_document_cache(self, knowledge_items: List[Dict[str, Any]]) -> DocumentCache:
+        """构建本次运行的文档缓存并注入各分析模块"""
+        document_cache = DocumentCache(knowledge_items)
+        
+        self.metrics_calculator.document_cache = document_cache
+        self.quality_assessor.document_cache = document_cache
+        self.pattern_recognizer.document_cache = document_cache
+        self.value_assessor.document_cache = document_cache
+        
+        return document_cache
+    
+    def _detach_document_cache(self):
+        """从各分析模块移除本次运行的文档缓存，运行结束后不再保留知识项和分词结果"""
+        self.metrics_calculator.document_cache = None
+        self.quality_assessor.document_cache = None
+        self.pattern_recognizer.document_cache = None
+        self.value_assessor.document_cache = None
+    
+    def _open_state_store(self):
+        """打开增量分析状态库，默认位于输出目录下"""
+        state_db = self.config['incremental'].get('state_db') or \
+            str(Path(self.config['output']['base_dir']) / 'analysis_state.db')
+        self.state_store = AnalysisStateStore(state_db)
+        self.logger.info(f"增量分析模式，状态库: {state_db}")
+    
+    def _close_state_store(self):
+        """关闭增量分析状态库"""
+        if self.state_store is not None:
+            self.state_store.close()
+            self.state_store = None
+    
+    def _get_run_stats(self, document_cache: DocumentCache,
+                       stage_executor: StageExecutor = None) -> Dict[str, Any]:
+        """汇总本次运行统计"""
+        run_stats = {'document_cache': document_cache.get_stats()}
+        if self.data_collector.dedup_stats:
+            run_stats['near_duplicates'] = dict(self.data_collector.dedup_stats)
+        if stage_executor is not None:
+            run_stats['stages'] = stage_executor.get_stats()
+        if self.visualizer.render_cache_enabled:
+            run_stats['render_cache'] = self.visualizer.get_cache_stats()
+        if self.profiler is not None:
+            run_stats['profile'] = self.profiler.get_report()
+            if self.profile_file:
+                run_stats['profile']['cprofile_file'] = self.profile_file
+        if self.state_store is not None:
+            run_stats['incremental'] = self.state_store.get_stats()
+        return run_stats
+    
+    def _start_profiler(self):
+        """创建剖析器并为各模块安装计时包装"""
+        profiling = self.config['profiling']
+        self.profiler = PipelineProfiler(enable_cprofile=profiling.get('cprofile', False))
+        self.profile_file = None
+        self.profiler.instrument_modules(self)
+        
+        if self.profiler.cprofile is not None:
+            self.profiler.cprofile.enable()
+        self.logger.info("已启用性能剖析")
+    
+    def _finish_profiler(self):
+        """停止 cProfile 并移除计时包装，可重复调用"""
+        if self.profiler is None:
+            return
+        
+        self.profiler.uninstrument()
+        if self.profiler.cprofile is not None and self.profile_file is None:
+            self.profiler.cprofile.disable()
+            profile_path = self.config['profiling'].get('cprofile_path') or str(
+                Path(self.config['output']['base_dir']) / 'logs' /
+                f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof"
+            )
+            self.profile_file = self.profiler.dump_cprofile(profile_path)
+    
+    def _profile_stage(self, name: str, items: int = 0):
+        """剖析一个流程阶段，未启用剖析时不做任何事"""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(name, items)
+    
+    def _run_stages(self, knowledge_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """构建阶段依赖图并执行
+        
+        指标、质量、模式和价值只读取知识项，可视化和报告只依赖前四个阶段的结果。
+        可视化使用 pyplot，不是线程安全的，并发模式下也在主线程中执行。
+        stage_mode 为 process 时，这四个阶段的计算提交到进程池，阶段线程只等待结果
+        """
+        performance = self.config['performance']
+        # cProfile 只能剖析启用它的线程，需要时串行执行各阶段
+        cprofile_enabled = self.profiler is not None and self.profiler.cprofile is not None
+        executor = StageExecutor(
+            max_workers=performance.get('stage_workers'),
+            parallel=performance.get('parallel_stages', False) and not cprofile_enabled
+        )
+        self.stage_executor = executor
+        
+        use_processes = (executor.parallel and performance.get('stage_mode', 'thread') == 'process'
+                         and resolve_workers(performance.get('stage_workers')) > 1)
+        
+        def add_stage(name, message, func, depends_on=(), main_thread=False):
+            def run(**kwargs):
+                self.logger.info(message)
+                with self._profile_stage(name, len(knowledge_items)):
+                    return func(**kwargs)
+            executor.add_stage(name, run, depends_on=depends_on, main_thread=main_thread)
+        
+        analysis_stages = ('metrics', 'quality_scores', 'patterns', 'value_assessments')
+        
+        add_stage('metrics', "步骤 2: 指标计算",
+                  lambda: self._calculate_metrics(knowledge_items))
+        add_stage('quality_scores', "步骤 3: 质量评估",
+                  lambda: self._assess_quality(knowledge_items))
+        add_stage('patterns', "步骤 4: 模式识别",
+                  lambda: self._recognize_patterns(knowledge_items))
+        add_stage('value_assessments', "步骤 5: 价值评估",
+                  lambda: self._assess_value(knowledge_items))
+        
+        add_stage('visualizations', "步骤 6: 生成可视化",
+                  lambda **results: self._generate_visualizations(results),
+                  depends_on=analysis_stages, main_thread=True)
+        add_stage('reports', "步骤 7: 生成报告",
+                  lambda **results: self._generate_reports({'knowledge_items': knowledge_items, **results}),
+                  depends_on=analysis_stages)
+        
+        if not use_processes:
+            results = executor.run()
+        else:
+            workers = min(resolve_workers(performance.get('stage_workers')), len(analysis_stages))
+            self._stage_pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                # 在阶段线程启动前创建工作进程，避免在多线程状态下 fork
+                self._stage_pool.submit(os.getpid).result()
+                results = executor.run()
+            finally:
+                self._stage_pool.shutdown()
+                self._stage_pool = None
+        
+        self.logger.info(f"分析阶段完成，总耗时 {executor.total_time:.3f}s")
+        return results
+    
+    def _call_component(self, name: str, method_name: str, *args) -> Any:
+        """调用分析模块的方法
+        
+        阶段在进程中执行时，由工作进程中按同名配置节新建的模块实例完成调用；
+        工作进程使用自己的文档缓存，结果与在主进程中调用一致
+        """
+        if self._stage_pool is None:
+            return getattr(getattr(self, name), method_name)(*args)
+        return submit_method_call(self._stage_pool, partial(_create_stage_component, name),
+                                  self.config.get(name, {}), method_name, *args).result()
+    
+    def _assess_incrementally(self, knowledge_items: List[Dict[str, Any]], table: str,
+                              assess_batch, time_signature) -> List[Dict[str, Any]]:
+        """只评估状态库中没有的知识项，并与已保存的结果按原顺序合并
+
+        评估结果含时效性评分：time_signature 给出结果中随当前时间变化的部分，
+        该部分与保存时不同（如跨过时效性分段）的结果过期，重新评估
+        """
+        keys = [item_key(item) for item in knowledge_items]
+        unique_items = {}
+        for key, item in zip(keys, knowledge_items):
+            unique_items.setdefault(key, item)
+        time_signatures = {key: time_signature(item) for key, item in unique_items.items()}
+        cached = self.state_store.load_results(table, keys, time_signatures)
+        
+        pending = {key: item for key, item in unique_items.items() if key not in cached}
+        
+        self.logger.info(f"增量评估 {table}：新增 {len(pending)} 项，复用 {len(cached)} 项")
+        
+        new_results = assess_batch(list(pending.values()))
+        new_results = dict(zip(pending.keys(), [
+            result.__dict__ if hasattr(result, '__dict__') else result for result in new_results
+        ]))
+        
+        self.state_store.save_results(table, new_results, time_signatures)
+        self.state_store.prune_results(table, set(keys))
+        
+        return [cached[key] if key in cached else new_results[key] for key in keys]
+    
     def _calculate_metrics(self, knowledge_items: List[Dict[str, Any]]) -> Dict[str, Any]:
         """计算指标"""
         try:
-            return self.metrics_calculator.calculate_all_metrics(knowledge_items)
+            if self.state_store is not None:
+                return self.metrics_calculator.calculate_incremental_metrics(
+                    knowledge_items, self.state_store
+                )
+            return self._call_component('metrics_calculator', 'calculate_all_metrics', knowledge_items)
         except Exception as e:
             self.logger.error(f"指标计算失败: {e}")
             return {}
@@ -295,35 +592,36 @@ class KnowledgeEmergenceAnalyzer:
     def _assess_quality(self, knowledge_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """评估质量"""
         try:
-            quality_scores = self.quality_assessor.assess_batch_quality(knowledge_items)
+            if self.state_store is not None:
+                return self._assess_incrementally(
+                    knowledge_items, 'item_quality', self._assess_quality_batch,
+                    self.quality_assessor.time_signature
+                )
+            
+            quality_scores = self._assess_quality_batch(knowledge_items)
             # 转换为字典格式以便JSON序列化
             return [score.__dict__ if hasattr(score, '__dict__') else score for score in quality_scores]
         except Exception as e:
             self.logger.error(f"质量评估失败: {e}")
             return []
     
+    def _assess_quality_batch(self, knowledge_items: List[Dict[str, Any]]) -> List[QualityScore]:
+        """按性能配置串行或多进程评估质量"""
+        performance = self.config['performance']
+        if performance.get('parallel_processing'):
+            return self.quality_assessor.assess_batch_quality_parallel(
+                knowledge_items,
+                max_workers=performance.get('max_workers'),
+                chunk_size=performance.get('batch_size', 100)
+            )
+        return self._call_component('quality_assessor', 'assess_batch_quality', knowledge_items)
+    
     def _recognize_patterns(self, knowledge_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """识别模式"""
         try:
-            all_patterns = []
-            
-            # 时间模式
-            temporal_patterns = self.pattern_recognizer.identify_temporal_patterns(knowledge_items)
-            all_patterns.extend([p.__dict__ if hasattr(p, '__dict__') else p for p in temporal_patterns])
-            
-            # 内容模式
-            content_patterns = self.pattern_recognizer.identify_content_patterns(knowledge_items)
-            all_patterns.extend([p.__dict__ if hasattr(p, '__dict__') else p for p in content_patterns])
-            
-            # 结构模式
-            structural_patterns = self.pattern_recognizer.identify_structural_patterns(knowledge_items)
-            all_patterns.extend([p.__dict__ if hasattr(p, '__dict__') else p for p in structural_patterns])
-            
-            # 涌现模式
-            emergence_patterns = self.pattern_recognizer.identify_emergence_patterns(knowledge_items)
-            all_patterns.extend([p.__dict__ if hasattr(p, '__dict__') else p for p in emergence_patterns])
-            
-            return all_patterns
+            # 依次识别时间、内容、结构和涌现模式
+            all_patterns = self._call_component('pattern_recognizer', 'identify_all_patterns', knowledge_items)
+            return [p.__dict__ if hasattr(p, '__dict__') else p for p in all_patterns]
             
         except Exception as e:
             self.logger.error(f"模式识别失败: {e}")
@@ -332,100 +630,63 @@ class KnowledgeEmergenceAnalyzer:
     def _assess_value(self, knowledge_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """评估价值"""
         try:
-            value_assessments = self.value_assessor.assess_batch_value(knowledge_items)
+            if self.state_store is not None:
+                return self._assess_incrementally(
+                    knowledge_items, 'item_value', self._assess_value_batch,
+                    self.value_assessor.time_signature
+                )
+            
+            value_assessments = self._assess_value_batch(knowledge_items)
             # 转换为字典格式以便JSON序列化
             return [va.__dict__ if hasattr(va, '__dict__') else va for va in value_assessments]
         except Exception as e:
             self.logger.error(f"价值评估失败: {e}")
             return []
     
+    def _assess_value_batch(self, knowledge_items: List[Dict[str, Any]]) -> List[ValueAssessment]:
+        """按性能配置串行或多进程评估价值"""
+        performance = self.config['performance']
+        if performance.get('parallel_processing'):
+            return self.value_assessor.assess_batch_value_parallel(
+                knowledge_items,
+                max_workers=performance.get('max_workers'),
+                chunk_size=performance.get('batch_size', 100)
+            )
+        return self._call_component('value_assessor', 'assess_batch_value', knowledge_items)
+    
     def _generate_visualizations(self, analysis_data: Dict[str, Any]) -> List[str]:
-        """生成可视化"""
+        """生成可视化，各图表互相独立，可在进程池中并行渲染"""
         try:
-            visualization_files = []
-            
-            # 指标可视化
-            metrics_viz = self.visualizer.generate_metrics_visualization(
-                analysis_data.get('metrics', {}),
-                "metrics_overview.png"
-            )
-            if metrics_viz:
-                visualization_files.append(metrics_viz)
-            
-            # 模式可视化
-            patterns_viz = self.visualizer.generate_pattern_visualization(
-                analysis_data.get('patterns', []),
-                "pattern_analysis.png"
-            )
-            if patterns_viz:
-                visualization_files.append(patterns_viz)
-            
-            # 质量可视化
-            quality_viz = self.visualizer.generate_quality_visualization(
-                analysis_data.get('quality_scores', []),
-                "quality_analysis.png"
-            )
-            if quality_viz:
-                visualization_files.append(quality_viz)
-            
-            # 价值可视化
-            value_viz = self.visualizer.generate_value_visualization(
-                analysis_data.get('value_assessments', []),
-                "value_analysis.png"
-            )
-            if value_viz:
-                visualization_files.append(value_viz)
-            
-            # 综合仪表板
-            dashboard_viz = self.visualizer.generate_comprehensive_dashboard(
-                {
+            jobs = [
+                # 指标可视化
+                ('generate_metrics_visualization', analysis_data.get('metrics', {}), "metrics_overview.png"),
+                # 模式可视化
+                ('generate_pattern_visualization', analysis_data.get('patterns', []), "pattern_analysis.png"),
+                # 质量可视化
+                ('generate_quality_visualization', analysis_data.get('quality_scores', []), "quality_analysis.png"),
+                # 价值可视化
+                ('generate_value_visualization', analysis_data.get('value_assessments', []), "value_analysis.png"),
+                # 综合仪表板
+                ('generate_comprehensive_dashboard', {
                     'metrics': analysis_data.get('metrics', {}),
                     'quality': analysis_data.get('quality_scores', []),
                     'value': analysis_data.get('value_assessments', []),
                     'patterns': analysis_data.get('patterns', [])
-                },
-                "comprehensive_dashboard.png"
-            )
-            if dashboard_viz:
-                visualization_files.append(dashboard_viz)
+                }, "comprehensive_dashboard.png")
+            ]
             
-            return visualization_files
+            return self.visualizer.render_charts(jobs)
             
         except Exception as e:
             self.logger.error(f"可视化生成失败: {e}")
             return []
     
-    def _generate_reports(self, analysis_data: Dict[str, Any]) -> List[str]:
-        """生成报告"""
+    def _generate_reports(self, analysis_data: Dict[str, Any],
+                          json_results: Dict[str, Any] = None) -> List[str]:
+        """生成报告，json_results 为JSON报告中写入的完整分析数据，默认为 analysis_data"""
         try:
-            report_files = []
-            
-            # 执行摘要
-            exec_summary = self.report_generator.generate_executive_summary(analysis_data)
-            if exec_summary:
-                report_files.append(exec_summary)
-            
-            # 技术报告
-            tech_report = self.report_generator.generate_technical_report(analysis_data)
-            if tech_report:
-                report_files.append(tech_report)
-            
-            # 综合报告
-            comprehensive_report = self.report_generator.generate_comprehensive_report(analysis_data)
-            if comprehensive_report:
-                report_files.append(comprehensive_report)
-            
-            # JSON报告
-            json_report = self.report_generator.generate_json_report(analysis_data)
-            if json_report:
-                report_files.append(json_report)
-            
-            # HTML报告
-            html_report = self.report_generator.generate_html_report(analysis_data)
-            if html_report:
-                report_files.append(html_report)
-            
-            return report_files
+            # 批量生成时各格式共用一次计算的汇总数据
+            return self.report_generator.generate_batch_reports(analysis_data, json_results)
             
         except Exception as e:
             self.logger.error(f"报告生成失败: {e}")
@@ -437,6 +698,16 @@ class KnowledgeEmergenceAnalyzer:
             output_dir = Path(self.config['output']['base_dir'])
             results_file = output_dir / 'analysis_results.json'
             
+            results_format = self.config['output'].get('results_format', 'json')
+            if results_format in COLUMNAR_FORMATS and not columnar_available():
+                self.logger.warning(f"未安装 pyarrow，无法使用 {results_format} 格式，改为保存 JSON")
+                results_format = 'json'
+            
+            if results_format in COLUMNAR_FORMATS:
+                analysis_data, columnar_tables = self._save_columnar_tables(analysis_data, results_format)
+            else:
+                columnar_tables = {}
+            
             # 准备保存数据
             save_data = {
                 'metadata': {
@@ -445,13 +716,16 @@ class KnowledgeEmergenceAnalyzer:
                     'analyzer_version': '1.0.0'
                 },
                 'summary': {
-                    'knowledge_items_count': len(analysis_data.get('knowledge_items', [])),
+                    'knowledge_items_count': columnar_tables.get('knowledge_items', {}).get(
+                        'count', len(analysis_data.get('knowledge_items', []))),
                     'patterns_count': len(analysis_data.get('patterns', [])),
                     'visualization_files_count': len(analysis_data.get('visualization_files', [])),
                     'report_files_count': len(analysis_data.get('report_files', []))
                 },
                 'analysis_data': analysis_data
             }
+            if columnar_tables:
+                save_data['columnar_tables'] = columnar_tables
             
             with open(results_file, 'w', encoding='utf-8') as f:
                 json.dump(save_data, f, ensure_ascii=False, indent=2, default=str)
@@ -462,6 +736,86 @@ class KnowledgeEmergenceAnalyzer:
             self.logger.error(f"保存分析结果失败: {e}")
             return ""
     
+    def _save_columnar_tables(self, analysis_data: Dict[str, Any],
+                              results_format: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """把知识项和评估结果写入列式文件，返回去掉这些列表后的分析数据和文件索引"""
+        data_dir = Path(self.config['output']['base_dir']) / 'data'
+        suffix = COLUMNAR_FORMATS[results_format]
+        
+        remaining = dict(analysis_data)
+        columnar_tables = {}
+        for name in self.COLUMNAR_TABLES:
+            if name not in remaining:
+                continue
+            records = remaining.pop(name)
+            file_path = write_records(records, str(data_dir / f"{name}{suffix}"), results_format)
+            columnar_tables[name] = {
+                'path': str(Path('data') / Path(file_path).name),
+                'format': results_format,
+                'count': len(records)
+            }
+        
+        return remaining, columnar_tables
+    
+    def load_analysis_results(self, results_file: str, memory_map: bool = True,
+                              columns: Dict[str, List[str]] = None, lazy: bool = False) -> Dict[str, Any]:
+        """加载已保存的分析结果，列式存储的知识项和评估结果以内存映射方式读取
+        
+        columns 按表名指定只读取的列（未列出的表读取全部列）；
+        lazy 为 True 时列式表以 RecordTable 返回，遍历时才按批读取
+        """
+        results_path = Path(results_file)
+        with open(results_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        
+        analysis_data = saved.get('analysis_data', {})
+        for name, table in saved.get('columnar_tables', {}).items():
+            table_path = str(results_path.parent / table['path'])
+            table_columns = (columns or {}).get(name)
+            if lazy:
+                analysis_data[name] = RecordTable(table_path, columns=table_columns)
+            else:
+                analysis_data[name] = read_records(table_path, memory_map=memory_map, columns=table_columns)
+        
+        self.logger.info(f"已加载分析结果: {results_file}")
+        return analysis_data
+    
+    def regenerate_reports(self, results_file: str, output_dir: str = None,
+                           include_visualizations: bool = False) -> Dict[str, Any]:
+        """根据已保存的分析结果重新生成报告，不重新执行分析
+        
+        汇总和图表只读取列式表中需要的列；JSON报告中的完整记录写入时按批读取，不整体载入内存
+        """
+        try:
+            analysis_data = self.load_analysis_results(results_file, columns=self.REPORT_COLUMNS)
+            json_results = self.load_analysis_results(results_file, lazy=True)
+            
+            if output_dir:
+                self.config['output']['base_dir'] = output_dir
+                self.config['report_generator']['output_dir'] = str(Path(output_dir) / 'reports')
+                self.config['visualizer']['output_dir'] = str(Path(output_dir) / 'visualizations')
+                self.report_generator = ReportGenerator(self.config['report_generator'])
+                self.visualizer = Visualizer(self.config['visualizer'])
+            
+            visualization_files = self._generate_visualizations(analysis_data) if include_visualizations else []
+            report_files = self._generate_reports(analysis_data, json_results)
+            
+            return {
+                'status': 'success',
+                'knowledge_items_count': len(analysis_data.get('knowledge_items', [])),
+                'visualization_files': visualization_files,
+                'report_files': report_files,
+                'analysis_time': datetime.now().isoformat()
+            }
+        
+        except Exception as e:
+            self.logger.error(f"重新生成报告失败: {e}")
+            return {
+                'status': 'error',
+                'error': str(e),
+                'analysis_time': datetime.now().isoformat()
+            }
+    
     def _create_output_directories(self):
         """创建输出目录结构"""
         base_dir = Path(self.config['output']['base_dir'])
@@ -483,12 +837,17 @@ class KnowledgeEmergenceAnalyzer:
             return {'status': 'error', 'error': '无数据'}
         
         # 只计算基本指标
-        metrics = self._calculate_metrics(knowledge_items)
+        document_cache = self._build_document_cache(knowledge_items)
+        try:
+            metrics = self._calculate_metrics(knowledge_items)
+        finally:
+            self._detach_document_cache()
         
         # 生成简单报告
         simple_report = {
             'knowledge_items_count': len(knowledge_items),
             'metrics': metrics,
+            'run_stats': {'document_cache': document_cache.get_stats()},
             'analysis_time': datetime.now().isoformat()
         }
         
@@ -500,28 +859,243 @@ class KnowledgeEmergenceAnalyzer:
         
         return {'status': 'success', 'results': simple_report}
     
+    def approximate_analysis(self, data_source: str = None, output_dir: str = None,
+                             sample_size: int = None) -> Dict[str, Any]:
+        """近似分析
+        
+        单遍扫描数据源，按来源和时间分层抽取蓄水池样本（文件数据源流式读取，不保留全部数据），
+        在样本上计算指标和识别模式；样本分为 replicates 组，依次删去一组重新计算，
+        由分组删除刀切法给出每个数值指标的置信区间。耗时约为样本上精确分析的 replicates + 1 倍
+        """
+        self.logger.info("执行近似分析...")
+        approx_config = self.config['approximate']
+        replicates = approx_config['replicates']
+        confidence_level = approx_config['confidence_level']
+        start_time = time.perf_counter()
+        
+        sampler = StratifiedReservoirSampler(sample_size or approx_config['sample_size'],
+                                             time_bucket=approx_config['time_bucket'],
+                                             seed=approx_config['seed'])
+        if data_source and os.path.isfile(data_source):
+            for batch in self.data_collector.iter_file_batches(data_source, Path(data_source).suffix.lower()):
+                sampler.extend(batch)
+        else:
+            sampler.extend(self._collect_data(data_source))
+        
+        sample, groups = sampler.sample(replicates)
+        if not sample:
+            return {'status': 'error', 'error': '无数据'}
+        
+        self.logger.info(f"从 {sampler.seen} 条知识项中分层抽取 {len(sample)} 条样本")
+        
+        metrics = self._calculate_metrics(sample)
+        patterns = self._recognize_patterns(sample)
+        pattern_summary = self._summarize_patterns(patterns)
+        
+        # 刀切法复制样本：依次删去一组
+        metric_replicates = []
+        pattern_replicates = []
+        if groups is not None:
+            for group in range(replicates):
+                subset = [item for item, item_group in zip(sample, groups) if item_group != group]
+                metric_replicates.append(self._calculate_metrics(subset))
+                pattern_replicates.append(self._summarize_patterns(self._recognize_patterns(subset)))
+        
+        approximate_report = {
+            'knowledge_items_count': sampler.seen,
+            'sampling': sampler.get_stats(),
+            'confidence_level': confidence_level,
+            'replicates': len(metric_replicates),
+            'metrics': metrics,
+            'pattern_summary': pattern_summary,
+            'confidence_intervals': {
+                'metrics': jackknife_intervals(metrics, metric_replicates, confidence_level),
+                'patterns': jackknife_intervals(pattern_summary, pattern_replicates, confidence_level)
+            },
+            'patterns': patterns,
+            'elapsed_time': round(time.perf_counter() - start_time, 3),
+            'analysis_time': datetime.now().isoformat()
+        }
+        
+        self.logger.info(f"近似分析完成，耗时 {approximate_report['elapsed_time']:.1f}s")
+        
+        if output_dir:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            output_path = Path(output_dir) / 'approximate_analysis.json'
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(approximate_report, f, ensure_ascii=False, indent=2, default=str)
+            approximate_report['output_file'] = str(output_path)
+        
+        return {'status': 'success', 'results': approximate_report}
+    
+    def _summarize_patterns(self, patterns: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """模式的数值汇总：总数、各类型数量、平均置信度和平均强度"""
+        type_counts = {}
+        for pattern in patterns:
+            pattern_type = pattern.get('pattern_type', 'unknown')
+            type_counts[pattern_type] = type_counts.get(pattern_type, 0) + 1
+        
+        return {
+            'pattern_count': len(patterns),
+            'type_counts': type_counts,
+            'avg_confidence': sum(p.get('confidence', 0) for p in patterns) / len(patterns) if patterns else 0,
+            'avg_strength': sum(p.get('strength', 0) for p in patterns) / len(patterns) if patterns else 0
+        }
+    
     def batch_analysis(self, data_sources: List[str], output_dir: str = None) -> List[Dict[str, Any]]:
-        """批量分析"""
+        """批量分析，返回各数据源的完整分析结果；需要并行时使用 batch_analysis_parallel"""
         self.logger.info(f"开始批量分析 {len(data_sources)} 个数据源...")
         
         results = []
         
-        for i, source in enumerate(data_sources):
-            self.logger.info(f"分析数据源 {i+1}/{len(data_sources)}: {source}")
+        try:
+            for i, source in enumerate(data_sources):
+                self.logger.info(f"分析数据源 {i+1}/{len(data_sources)}: {source}")
+                
+                try:
+                    result = self.analyze(source, output_dir)
+                    results.append(result)
+                except Exception as e:
+                    self.logger.error(f"分析数据源 {source} 失败: {e}")
+                    results.append({
+                        'status': 'error',
+                        'data_source': source,
+                        'error': str(e)
+                    })
+        finally:
+            self._detach_document_cache()
+        
+        return results
+    
+    def batch_analysis_parallel(self, data_sources: List[str], output_dir: str = None,
+                                max_workers: int = None, progress_callback=None) -> List[Dict[str, Any]]:
+        """并行批量分析
+        
+        与 batch_analysis 不同，返回的是结果摘要而不是完整分析结果，避免把各进程的全部结果传回并常驻内存。
+        每个数据源在进程池的工作进程中用独立的分析器分析，输出写入 output_dir 下各自的子目录；
+        同时运行的数据源不超过 max_workers（未指定时使用 performance.batch_workers，再缺省为 CPU 核心数）。
+        每完成一个数据源记录进度并调用 progress_callback(已完成数, 总数, 结果摘要)。
+        返回按输入顺序排列的结果摘要（不含知识项和评估结果列表，完整结果见各子目录的 analysis_results.json），
+        汇总写入 output_dir/batch_summary.json
+        """
+        output_dir = Path(output_dir or self.config['output']['base_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        total = len(data_sources)
+        workers = min(resolve_workers(max_workers or self.config['performance'].get('batch_workers')),
+                      max(total, 1))
+        worker_config = self._batch_worker_config(workers)
+        
+        self.logger.info(f"开始并行批量分析 {total} 个数据源，{workers} 个进程...")
+        
+        start_time = time.perf_counter()
+        results = [None] * total
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for i, source in enumerate(data_sources):
+                source_dir = str(output_dir / self._batch_source_dirname(i, source))
+                futures[executor.submit(_analyze_batch_source, worker_config, source, source_dir)] = (i, source, source_dir)
             
-            try:
-                result = self.analyze(source, output_dir)
-                results.append(result)
-            except Exception as e:
-                self.logger.error(f"分析数据源 {source} 失败: {e}")
-                results.append({
-                    'status': 'error',
-                    'data_source': source,
-                    'error': str(e)
-                })
+            for done, future in enumerate(as_completed(futures), 1):
+                i, source, source_dir = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {
+                        'status': 'error',
+                        'data_source': source,
+                        'output_dir': source_dir,
+                        'error': str(e)
+                    }
+                results[i] = result
+                
+                if result['status'] == 'success':
+                    self.logger.info(f"批量分析进度 {done}/{total}: {source} 完成，"
+                                     f"{result['knowledge_items_count']} 条知识项，耗时 {result['elapsed_time']:.1f}s")
+                else:
+                    self.logger.error(f"批量分析进度 {done}/{total}: {source} 失败: {result.get('error')}")
+                
+                if progress_callback:
+                    progress_callback(done, total, result)
+        
+        self.batch_summary = self._merge_batch_results(results, workers, time.perf_counter() - start_time)
+        summary_file = output_dir / 'batch_summary.json'
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            json.dump(self.batch_summary, f, ensure_ascii=False, indent=2, default=str)
         
+        self.logger.info(f"并行批量分析完成：成功 {self.batch_summary['succeeded']} 个，"
+                         f"失败 {self.batch_summary['failed']} 个，总耗时 {self.batch_summary['wall_time']:.1f}s，"
+                         f"汇总已保存: {summary_file}")
         return results
     
+    def _batch_worker_config(self, batch_workers: int) -> Dict[str, Any]:
+        """工作进程使用的配置：未指定的进程内并行度按批量进程数分摊 CPU，避免进程数成倍膨胀"""
+        config = json.loads(json.dumps(self.config, default=str))
+        inner_workers = max(1, resolve_workers() // batch_workers)
+        
+        if not config['performance'].get('max_workers'):
+            config['performance']['max_workers'] = inner_workers
+        if not config['visualizer'].get('render_workers'):
+            config['visualizer']['render_workers'] = inner_workers
+        
+        return config
+    
+    def _batch_source_dirname(self, index: int, data_source: str) -> str:
+        """数据源的输出子目录名：序号加数据源名称，序号保证同名数据源互不覆盖"""
+        name = re.sub(r'[^\w.-]+', '_', Path(str(data_source).rstrip('/')).stem or 'source')
+        return f"{index + 1:03d}_{name[:60]}"
+    
+    def _summarize_batch_result(self, data_source: str, output_dir: str,
+                                result: Dict[str, Any], elapsed_time: float) -> Dict[str, Any]:
+        """批量分析中单个数据源的结果摘要"""
+        summary = {
+            'status': result['status'],
+            'data_source': data_source,
+            'output_dir': output_dir,
+            'elapsed_time': round(elapsed_time, 3)
+        }
+        
+        if result['status'] != 'success':
+            summary['error'] = result.get('error')
+            return summary
+        
+        summary.update({
+            'knowledge_items_count': result['knowledge_items_count'],
+            'avg_quality': self.report_generator._calculate_average_quality(result['quality_scores']),
+            'avg_value': self.report_generator._calculate_average_value(result['value_assessments']),
+            'pattern_count': len(result['patterns']),
+            'results_file': result['results_file'],
+            'visualization_files': result['visualization_files'],
+            'report_files': result['report_files']
+        })
+        return summary
+    
+    def _merge_batch_results(self, results: List[Dict[str, Any]], workers: int,
+                             wall_time: float) -> Dict[str, Any]:
+        """合并各数据源的结果摘要，平均质量和平均价值按知识项数加权"""
+        succeeded = [r for r in results if r['status'] == 'success']
+        total_items = sum(r['knowledge_items_count'] for r in succeeded)
+        
+        def weighted_average(key):
+            if not total_items:
+                return 0.0
+            return sum(r[key] * r['knowledge_items_count'] for r in succeeded) / total_items
+        
+        return {
+            'batch_time': datetime.now().isoformat(),
+            'workers': workers,
+            'wall_time': round(wall_time, 3),
+            'total_sources': len(results),
+            'succeeded': len(succeeded),
+            'failed': len(results) - len(succeeded),
+            'total_knowledge_items': total_items,
+            'avg_quality': weighted_average('avg_quality'),
+            'avg_value': weighted_average('avg_value'),
+            'total_patterns': sum(r['pattern_count'] for r in succeeded),
+            'sources': results
+        }
+    
     def interactive_mode(self):
         """交互模式"""
         print("\n=== 知识涌现分析器 - 交互模式 ===")
@@ -595,16 +1169,39 @@ def main():
     parser.add_argument('--config', '-c', type=str, help='配置文件路径')
     parser.add_argument('--data', '-d', type=str, help='数据源路径或URL')
     parser.add_argument('--output', '-o', type=str, help='输出目录')
-    parser.add_argument('--mode', '-m', type=str, choices=['analyze', 'quick', 'batch', 'interactive'], 
+    parser.add_argument('--mode', '-m', type=str, choices=['analyze', 'quick', 'approximate', 'batch', 'interactive', 'reports'], 
                        default='analyze', help='运行模式')
+    parser.add_argument('--sample-size', type=int, help='approximate 模式的样本量')
     parser.add_argument('--batch-data', type=str, help='批量分析的数据源列表（用逗号分隔）')
+    parser.add_argument('--batch-workers', type=int,
+                       help='并行批量分析的进程数，每个数据源输出到 --output 下的独立子目录')
     parser.add_argument('--verbose', '-v', action='store_true', help='详细输出')
+    parser.add_argument('--incremental', action='store_true', help='增量分析，只处理新增或变化的知识项')
+    parser.add_argument('--workers', type=int, help='质量和价值评估使用的进程数')
+    parser.add_argument('--results-format', type=str, choices=['json', 'parquet', 'arrow'],
+                       help='分析结果格式，parquet/arrow 按列保存知识项和评估结果（需要 pyarrow）')
+    parser.add_argument('--results', type=str, help='reports 模式下读取的 analysis_results.json 路径')
+    parser.add_argument('--profile', action='store_true', help='记录各阶段耗时、CPU时间和内存峰值')
+    parser.add_argument('--cprofile', type=str, nargs='?', const='',
+                       help='同时输出 cProfile 结果（可指定 .prof 文件路径），各阶段将串行执行')
     
     args = parser.parse_args()
     
     # 创建分析器
     analyzer = KnowledgeEmergenceAnalyzer(args.config)
     
+    if args.workers:
+        analyzer.config['performance']['parallel_processing'] = args.workers > 1
+        analyzer.config['performance']['max_workers'] = args.workers
+    
+    if args.results_format:
+        analyzer.config['output']['results_format'] = args.results_format
+    
+    if args.cprofile is not None:
+        analyzer.config['profiling']['cprofile'] = True
+        if args.cprofile:
+            analyzer.config['profiling']['cprofile_path'] = args.cprofile
+    
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
@@ -617,20 +1214,61 @@ def main():
                 return 1
             result = analyzer.quick_analysis(args.data, args.output)
             print(f"分析结果: {result}")
+        elif args.mode == 'approximate':
+            result = analyzer.approximate_analysis(args.data, args.output, args.sample_size)
+            print(f"近似分析: {result['status']}")
+            if result['status'] == 'success':
+                report = result['results']
+                sampling = report['sampling']
+                print(f"从 {sampling['items_seen']} 条知识项中抽取 {sampling['sample_size']} 条，"
+                      f"{sampling['strata_count']} 个层，耗时 {report['elapsed_time']:.1f}s")
+                for path, interval in report['confidence_intervals']['metrics'].items():
+                    if path.endswith('_score'):
+                        print(f"  {path}: {interval['estimate']:.4f} "
+                              f"[{interval['lower']:.4f}, {interval['upper']:.4f}]")
+            else:
+                print(f"近似分析失败: {result.get('error', 'Unknown error')}")
+        elif args.mode == 'reports':
+            if not args.results:
+                print("错误: 报告模式需要指定分析结果文件 --results")
+                return 1
+            result = analyzer.regenerate_reports(args.results, args.output)
+            print(f"报告生成: {result['status']}")
+            if result['status'] == 'success':
+                print(f"生成了 {len(result['report_files'])} 个报告文件")
+            else:
+                print(f"报告生成失败: {result.get('error', 'Unknown error')}")
         elif args.mode == 'batch':
             if not args.batch_data:
                 print("错误: 批量分析模式需要指定数据源列表")
                 return 1
             data_sources = [s.strip() for s in args.batch_data.split(',')]
-            results = analyzer.batch_analysis(data_sources, args.output)
+            if args.batch_workers or analyzer.config['performance'].get('batch_parallel'):
+                results = analyzer.batch_analysis_parallel(data_sources, args.output,
+                                                           max_workers=args.batch_workers)
+            else:
+                results = analyzer.batch_analysis(data_sources, args.output)
             print(f"批量分析完成，处理了 {len(results)} 个数据源")
+            if analyzer.batch_summary:
+                summary = analyzer.batch_summary
+                print(f"成功 {summary['succeeded']} 个，失败 {summary['failed']} 个，"
+                      f"共 {summary['total_knowledge_items']} 条知识项，耗时 {summary['wall_time']:.1f}s")
         else:  # analyze mode
-            result = analyzer.analyze(args.data, args.output)
+            profile = args.profile or args.cprofile is not None
+            result = analyzer.analyze(args.data, args.output, incremental=args.incremental or None,
+                                      profile=profile or None)
             print(f"分析完成: {result['status']}")
             if result['status'] == 'success':
                 print(f"分析了 {result['knowledge_items_count']} 个知识项")
                 print(f"生成了 {len(result['visualization_files'])} 个可视化文件")
                 print(f"生成了 {len(result['report_files'])} 个报告文件")
+                if 'profile' in result['run_stats']:
+                    profile_stats = result['run_stats']['profile']
+                    print(f"各阶段耗时（峰值内存 {profile_stats['peak_rss_mb']} MB）:")
+                    for name, stage in profile_stats['stages'].items():
+                        print(f"  {name}: {stage['wall_time']:.3f}s 墙钟 / {stage['cpu_time']:.3f}s CPU")
+                    if 'cprofile_file' in profile_stats:
+                        print(f"cProfile 结果: {profile_stats['cprofile_file']}")
             else:
                 print(f"分析失败: {result.get('error', 'Unknown error')}")
         
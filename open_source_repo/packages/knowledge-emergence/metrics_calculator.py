@@ -5,15 +5,26 @@
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Sequence
 from collections import Counter, defaultdict
+from itertools import chain
 from datetime import datetime, timedelta
+import re
 import math
 import logging
-from scipy import stats
+from scipy import stats, sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from document_cache import AnalyzedDocument, DocumentCache, get_document
+from state_store import item_key
+from emergence_stream import StreamingEmergenceCalculator
+from time_index import TimeIndex
+
+
+# 结构复杂性统计的标点符号
+_PUNCTUATION_PATTERN = re.compile(r'[.,;:!?()\[\]{}]')
+
 
 class MetricsCalculator:
     """知识涌现指标计算器"""
@@ -24,6 +35,28 @@ class MetricsCalculator:
         self.knowledge_graph = {}
         self.temporal_data = []
         
+        # 连接性计算中忽略出现在过多知识项中的常见概念（0或None表示不限制）
+        self.max_concept_postings = self.config.get('max_concept_postings', 1000)
+        self.graph_block_size = self.config.get('graph_block_size', 1000)
+        
+        # 连贯性计算模式：'dense'、'sparse' 或 'auto'（超过阈值时使用稀疏计算）
+        self.coherence_mode = self.config.get('coherence_mode', 'auto')
+        self.sparse_coherence_threshold = self.config.get('sparse_coherence_threshold', 2000)
+        self.coherence_block_size = self.config.get('coherence_block_size', 1000)
+        
+        # 涌现性计算模式：'exact' 精确计算，'streaming' 使用 MinHash 草图在线估计
+        self.emergence_mode = self.config.get('emergence_mode', 'exact')
+        self.emergence_num_perm = self.config.get('emergence_num_perm', 128)
+        # 在线计算保留的历史窗口签名数上限，None 表示不限制
+        self.emergence_max_sketches = self.config.get('emergence_max_sketches', 1000)
+        
+        # 由分析器注入的共享文档缓存
+        self.document_cache: Optional[DocumentCache] = None
+    
+    def _get_document(self, knowledge_item: Dict[str, Any]) -> AnalyzedDocument:
+        """获取知识项的分词结果"""
+        return get_document(self.document_cache, knowledge_item)
+    
     def calculate_diversity_metrics(self, knowledge_items: List[Dict[str, Any]]) -> Dict[str, float]:
         """计算知识多样性指标"""
         try:
@@ -34,76 +67,86 @@ class MetricsCalculator:
             topics = []
             for item in knowledge_items:
                 # 简单的关键词提取（实际应用中应使用NLP技术）
-                text = item.get('content', '') + ' ' + item.get('title', '')
-                words = text.lower().split()
-                topics.extend([word for word in words if len(word) > 3])
-            
-            # 计算主题分布
-            topic_counts = Counter(topics)
-            total_topics = len(topics)
+                topics.extend(self._get_document(item).topic_words)
             
-            if total_topics == 0:
-                return {"diversity_score": 0.0}
-            
-            # 香农多样性指数
-            shannon_diversity = -sum((count/total_topics) * math.log2(count/total_topics) 
-                                   for count in topic_counts.values() if count > 0)
-            
-            # 辛普森多样性指数
-            simpson_diversity = 1 - sum((count/total_topics)**2 for count in topic_counts.values())
-            
-            # 基尼系数（不平等程度）
-            sorted_counts = sorted(topic_counts.values())
-            n = len(sorted_counts)
-            cumsum = np.cumsum(sorted_counts)
-            gini = (2 * sum((i+1) * count for i, count in enumerate(sorted_counts))) / (n * sum(sorted_counts)) - (n+1) / n
-            
-            return {
-                "shannon_diversity": round(shannon_diversity, 4),
-                "simpson_diversity": round(simpson_diversity, 4),
-                "gini_coefficient": round(gini, 4),
-                "unique_topics": len(topic_counts),
-                "total_topics": total_topics,
-                "diversity_score": round(shannon_diversity / math.log2(len(topic_counts) + 1), 4)
-            }
+            return self._summarize_diversity(Counter(topics))
             
         except Exception as e:
             self.logger.error(f"计算多样性指标失败: {e}")
             return {}
     
+    def _summarize_diversity(self, topic_counts: Counter) -> Dict[str, float]:
+        """由主题词频统计多样性指标"""
+        total_topics = sum(topic_counts.values())
+        
+        if total_topics == 0:
+            return {"diversity_score": 0.0}
+        
+        # 香农多样性指数
+        shannon_diversity = -sum((count/total_topics) * math.log2(count/total_topics) 
+                               for count in topic_counts.values() if count > 0)
+        
+        # 辛普森多样性指数
+        simpson_diversity = 1 - sum((count/total_topics)**2 for count in topic_counts.values())
+        
+        # 基尼系数（不平等程度）
+        sorted_counts = sorted(topic_counts.values())
+        n = len(sorted_counts)
+        gini = (2 * sum((i+1) * count for i, count in enumerate(sorted_counts))) / (n * sum(sorted_counts)) - (n+1) / n
+        
+        return {
+            "shannon_diversity": round(shannon_diversity, 4),
+            "simpson_diversity": round(simpson_diversity, 4),
+            "gini_coefficient": round(gini, 4),
+            "unique_topics": len(topic_counts),
+            "total_topics": total_topics,
+            "diversity_score": round(shannon_diversity / math.log2(len(topic_counts) + 1), 4)
+        }
+    
     def calculate_connectivity_metrics(self, knowledge_items: List[Dict[str, Any]]) -> Dict[str, float]:
         """计算知识连接性指标"""
         try:
             if not knowledge_items:
                 return {}
             
-            # 构建简单的引用网络
-            connections = defaultdict(set)
-            all_concepts = set()
-            
+            # 构建概念倒排索引：概念 -> 包含该概念的知识项
+            concept_postings = defaultdict(list)
             for i, item in enumerate(knowledge_items):
-                text = item.get('content', '') + ' ' + item.get('title', '')
-                words = set(word.lower() for word in text.split() if len(word) > 3)
-                all_concepts.update(words)
-                
-                # 简单的概念共现
-                for j, other_item in enumerate(knowledge_items):
-                    if i != j:
-                        other_text = other_item.get('content', '') + ' ' + other_item.get('title', '')
-                        other_words = set(word.lower() for word in other_text.split() if len(word) > 3)
-                        
-                        # 计算概念重叠
-                        common_concepts = words.intersection(other_words)
-                        if len(common_concepts) > 0:
-                            connections[i].update([j] * len(common_concepts))
+                for concept in self._get_document(item).topic_set:
+                    concept_postings[concept].append(i)
             
             # 计算网络指标
             n_items = len(knowledge_items)
             if n_items <= 1:
                 return {"connectivity_score": 0.0}
             
+            # 由倒排表构建知识项×概念的稀疏矩阵，跳过过于常见的概念（仅经由这些概念的连接不再计入）
+            item_ids, concept_ids = [], []
+            kept_concepts = 0
+            skipped_concepts = 0
+            for postings in concept_postings.values():
+                if len(postings) < 2:
+                    continue
+                if self.max_concept_postings and len(postings) > self.max_concept_postings:
+                    skipped_concepts += 1
+                    continue
+                
+                item_ids.extend(postings)
+                concept_ids.extend([kept_concepts] * len(postings))
+                kept_concepts += 1
+            
+            if skipped_concepts:
+                self.logger.info(f"连接性计算跳过 {skipped_concepts} 个常见概念")
+            
+            incidence = sparse.csr_matrix(
+                (np.ones(len(item_ids), dtype=np.int32), (item_ids, concept_ids)),
+                shape=(n_items, kept_concepts)
+            )
+            adjacency = self._build_item_adjacency(incidence)
+            degrees = np.diff(adjacency.indptr)
+            
             # 平均连接度
-            total_connections = sum(len(conns) for conns in connections.values())
+            total_connections = int(degrees.sum())
             avg_connectivity = total_connections / n_items if n_items > 0 else 0
             
             # 网络密度
@@ -111,23 +154,7 @@ class MetricsCalculator:
             network_density = total_connections / max_connections if max_connections > 0 else 0
             
             # 聚类系数
-            clustering_coeffs = []
-            for i in range(n_items):
-                neighbors = connections[i]
-                if len(neighbors) <= 1:
-                    continue
-                
-                # 计算邻居之间的连接
-                neighbor_connections = 0
-                possible_connections = len(neighbors) * (len(neighbors) - 1) / 2
-                
-                for neighbor1 in neighbors:
-                    for neighbor2 in neighbors:
-                        if neighbor1 < neighbor2 and neighbor2 in connections[neighbor1]:
-                            neighbor_connections += 1
-                
-                if possible_connections > 0:
-                    clustering_coeffs.append(neighbor_connections / possible_connections)
+            clustering_coeffs = self._calculate_clustering_coefficients(adjacency)
             
             avg_clustering = np.mean(clustering_coeffs) if clustering_coeffs else 0
             
@@ -143,61 +170,129 @@ class MetricsCalculator:
             self.logger.error(f"计算连接性指标失败: {e}")
             return {}
     
+    def _build_item_adjacency(self, incidence: sparse.csr_matrix) -> sparse.csr_matrix:
+        """由知识项×概念矩阵 X 得到知识项邻接矩阵：X·Xᵀ 的非零非对角元素，按行分块计算以限制内存占用"""
+        n_items = incidence.shape[0]
+        transposed = incidence.T.tocsr()
+        
+        blocks = []
+        block_size = max(1, int(self.graph_block_size))
+        for start in range(0, n_items, block_size):
+            block = (incidence[start:start + block_size] @ transposed).tocoo()
+            off_diagonal = block.row + start != block.col
+            blocks.append(sparse.csr_matrix(
+                (np.ones(int(off_diagonal.sum())), (block.row[off_diagonal], block.col[off_diagonal])),
+                shape=block.shape
+            ))
+        
+        adjacency = sparse.vstack(blocks, format='csr') if blocks else sparse.csr_matrix((0, 0))
+        adjacency.sort_indices()
+        return adjacency
+    
+    def _calculate_clustering_coefficients(self, adjacency: sparse.csr_matrix) -> List[float]:
+        """基于稀疏邻接矩阵计算度数不小于2的节点的局部聚类系数
+        
+        节点的三角形数为 (A·A ∘ A) 行和的一半，按行分块计算以限制内存占用
+        """
+        n_items = adjacency.shape[0]
+        degrees = np.diff(adjacency.indptr)
+        
+        if not np.any(degrees > 1):
+            return []
+        
+        triangles = np.zeros(n_items)
+        block_size = max(1, int(self.graph_block_size))
+        for start in range(0, n_items, block_size):
+            block = adjacency[start:start + block_size]
+            paths = block @ adjacency
+            triangles[start:start + block_size] = np.asarray(paths.multiply(block).sum(axis=1)).ravel() / 2
+        
+        clustering_coeffs = []
+        for i in np.flatnonzero(degrees > 1):
+            possible_connections = degrees[i] * (degrees[i] - 1) / 2
+            clustering_coeffs.append(triangles[i] / possible_connections)
+        
+        return clustering_coeffs
+    
     def calculate_complexity_metrics(self, knowledge_items: List[Dict[str, Any]]) -> Dict[str, float]:
         """计算知识复杂性指标"""
         try:
             if not knowledge_items:
                 return {}
             
-            complexities = []
+            complexities = self._calculate_complexity_scores(knowledge_items)
             
-            for item in knowledge_items:
-                text = item.get('content', '') + ' ' + item.get('title', '')
-                
-                if not text.strip():
-                    continue
-                
-                # 词汇复杂性
-                words = text.split()
-                unique_words = set(word.lower() for word in words)
-                word_diversity = len(unique_words) / len(words) if words else 0
-                
-                # 句子复杂性
-                sentences = text.split('.')
-                avg_sentence_length = len(words) / len(sentences) if sentences else 0
-                
-                # 概念密度
-                concept_words = [word for word in words if len(word) > 5]
-                concept_density = len(concept_words) / len(words) if words else 0
-                
-                # 结构复杂性（基于标点符号）
-                punctuation_count = sum(1 for char in text if char in '.,;:!?()[]{}')
-                structural_complexity = punctuation_count / len(text) if text else 0
-                
-                item_complexity = (
-                    word_diversity * 0.3 +
-                    min(avg_sentence_length / 20, 1) * 0.3 +
-                    concept_density * 0.2 +
-                    structural_complexity * 0.2
-                )
-                
-                complexities.append(item_complexity)
-            
-            if not complexities:
-                return {"complexity_score": 0.0}
-            
-            return {
-                "avg_complexity": round(np.mean(complexities), 4),
-                "max_complexity": round(max(complexities), 4),
-                "min_complexity": round(min(complexities), 4),
-                "complexity_std": round(np.std(complexities), 4),
-                "complexity_score": round(np.mean(complexities) * 100, 2)
-            }
+            return self._summarize_complexity(complexities[~np.isnan(complexities)])
             
         except Exception as e:
             self.logger.error(f"计算复杂性指标失败: {e}")
             return {}
     
+    def _calculate_complexity_scores(self, knowledge_items: List[Dict[str, Any]]) -> np.ndarray:
+        """按列构建各知识项的文本特征并计算复杂性，空文本为 NaN"""
+        documents = [self._get_document(item) for item in knowledge_items]
+        n_items = len(documents)
+        
+        # 逐项只做常数次 C 级调用，按字符和按词的统计都不经过 Python 循环
+        word_counts = np.fromiter((len(d.tokens) for d in documents), dtype=np.int64, count=n_items)
+        unique_counts = np.fromiter((len(set(d.lower_tokens)) for d in documents),
+                                    dtype=np.int64, count=n_items)
+        text_lengths = np.fromiter((len(d.text) for d in documents), dtype=np.int64, count=n_items)
+        punctuation_counts = np.fromiter(
+            (len(_PUNCTUATION_PATTERN.findall(d.text)) for d in documents),
+            dtype=np.int64, count=n_items
+        )
+        sentence_counts = np.fromiter((d.text.count('.') + 1 for d in documents),
+                                      dtype=np.int64, count=n_items)
+        non_empty = np.fromiter((bool(d.text.strip()) for d in documents), dtype=bool, count=n_items)
+        
+        # 长词（概念词）数量：所有词长度拼成一列后按知识项分段求和
+        token_lengths = np.fromiter(
+            map(len, chain.from_iterable(d.tokens for d in documents)),
+            dtype=np.int64, count=int(word_counts.sum())
+        )
+        long_word_totals = np.concatenate(([0], np.cumsum(token_lengths > 5)))
+        token_offsets = np.concatenate(([0], np.cumsum(word_counts)))
+        long_word_counts = long_word_totals[token_offsets[1:]] - long_word_totals[token_offsets[:-1]]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            has_words = word_counts > 0
+            # 词汇复杂性
+            word_diversity = np.where(has_words, unique_counts / word_counts, 0)
+            # 句子复杂性
+            avg_sentence_length = word_counts / sentence_counts
+            # 概念密度
+            concept_density = np.where(has_words, long_word_counts / word_counts, 0)
+            # 结构复杂性（基于标点符号）
+            structural_complexity = np.where(text_lengths > 0, punctuation_counts / text_lengths, 0)
+        
+        complexities = (
+            word_diversity * 0.3 +
+            np.minimum(avg_sentence_length / 20, 1) * 0.3 +
+            concept_density * 0.2 +
+            structural_complexity * 0.2
+        )
+        return np.where(non_empty, complexities, np.nan)
+    
+    def _calculate_item_complexity(self, knowledge_item: Dict[str, Any]) -> Optional[float]:
+        """计算单个知识项的复杂性，空文本返回 None"""
+        complexity = float(self._calculate_complexity_scores([knowledge_item])[0])
+        return None if math.isnan(complexity) else complexity
+    
+    def _summarize_complexity(self, complexities: Sequence[float]) -> Dict[str, float]:
+        """统计复杂性指标"""
+        complexities = np.asarray(complexities, dtype=float)
+        if not complexities.size:
+            return {"complexity_score": 0.0}
+        
+        return {
+            "avg_complexity": round(np.mean(complexities), 4),
+            "max_complexity": round(float(complexities.max()), 4),
+            "min_complexity": round(float(complexities.min()), 4),
+            "complexity_std": round(np.std(complexities), 4),
+            "complexity_score": round(np.mean(complexities) * 100, 2)
+        }
+    
     def calculate_emergence_metrics(self, knowledge_items: List[Dict[str, Any]], 
                                   temporal_order: bool = True) -> Dict[str, float]:
         """计算涌现性指标"""
@@ -212,6 +307,12 @@ class MetricsCalculator:
             else:
                 sorted_items = knowledge_items
             
+            if self.emergence_mode == 'streaming':
+                stream = self.create_emergence_stream(max(1, len(sorted_items) // 10))
+                stream.update_many(sorted_items)
+                stream.flush()
+                return stream.get_metrics()
+            
             # 计算知识增长模式
             knowledge_growth = []
             concept_evolution = []
@@ -224,9 +325,7 @@ class MetricsCalculator:
                 window_concepts = set()
                 
                 for item in window_items:
-                    text = item.get('content', '') + ' ' + item.get('title', '')
-                    concepts = set(word.lower() for word in text.split() if len(word) > 3)
-                    window_concepts.update(concepts)
+                    window_concepts.update(self._get_document(item).topic_set)
                 
                 knowledge_growth.append(len(window_concepts))
                 
@@ -280,6 +379,16 @@ class MetricsCalculator:
             self.logger.error(f"计算涌现性指标失败: {e}")
             return {}
     
+    def create_emergence_stream(self, window_size: int = 100, **kwargs) -> StreamingEmergenceCalculator:
+        """创建在线涌现性指标计算器，知识项需按时间顺序输入，概念提取复用文档缓存"""
+        kwargs.setdefault('num_perm', self.emergence_num_perm)
+        kwargs.setdefault('max_sketches', self.emergence_max_sketches)
+        return StreamingEmergenceCalculator(
+            window_size=window_size,
+            concept_extractor=lambda item: self._get_document(item).topic_set,
+            **kwargs
+        )
+    
     def calculate_coherence_metrics(self, knowledge_items: List[Dict[str, Any]]) -> Dict[str, float]:
         """计算知识连贯性指标"""
         try:
@@ -289,7 +398,7 @@ class MetricsCalculator:
             # 提取所有文本
             texts = []
             for item in knowledge_items:
-                text = item.get('content', '') + ' ' + item.get('title', '')
+                text = self._get_document(item).text
                 if text.strip():
                     texts.append(text)
             
@@ -300,26 +409,38 @@ class MetricsCalculator:
             vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
             tfidf_matrix = vectorizer.fit_transform(texts)
             
-            # 计算余弦相似性矩阵
-            similarity_matrix = cosine_similarity(tfidf_matrix)
-            
-            # 计算平均相似性（排除对角线）
             n = len(texts)
-            similarities = []
-            for i in range(n):
-                for j in range(i + 1, n):
-                    similarities.append(similarity_matrix[i][j])
-            
-            avg_similarity = np.mean(similarities) if similarities else 0
-            
-            # 计算连贯性变化趋势
-            coherence_trend = []
-            window_size = max(2, len(similarities) // 5)
-            
-            for i in range(0, len(similarities), window_size):
-                window = similarities[i:i + window_size]
-                if window:
-                    coherence_trend.append(np.mean(window))
+            use_sparse = (
+                self.coherence_mode == 'sparse' or
+                (self.coherence_mode == 'auto' and n > self.sparse_coherence_threshold)
+            )
+            
+            if use_sparse:
+                avg_similarity, coherence_trend, max_similarity, min_similarity = \
+                    self._calculate_sparse_coherence(tfidf_matrix)
+            else:
+                # 计算余弦相似性矩阵
+                similarity_matrix = cosine_similarity(tfidf_matrix)
+                
+                # 计算平均相似性（排除对角线）
+                similarities = []
+                for i in range(n):
+                    for j in range(i + 1, n):
+                        similarities.append(similarity_matrix[i][j])
+                
+                avg_similarity = np.mean(similarities) if similarities else 0
+                
+                # 计算连贯性变化趋势
+                coherence_trend = []
+                window_size = max(2, len(similarities) // 5)
+                
+                for i in range(0, len(similarities), window_size):
+                    window = similarities[i:i + window_size]
+                    if window:
+                        coherence_trend.append(np.mean(window))
+                
+                max_similarity = max(similarities) if similarities else 0
+                min_similarity = min(similarities) if similarities else 0
             
             # 计算连贯性稳定性
             coherence_std = np.std(coherence_trend) if coherence_trend else 0
@@ -328,8 +449,8 @@ class MetricsCalculator:
                 "avg_similarity": round(avg_similarity, 4),
                 "coherence_trend": coherence_trend,
                 "coherence_stability": round(1 / (1 + coherence_std), 4),  # 转换为稳定性分数
-                "max_similarity": round(max(similarities), 4) if similarities else 0,
-                "min_similarity": round(min(similarities), 4) if similarities else 0,
+                "max_similarity": round(max_similarity, 4),
+                "min_similarity": round(min_similarity, 4),
                 "coherence_score": round(avg_similarity * 100, 2)
             }
             
@@ -337,59 +458,136 @@ class MetricsCalculator:
             self.logger.error(f"计算连贯性指标失败: {e}")
             return {}
     
+    def _calculate_sparse_coherence(self, tfidf_matrix) -> Tuple[float, List[float], float, float]:
+        """基于稀疏矩阵计算两两相似性统计，不构造 n×n 稠密矩阵
+        
+        TF-IDF 行向量已做 L2 归一化，因此点积即余弦相似性。行 i 与其后所有行的
+        相似性之和等于 x_i 与后缀行向量和的点积，借助行向量前缀和可以按原有的
+        (i, j>i) 展开顺序精确计算各窗口均值；最大/最小值则分块提取。
+        """
+        matrix = tfidf_matrix.tocsr().astype(np.float64)
+        n = matrix.shape[0]
+        total_pairs = n * (n - 1) // 2
+        
+        # 行向量前缀和：prefix[k] = x_0 + ... + x_{k-1}
+        prefix = np.zeros((n + 1, matrix.shape[1]))
+        np.cumsum(matrix.toarray(), axis=0, out=prefix[1:])
+        
+        # 每行与其后所有行的相似性之和
+        row_sums = np.asarray(
+            matrix.multiply(prefix[n] - prefix[1:]).sum(axis=1)
+        ).ravel()
+        row_cumsum = np.concatenate(([0.0], np.cumsum(row_sums)))
+        row_offsets = np.arange(n) * n - np.arange(n) * (np.arange(n) + 1) // 2
+        
+        def pair_prefix_sum(position: int) -> float:
+            """前 position 个 (i, j>i) 相似性之和"""
+            if position >= total_pairs:
+                return float(row_cumsum[n])
+            row = int(np.searchsorted(row_offsets, position, side='right') - 1)
+            k = position - int(row_offsets[row])
+            partial = matrix[row].dot(prefix[row + 1 + k] - prefix[row + 1])
+            return float(row_cumsum[row] + partial[0])
+        
+        avg_similarity = row_cumsum[n] / total_pairs if total_pairs else 0.0
+        
+        # 与稠密模式相同的窗口划分
+        coherence_trend = []
+        window_size = max(2, total_pairs // 5)
+        window_start_sum = 0.0
+        for start in range(0, total_pairs, window_size):
+            end = min(start + window_size, total_pairs)
+            window_end_sum = pair_prefix_sum(end)
+            coherence_trend.append((window_end_sum - window_start_sum) / (end - start))
+            window_start_sum = window_end_sum
+        
+        # 分块提取最大/最小相似性，内存占用为 block_size × n
+        max_similarity = -np.inf
+        min_similarity = np.inf
+        block_size = max(1, int(self.coherence_block_size))
+        columns = np.arange(n)
+        
+        for start in range(0, n - 1, block_size):
+            end = min(start + block_size, n)
+            block = (matrix[start:end] @ matrix.T).toarray()
+            upper = columns[None, :] > np.arange(start, end)[:, None]
+            
+            values = block[upper]
+            if values.size:
+                max_similarity = max(max_similarity, float(values.max()))
+                min_similarity = min(min_similarity, float(values.min()))
+        
+        if not np.isfinite(max_similarity):
+            max_similarity = min_similarity = 0.0
+        
+        return float(avg_similarity), coherence_trend, max_similarity, min_similarity
+    
     def calculate_impact_metrics(self, knowledge_items: List[Dict[str, Any]]) -> Dict[str, float]:
         """计算知识影响力指标"""
         try:
             if not knowledge_items:
                 return {"impact_score": 0.0}
             
-            impact_scores = []
+            impact_scores = self._calculate_impact_scores(knowledge_items)
             
-            for item in knowledge_items:
-                # 基础影响力指标
-                text = item.get('content', '') + ' ' + item.get('title', '')
-                word_count = len(text.split())
-                
-                # 引用次数（如果有）
-                citations = item.get('citations', 0)
-                
-                # 重要性标记
-                importance = item.get('importance', 0)
-                
-                # 时间因子（新知识通常更有影响力）
-                collection_time = item.get('_collection_time', '')
-                if collection_time:
-                    try:
-                        time_obj = datetime.fromisoformat(collection_time.replace('Z', '+00:00'))
-                        days_old = (datetime.now() - time_obj.replace(tzinfo=None)).days
-                        time_factor = max(0, 1 - days_old / 365)  # 一年内的知识
-                    except:
-                        time_factor = 0.5
-                else:
-                    time_factor = 0.5
-                
-                # 综合影响力计算
-                base_score = min(word_count / 1000, 1) * 0.3  # 文本长度因子
-                citation_score = min(citations / 100, 1) * 0.3  # 引用因子
-                importance_score = min(importance / 10, 1) * 0.3  # 重要性因子
-                time_score = time_factor * 0.1  # 时间因子
-                
-                item_impact = base_score + citation_score + importance_score + time_score
-                impact_scores.append(item_impact)
-            
-            return {
-                "avg_impact": round(np.mean(impact_scores), 4),
-                "max_impact": round(max(impact_scores), 4),
-                "min_impact": round(min(impact_scores), 4),
-                "impact_std": round(np.std(impact_scores), 4),
-                "high_impact_count": len([score for score in impact_scores if score > 0.7]),
-                "impact_score": round(np.mean(impact_scores) * 100, 2)
-            }
+            return self._summarize_impact(impact_scores)
             
         except Exception as e:
             self.logger.error(f"计算影响力指标失败: {e}")
             return {}
     
+    def _calculate_impact_scores(self, knowledge_items: List[Dict[str, Any]]) -> np.ndarray:
+        """按列构建各知识项的长度、引用、重要性和时间特征并计算影响力"""
+        return self._calculate_static_impact_scores(knowledge_items) + \
+            self._calculate_impact_time_scores(knowledge_items)
+    
+    def _calculate_static_impact_scores(self, knowledge_items: List[Dict[str, Any]]) -> np.ndarray:
+        """影响力中与当前时间无关的部分：文本长度、引用和重要性"""
+        documents = [self._get_document(item) for item in knowledge_items]
+        n_items = len(documents)
+        
+        # 基础影响力指标
+        word_counts = np.fromiter((len(d.tokens) for d in documents), dtype=np.int64, count=n_items)
+        # 引用次数（如果有）和重要性标记；float() 对非数值保持原有的报错行为
+        citations = np.fromiter((float(item.get('citations', 0)) for item in knowledge_items),
+                                dtype=float, count=n_items)
+        importance = np.fromiter((float(item.get('importance', 0)) for item in knowledge_items),
+                                 dtype=float, count=n_items)
+        
+        base_score = np.minimum(word_counts / 1000, 1) * 0.3  # 文本长度因子
+        citation_score = np.minimum(citations / 100, 1) * 0.3  # 引用因子
+        importance_score = np.minimum(importance / 10, 1) * 0.3  # 重要性因子
+        
+        return base_score + citation_score + importance_score
+    
+    def _calculate_impact_time_scores(self, knowledge_items: List[Dict[str, Any]]) -> np.ndarray:
+        """影响力的时间因子部分（新知识通常更有影响力），无采集时间的知识项取 0.5，随当前时间变化"""
+        time_index = TimeIndex.from_items(knowledge_items)
+        days_old = time_index.age_days(datetime.now())
+        time_factor = np.full(len(knowledge_items), 0.5)
+        time_factor[time_index.positions] = np.maximum(0, 1 - days_old / 365)  # 一年内的知识
+        
+        return time_factor * 0.1
+    
+    def _calculate_item_impact(self, knowledge_item: Dict[str, Any]) -> float:
+        """计算单个知识项的影响力"""
+        return float(self._calculate_impact_scores([knowledge_item])[0])
+    
+    def _summarize_impact(self, impact_scores: Sequence[float]) -> Dict[str, float]:
+        """统计影响力指标"""
+        impact_scores = np.asarray(impact_scores, dtype=float)
+        if not impact_scores.size:
+            return {"impact_score": 0.0}
+        
+        return {
+            "avg_impact": round(np.mean(impact_scores), 4),
+            "max_impact": round(float(impact_scores.max()), 4),
+            "min_impact": round(float(impact_scores.min()), 4),
+            "impact_std": round(np.std(impact_scores), 4),
+            "high_impact_count": int(np.count_nonzero(impact_scores > 0.7)),
+            "impact_score": round(np.mean(impact_scores) * 100, 2)
+        }
+    
     def calculate_all_metrics(self, knowledge_items: List[Dict[str, Any]], 
                             temporal_order: bool = True) -> Dict[str, Any]:
         """计算所有指标"""
@@ -416,20 +614,100 @@ class MetricsCalculator:
         results['impact'] = self.calculate_impact_metrics(knowledge_items)
         
         # 综合评分
+        results['overall'] = self._summarize_overall(results, len(knowledge_items))
+        
+        self.logger.info("指标计算完成")
+        return results
+    
+    def calculate_incremental_metrics(self, knowledge_items: List[Dict[str, Any]], state_store,
+                                      temporal_order: bool = True) -> Dict[str, Any]:
+        """增量计算所有指标
+        
+        多样性、复杂性和影响力只对状态库中没有的知识项重新计算，再与已保存的累加器合并；
+        影响力只保存与时间无关的部分，时间因子每次运行按当前时间重新计算；
+        连接性、涌现性和连贯性依赖整个语料，仍然全量计算。
+        """
+        self.logger.info("开始增量计算知识涌现指标...")
+        
+        results = {}
+        
+        try:
+            keys = [item_key(item) for item in knowledge_items]
+            occurrences = Counter(keys)
+            pending = {}
+            for key, item in zip(keys, knowledge_items):
+                pending.setdefault(key, item)
+            
+            known = state_store.load_metric_occurrences()
+            new_pending = {key: item for key, item in pending.items() if key not in known}
+            new_list = list(new_pending.values())
+            
+            complexities = [None if math.isnan(value) else value
+                            for value in self._calculate_complexity_scores(new_list).tolist()]
+            try:
+                impacts = self._calculate_static_impact_scores(new_list).tolist()
+            except Exception:
+                # 批量计算失败时逐项计算，只跳过字段无效的知识项
+                impacts = []
+                for item in new_list:
+                    try:
+                        impacts.append(float(self._calculate_static_impact_scores([item])[0]))
+                    except Exception as e:
+                        self.logger.warning(f"计算知识项影响力失败: {e}")
+                        impacts.append(None)
+            
+            new_items = {
+                key: (complexity, impact, Counter(self._get_document(item).topic_words))
+                for (key, item), complexity, impact in zip(new_pending.items(), complexities, impacts)
+            }
+            
+            self.logger.info(f"增量指标计算：新增 {len(new_items)} 项，复用 {len(pending) - len(new_items)} 项")
+            
+            topic_totals = state_store.sync_item_metrics(new_items, occurrences)
+            
+            # 按语料顺序展开已保存的值，影响力加上按当前时间计算的时间因子
+            stored = state_store.load_item_metrics(pending)
+            time_scores = self._calculate_impact_time_scores(knowledge_items).tolist()
+            complexities = [stored[key][0] for key in keys if stored[key][0] is not None]
+            impacts = [stored[key][1] + time_score
+                       for key, time_score in zip(keys, time_scores) if stored[key][1] is not None]
+            
+            results['diversity'] = self._summarize_diversity(topic_totals) if knowledge_items else {}
+            results['complexity'] = self._summarize_complexity(complexities) if knowledge_items else {}
+            results['impact'] = self._summarize_impact(impacts) if knowledge_items else {"impact_score": 0.0}
+            
+        except Exception as e:
+            self.logger.error(f"增量指标计算失败: {e}")
+            results['diversity'] = self.calculate_diversity_metrics(knowledge_items)
+            results['complexity'] = self.calculate_complexity_metrics(knowledge_items)
+            results['impact'] = self.calculate_impact_metrics(knowledge_items)
+        
+        # 依赖整个语料的指标
+        results['connectivity'] = self.calculate_connectivity_metrics(knowledge_items)
+        results['emergence'] = self.calculate_emergence_metrics(knowledge_items, temporal_order)
+        results['coherence'] = self.calculate_coherence_metrics(knowledge_items)
+        
+        # 保持与全量计算相同的指标顺序
+        results = {category: results[category] for category in
+                   ['diversity', 'connectivity', 'complexity', 'emergence', 'coherence', 'impact']}
+        results['overall'] = self._summarize_overall(results, len(knowledge_items))
+        
+        self.logger.info("增量指标计算完成")
+        return results
+    
+    def _summarize_overall(self, results: Dict[str, Any], data_points: int) -> Dict[str, Any]:
+        """计算综合评分"""
         scores = []
         for category in results.values():
             if 'score' in category:
                 scores.append(category['score'])
         
-        results['overall'] = {
+        return {
             'total_score': round(np.mean(scores), 2) if scores else 0,
             'score_breakdown': {k: v.get('score', 0) for k, v in results.items() if isinstance(v, dict)},
             'calculation_time': datetime.now().isoformat(),
-            'data_points': len(knowledge_items)
+            'data_points': data_points
         }
-        
-        self.logger.info("指标计算完成")
-        return results
     
     def compare_periods(self, period1_data: List[Dict[str, Any]], 
                        period2_data: List[Dict[str, Any]]) -> Dict[str, float]:
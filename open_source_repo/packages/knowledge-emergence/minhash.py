@@ -0,0 +1,81 @@
+"""
+MinHash 草图
+用固定长度的签名近似集合的 Jaccard 相似度和基数，签名可按元素取最小值合并
+"""
+
+import hashlib
+import numpy as np
+from typing import Iterable, Optional
+
+
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SHIFT = np.uint64(32)
+
+
+def hash_token(token: str) -> int:
+    """稳定的 32 位词哈希（不受 Python 哈希随机化影响，跨进程一致）"""
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+class MinHasher:
+    """MinHash 签名生成器
+
+    相同 num_perm 和 seed 生成的签名可以互相比较和合并
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        self.num_perm = num_perm
+        self.seed = seed
+
+        # multiply-add-shift 哈希族 ((a * x + b) mod 2^64) >> 32，a 为奇数，对 32 位词哈希是 2-universal 的，
+        # 避免了对素数取模的开销
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(0, 1 << 64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.randint(0, 1 << 64, size=num_perm, dtype=np.uint64)
+
+    def empty(self) -> np.ndarray:
+        """空集合的签名"""
+        return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        """计算集合的签名，空集合返回全为最大值的签名"""
+        hashes = np.fromiter({hash_token(token) for token in tokens}, dtype=np.uint64)
+        return self.signature_from_hashes(hashes)
+
+    def signature_from_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        """由已计算的 32 位词哈希计算签名"""
+        if not len(hashes):
+            return self.empty()
+
+        # uint64 乘法和加法按 2^64 回绕，取高 32 位；原地运算避免分配临时矩阵
+        permuted = np.multiply.outer(np.asarray(hashes, dtype=np.uint64), self._a)
+        permuted += self._b
+        permuted >>= _SHIFT
+        return permuted.min(axis=0)
+
+    @staticmethod
+    def merge(*signatures: np.ndarray) -> np.ndarray:
+        """合并签名，结果为各集合并集的签名"""
+        return np.minimum.reduce(signatures)
+
+    @staticmethod
+    def jaccard(signature1: np.ndarray, signature2: np.ndarray) -> float:
+        """估计两个集合的 Jaccard 相似度"""
+        return float(np.mean(signature1 == signature2))
+
+    @staticmethod
+    def jaccard_many(signatures: np.ndarray, signature: np.ndarray) -> np.ndarray:
+        """估计签名矩阵中每一行与给定签名的 Jaccard 相似度"""
+        return np.mean(signatures == signature, axis=1)
+
+    @staticmethod
+    def cardinality(signature: np.ndarray) -> float:
+        """估计签名对应集合的基数"""
+        if np.all(signature == _MAX_HASH):
+            return 0.0
+        return float(len(signature) / np.sum(signature / float(_MAX_HASH)) - 1.0)
+
+    @staticmethod
+    def is_empty(signature: Optional[np.ndarray]) -> bool:
+        """签名是否对应空集合"""
+        return signature is None or bool(np.all(signature == _MAX_HASH))
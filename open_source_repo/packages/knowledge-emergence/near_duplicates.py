@@ -0,0 +1,174 @@
+"""
+近似重复检测
+用字符 n-gram 的 MinHash 签名和 LSH 分桶在近线性时间内找出内容几乎相同的知识项
+"""
+
+import re
+import time
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from minhash import MinHasher
+
+
+# 参与去重比较的文本字段
+TEXT_FIELDS = ('title', 'text', 'content', 'description')
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# 滚动哈希的基数
+_SHINGLE_BASE = np.uint64(1000003)
+
+# numpy 2.0 起 trapz 更名为 trapezoid
+_trapezoid = getattr(np, 'trapezoid', None) or np.trapz
+
+
+def _false_positive_probability(threshold: float, bands: int, rows: int) -> float:
+    """相似度低于阈值的两项落入同一桶的概率（积分）"""
+    s = np.linspace(0.0, threshold, 101)
+    return float(_trapezoid(1 - (1 - s ** rows) ** bands, s))
+
+
+def _false_negative_probability(threshold: float, bands: int, rows: int) -> float:
+    """相似度高于阈值的两项没有落入同一桶的概率（积分）"""
+    s = np.linspace(threshold, 1.0, 101)
+    return float(_trapezoid((1 - s ** rows) ** bands, s))
+
+
+def optimal_lsh_params(threshold: float, num_perm: int,
+                       false_positive_weight: float = 0.2,
+                       false_negative_weight: float = 0.8) -> Tuple[int, int]:
+    """选择使误报和漏报概率加权和最小的分段数 bands 和每段行数 rows
+
+    候选项还会按签名相似度复核，误报只增加比较次数，因此默认更重视漏报
+    """
+    best = None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            error = false_positive_weight * _false_positive_probability(threshold, bands, rows) + \
+                false_negative_weight * _false_negative_probability(threshold, bands, rows)
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class NearDuplicateFilter:
+    """近似重复过滤器
+
+    按输入顺序逐项检查：与已保留项的估计 Jaccard 相似度不低于 threshold 时视为重复并折叠到该项，
+    否则保留并加入 LSH 索引。每项只与同桶的候选比较，总耗时与数据量近似线性
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128, shingle_size: int = 5,
+                 seed: int = 1, text_fields: Tuple[str, ...] = TEXT_FIELDS):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"相似度阈值必须在 (0, 1] 之间: {threshold}")
+
+        self.threshold = threshold
+        self.shingle_size = max(1, int(shingle_size))
+        self.text_fields = text_fields
+        self.hasher = MinHasher(num_perm=num_perm, seed=seed)
+        self.bands, self.rows = optimal_lsh_params(threshold, num_perm)
+        self.logger = logging.getLogger(__name__)
+
+        self.reset()
+
+    def reset(self):
+        """清空索引和统计"""
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        self._signatures: List[np.ndarray] = []
+        self._duplicate_counts: List[int] = []
+
+        self.checked = 0
+        self.collapsed = 0
+        self.candidate_comparisons = 0
+        self.filter_time = 0.0
+
+    def _item_text(self, item: Dict[str, Any]) -> str:
+        """拼接文本字段并规范化大小写和空白"""
+        parts = [str(item[field]) for field in self.text_fields if item.get(field)]
+        return _WHITESPACE_PATTERN.sub(' ', ' '.join(parts)).strip().lower()
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        """字符 n-gram 的 32 位滚动哈希（中英文统一按字符切分），重复的 n-gram 不影响签名，无需去重"""
+        codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        k = min(self.shingle_size, len(codes))
+
+        hashes = np.zeros(len(codes) - k + 1, dtype=np.uint64)
+        for offset in range(k):
+            hashes = hashes * _SHINGLE_BASE + codes[offset:offset + len(hashes)]
+        return hashes & np.uint64(0xFFFFFFFF)
+
+    def signature(self, item: Dict[str, Any]) -> Optional[np.ndarray]:
+        """计算知识项的签名，没有文本时返回 None"""
+        text = self._item_text(item)
+        if not text:
+            return None
+        return self.hasher.signature_from_hashes(self._shingle_hashes(text))
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def find_duplicate(self, signature: np.ndarray, band_keys: List[bytes] = None) -> Optional[int]:
+        """在已保留项中查找与签名近似重复的项，返回其序号"""
+        band_keys = band_keys or self._band_keys(signature)
+
+        candidates = set()
+        for buckets, key in zip(self._buckets, band_keys):
+            candidates.update(buckets.get(key, ()))
+        if not candidates:
+            return None
+
+        candidates = sorted(candidates)
+        self.candidate_comparisons += len(candidates)
+        similarities = self.hasher.jaccard_many(np.vstack([self._signatures[i] for i in candidates]), signature)
+        best = int(np.argmax(similarities))
+        return candidates[best] if similarities[best] >= self.threshold else None
+
+    def add(self, item: Dict[str, Any]) -> bool:
+        """检查并登记一个知识项，返回 True 表示保留，False 表示与已保留项近似重复"""
+        self.checked += 1
+        signature = self.signature(item)
+        if signature is None:
+            return True
+
+        band_keys = self._band_keys(signature)
+        duplicate_of = self.find_duplicate(signature, band_keys)
+        if duplicate_of is not None:
+            self._duplicate_counts[duplicate_of] += 1
+            self.collapsed += 1
+            return False
+
+        index = len(self._signatures)
+        self._signatures.append(signature)
+        self._duplicate_counts.append(0)
+        for buckets, key in zip(self._buckets, band_keys):
+            buckets.setdefault(key, []).append(index)
+        return True
+
+    def filter(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """过滤近似重复项，保留每组中最先出现的一项"""
+        start_time = time.perf_counter()
+        kept = [item for item in items if self.add(item)]
+        self.filter_time += time.perf_counter() - start_time
+        return kept
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取去重统计"""
+        return {
+            'threshold': self.threshold,
+            'num_perm': self.hasher.num_perm,
+            'bands': self.bands,
+            'rows': self.rows,
+            'checked': self.checked,
+            'kept': self.checked - self.collapsed,
+            'collapsed': self.collapsed,
+            'duplicate_groups': sum(1 for count in self._duplicate_counts if count),
+            'candidate_comparisons': self.candidate_comparisons,
+            'filter_time': round(self.filter_time, 4)
+        }
@@ -0,0 +1,71 @@
+"""
+多进程批处理工具
+将知识项分块分发到进程池中处理，并按输入顺序合并结果
+"""
+
+import os
+from typing import Dict, List, Any, Callable, Optional, Sequence
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, Future
+
+
+# 工作进程内的处理器实例，由进程池初始化函数创建
+_worker_instance = None
+
+
+def chunk_items(items: Sequence[Any], chunk_size: int) -> List[List[Any]]:
+    """按固定大小切分列表"""
+    chunk_size = max(1, int(chunk_size))
+    return [list(items[i:i + chunk_size]) for i in range(0, len(items), chunk_size)]
+
+
+def resolve_workers(max_workers: Optional[int] = None) -> int:
+    """确定工作进程数，未指定时使用全部CPU核心"""
+    return max(1, max_workers or os.cpu_count() or 1)
+
+
+def _init_worker(factory: Callable[[Dict[str, Any]], Any], config: Dict[str, Any]):
+    """在工作进程中创建处理器实例"""
+    global _worker_instance
+    _worker_instance = factory(config)
+
+
+def _run_worker_batch(method_name: str, items: List[Any], *args) -> List[Any]:
+    """在工作进程中处理一个分块"""
+    return getattr(_worker_instance, method_name)(items, *args)
+
+
+def _call_method(factory: Callable[[Dict[str, Any]], Any], config: Dict[str, Any],
+                 method_name: str, args: tuple) -> Any:
+    """在工作进程中创建处理器实例并调用其方法"""
+    return getattr(factory(config), method_name)(*args)
+
+
+def submit_method_call(executor: ProcessPoolExecutor, factory: Callable[[Dict[str, Any]], Any],
+                       config: Dict[str, Any], method_name: str, *args) -> Future:
+    """在进程池中提交一次 factory(config).method_name(*args) 调用"""
+    return executor.submit(_call_method, factory, config, method_name, args)
+
+
+def map_batches_in_processes(factory: Callable[[Dict[str, Any]], Any], config: Dict[str, Any],
+                             method_name: str, items: Sequence[Any], args: tuple = (),
+                             max_workers: Optional[int] = None, chunk_size: int = 100) -> List[Any]:
+    """在进程池中分块调用 factory(config).method_name(chunk, *args)，按输入顺序返回合并结果
+
+    每个工作进程只创建一次处理器实例，分块结果按提交顺序拼接
+    """
+    chunks = chunk_items(items, chunk_size)
+    if not chunks:
+        return []
+
+    workers = min(resolve_workers(max_workers), len(chunks))
+    results = []
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(factory, config)) as executor:
+        arg_iters = [repeat(arg, len(chunks)) for arg in args]
+        for chunk_results in executor.map(_run_worker_batch, repeat(method_name, len(chunks)),
+                                          chunks, *arg_iters):
+            results.extend(chunk_results)
+
+    return results
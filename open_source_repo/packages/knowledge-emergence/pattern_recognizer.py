@@ -14,10 +14,15 @@ import json
 from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
 from sklearn.preprocessing import StandardScaler
-from scipy import stats
+from scipy import stats, sparse
 from scipy.signal import find_peaks
 import re
 
+from concept_graph import ConceptGraph
+from document_cache import AnalyzedDocument, DocumentCache, get_document
+from keyword_matcher import KeywordMatcher
+from time_index import TimeIndex
+
 
 @dataclass
 class Pattern:
@@ -47,6 +52,15 @@ class PatternRecognizer:
             'random_state': 42
         })
         
+        # 概念关联：最少共现知识项数，评分方式 'count'、'lift' 或 'pmi'，
+        # 以及 lift / 归一化 PMI 的下限（未指定时分别为 1.0 和 0.0，即只保留正相关）
+        self.association_min_count = config.get('association_min_count', 3)
+        self.association_scoring = config.get('association_scoring', 'count')
+        self.association_min_score = config.get('association_min_score')
+        
+        # 概念网络聚类系数每块展开的候选连接数上限
+        self.network_chunk_size = config.get('network_chunk_size', 4_000_000)
+        
         # 知识领域关键词
         self.domain_keywords = {
             'science': ['研究', '实验', '理论', '发现', '分析', '数据'],
@@ -55,6 +69,19 @@ class PatternRecognizer:
             'social': ['社会', '文化', '教育', '政策', '影响', '趋势'],
             'health': ['健康', '医疗', '疾病', '治疗', '预防', '研究']
         }
+        
+        # 领域关键词和协同效应指示词，编译为一个匹配器，每个文本只扫描一次
+        self.keyword_matcher = KeywordMatcher({
+            **{f'domain_{domain}': keywords for domain, keywords in self.domain_keywords.items()},
+            'synergy': ['结合', '整合', '协同', '合作', '配合']
+        })
+        
+        # 由分析器注入的共享文档缓存
+        self.document_cache: Optional[DocumentCache] = None
+    
+    def _get_document(self, knowledge_item: Dict[str, Any]) -> AnalyzedDocument:
+        """获取知识项的分词结果"""
+        return get_document(self.document_cache, knowledge_item)
     
     def identify_temporal_patterns(self, knowledge_items: List[Dict[str, Any]]) -> List[Pattern]:
         """识别时间模式"""
@@ -70,16 +97,19 @@ class PatternRecognizer:
             
             patterns = []
             
+            # 周期、趋势和爆发检测共享同一采集时间索引
+            time_index = TimeIndex.from_items(sorted_items)
+            
             # 1. 识别周期性模式
-            periodic_patterns = self._detect_periodic_patterns(sorted_items)
+            periodic_patterns = self._detect_periodic_patterns(sorted_items, time_index)
             patterns.extend(periodic_patterns)
             
             # 2. 识别趋势模式
-            trend_patterns = self._detect_trend_patterns(sorted_items)
+            trend_patterns = self._detect_trend_patterns(sorted_items, time_index)
             patterns.extend(trend_patterns)
             
             # 3. 识别爆发模式
-            burst_patterns = self._detect_burst_patterns(sorted_items)
+            burst_patterns = self._detect_burst_patterns(sorted_items, time_index)
             patterns.extend(burst_patterns)
             
             # 4. 识别收敛模式
@@ -179,6 +209,13 @@ class PatternRecognizer:
             self.logger.error(f"识别涌现模式失败: {e}")
             return []
     
+    def identify_all_patterns(self, knowledge_items: List[Dict[str, Any]]) -> List[Pattern]:
+        """依次识别时间、内容、结构和涌现模式"""
+        return (self.identify_temporal_patterns(knowledge_items)
+                + self.identify_content_patterns(knowledge_items)
+                + self.identify_structural_patterns(knowledge_items)
+                + self.identify_emergence_patterns(knowledge_items))
+    
     def analyze_pattern_evolution(self, patterns: List[Pattern]) -> Dict[str, Any]:
         """分析模式演化"""
         try:
@@ -220,36 +257,24 @@ class PatternRecognizer:
     
     # 私有方法：时间模式检测
     
-    def _detect_periodic_patterns(self, sorted_items: List[Dict[str, Any]]) -> List[Pattern]:
+    def _detect_periodic_patterns(self, sorted_items: List[Dict[str, Any]],
+                                      time_index: TimeIndex = None) -> List[Pattern]:
         """检测周期性模式"""
         patterns = []
         
-        # 提取时间序列
-        timestamps = []
-        for item in sorted_items:
-            time_str = item.get('_collection_time', '')
-            if time_str:
-                try:
-                    ts = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-                    timestamps.append(ts)
-                except:
-                    continue
-        
-        if len(timestamps) < 4:
+        if time_index is None:
+            time_index = TimeIndex.from_items(sorted_items)
+        if len(time_index) < 4:
             return patterns
         
         # 计算时间间隔
-        intervals = []
-        for i in range(1, len(timestamps)):
-            interval = (timestamps[i] - timestamps[i-1]).days
-            intervals.append(interval)
+        intervals = time_index.intervals_days()
         
-        if not intervals:
-            return patterns
-        
-        # 检测周期性
-        interval_counts = Counter(intervals)
-        most_common_interval = interval_counts.most_common(1)[0]
+        # 检测周期性：出现次数相同时取最先出现的间隔
+        values, first_seen, counts = np.unique(intervals, return_index=True, return_counts=True)
+        candidates = np.flatnonzero(counts == counts.max())
+        best = candidates[np.argmin(first_seen[candidates])]
+        most_common_interval = (int(values[best]), int(counts[best]))
         
         if most_common_interval[1] >= len(intervals) * 0.3:  # 至少30%的间隔相同
             pattern = Pattern(
@@ -263,38 +288,15 @@ class PatternRecognizer:
         
         return patterns
     
-    def _detect_trend_patterns(self, sorted_items: List[Dict[str, Any]]) -> List[Pattern]:
+    def _detect_trend_patterns(self, sorted_items: List[Dict[str, Any]],
+                                   time_index: TimeIndex = None) -> List[Pattern]:
         """检测趋势模式"""
         patterns = []
         
-        # 计算每个时间点的知识量
-        time_points = []
-        knowledge_counts = []
-        
-        current_date = None
-        count = 0
-        
-        for item in sorted_items:
-            time_str = item.get('_collection_time', '')
-            if time_str:
-                try:
-                    date = datetime.fromisoformat(time_str.replace('Z', '+00:00')).date()
-                    
-                    if current_date != date:
-                        if current_date is not None:
-                            time_points.append(current_date)
-                            knowledge_counts.append(count)
-                        current_date = date
-                        count = 1
-                    else:
-                        count += 1
-                        
-                except:
-                    continue
-        
-        if current_date is not None:
-            time_points.append(current_date)
-            knowledge_counts.append(count)
+        # 计算每个时间点（连续的同一日期）的知识量
+        if time_index is None:
+            time_index = TimeIndex.from_items(sorted_items)
+        time_points, knowledge_counts = time_index.daily_runs()
         
         if len(time_points) < 3:
             return patterns
@@ -322,28 +324,20 @@ class PatternRecognizer:
         
         return patterns
     
-    def _detect_burst_patterns(self, sorted_items: List[Dict[str, Any]]) -> List[Pattern]:
+    def _detect_burst_patterns(self, sorted_items: List[Dict[str, Any]],
+                                   time_index: TimeIndex = None) -> List[Pattern]:
         """检测爆发模式"""
         patterns = []
         
         # 计算每日知识产生量
-        daily_counts = defaultdict(int)
-        
-        for item in sorted_items:
-            time_str = item.get('_collection_time', '')
-            if time_str:
-                try:
-                    date = datetime.fromisoformat(time_str.replace('Z', '+00:00')).date()
-                    daily_counts[date] += 1
-                except:
-                    continue
-        
-        if not daily_counts:
+        if time_index is None:
+            time_index = TimeIndex.from_items(sorted_items)
+        if not len(time_index):
             return patterns
         
         # 排序日期
-        sorted_dates = sorted(daily_counts.keys())
-        counts = [daily_counts[date] for date in sorted_dates]
+        sorted_dates = time_index.dates()
+        counts = time_index.day_counts
         
         # 检测峰值
         mean_count = np.mean(counts)
@@ -352,10 +346,10 @@ class PatternRecognizer:
         
         peaks, properties = find_peaks(counts, height=threshold)
         
-        for peak in peaks:
-            if properties['peak_heights'][list(peaks).index(peak)] >= threshold:
+        for peak, height in zip(peaks, properties['peak_heights']):
+            if height >= threshold:
                 burst_date = sorted_dates[peak]
-                burst_count = counts[peak]
+                burst_count = int(counts[peak])
                 
                 pattern = Pattern(
                     pattern_type="knowledge_burst",
@@ -378,10 +372,20 @@ class PatternRecognizer:
         
         window_size = max(3, len(sorted_items) // 10)
         
+        # 每个知识项只取一次概念，窗口滑动时增减概念计数，计数中的概念数即窗口内不同概念数
+        concept_sets = [self._get_document(item).concept_set for item in sorted_items]
+        concept_counts = Counter()
+        for concepts in concept_sets[:window_size - 1]:
+            concept_counts.update(concepts)
+        
         for i in range(len(sorted_items) - window_size + 1):
-            window_items = sorted_items[i:i + window_size]
-            diversity = self._calculate_window_diversity(window_items)
-            diversity_scores.append(diversity)
+            concept_counts.update(concept_sets[i + window_size - 1])
+            diversity_scores.append(min(len(concept_counts) / window_size, 1.0))
+            
+            for concept in concept_sets[i]:
+                concept_counts[concept] -= 1
+                if not concept_counts[concept]:
+                    del concept_counts[concept]
         
         if len(diversity_scores) < 3:
             return patterns
@@ -451,44 +455,91 @@ class PatternRecognizer:
         
         return patterns
     
+    def _build_concept_matrix(self, knowledge_items: List[Dict[str, Any]],
+                              min_count: int) -> Tuple[sparse.csr_matrix, List[str]]:
+        """构建知识项×概念的 0/1 稀疏矩阵，每个知识项内的概念去重
+        
+        出现在不足 min_count 个知识项中的概念不可能达到共现阈值，预先剔除；保留的列按概念字母序排列
+        """
+        vocabulary = {}
+        indices = []
+        indptr = [0]
+        for item in knowledge_items:
+            for concept in self._get_document(item).concept_set:
+                indices.append(vocabulary.setdefault(concept, len(vocabulary)))
+            indptr.append(len(indices))
+        
+        indices = np.asarray(indices, dtype=np.int64)
+        concepts = np.array(list(vocabulary), dtype=object)
+        
+        document_frequency = np.bincount(indices, minlength=len(concepts))
+        kept = np.flatnonzero(document_frequency >= min_count)
+        kept = kept[np.argsort(concepts[kept].astype(str), kind='stable')]
+        
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), indices, np.asarray(indptr, dtype=np.int64)),
+            shape=(len(knowledge_items), len(concepts))
+        )
+        return matrix[:, kept].tocsr(), concepts[kept].tolist()
+    
     def _detect_concept_associations(self, knowledge_items: List[Dict[str, Any]]) -> List[Pattern]:
-        """检测概念关联模式"""
+        """检测概念关联模式
+        
+        共现次数为同时包含两个概念的知识项数，由稀疏矩阵乘积 XᵀX 得到；
+        association_scoring 为 'lift' 或 'pmi' 时按提升度或归一化点互信息评分和筛选
+        """
         patterns = []
+        min_count = self.association_min_count
         
-        # 构建概念共现矩阵
-        concept_cooccurrence = defaultdict(lambda: defaultdict(int))
-        all_concepts = set()
+        matrix, concepts = self._build_concept_matrix(knowledge_items, min_count)
+        if len(concepts) < 2:
+            return patterns
         
-        for item in knowledge_items:
-            text = item.get('content', '') + ' ' + item.get('title', '')
-            concepts = self._extract_concepts_from_text(text)
+        # 概念共现矩阵的上三角（concept1 < concept2），筛选至少共现 min_count 次的概念对
+        cooccurrence = sparse.triu(matrix.T @ matrix, k=1).tocoo()
+        strong = cooccurrence.data >= min_count
+        rows, cols, counts = cooccurrence.row[strong], cooccurrence.col[strong], cooccurrence.data[strong]
+        order = np.lexsort((cols, rows))
+        rows, cols, counts = rows[order], cols[order], counts[order]
+        
+        scoring = self.association_scoring
+        if scoring in ('lift', 'pmi'):
+            n_items = matrix.shape[0]
+            document_frequency = np.asarray(matrix.sum(axis=0)).ravel()
+            lift = n_items * counts / (document_frequency[rows] * document_frequency[cols])
+            pmi = np.log2(lift)
+            # 归一化 PMI：除以 -log2 p(x, y)，取值 [-1, 1]，两个概念总是同时出现时为 1
+            joint_information = -np.log2(counts / n_items)
+            npmi = np.divide(pmi, joint_information, out=np.ones_like(pmi), where=joint_information > 0)
             
-            all_concepts.update(concepts)
-            
-            # 计算共现
-            for i, concept1 in enumerate(concepts):
-                for concept2 in concepts[i+1:]:
-                    concept_cooccurrence[concept1][concept2] += 1
-                    concept_cooccurrence[concept2][concept1] += 1
-        
-        # 识别强关联概念对
-        strong_associations = []
-        for concept1 in concept_cooccurrence:
-            for concept2 in concept_cooccurrence[concept1]:
-                if concept1 < concept2:  # 避免重复
-                    cooccurrence_count = concept_cooccurrence[concept1][concept2]
-                    if cooccurrence_count >= 3:  # 至少共现3次
-                        strong_associations.append((concept1, concept2, cooccurrence_count))
+            scores = lift if scoring == 'lift' else npmi
+            min_score = self.association_min_score
+            if min_score is None:
+                min_score = 1.0 if scoring == 'lift' else 0.0
+            keep = scores >= min_score
+            rows, cols, counts = rows[keep], cols[keep], counts[keep]
+            lift, pmi, npmi = lift[keep], pmi[keep], npmi[keep]
         
         # 创建关联模式
-        for concept1, concept2, count in strong_associations:
+        for i, (row, col, count) in enumerate(zip(rows, cols, counts)):
+            concept1, concept2, count = concepts[row], concepts[col], int(count)
+            metadata = {'concept1': concept1, 'concept2': concept2}
+            supporting_evidence = [f"共现次数: {count}"]
+            strength = count / 10
+            
+            if scoring in ('lift', 'pmi'):
+                metadata.update({'lift': round(float(lift[i]), 4), 'pmi': round(float(pmi[i]), 4),
+                                 'npmi': round(float(npmi[i]), 4)})
+                supporting_evidence.append(f"提升度: {lift[i]:.2f}, 归一化PMI: {npmi[i]:.3f}")
+                strength = float(lift[i]) if scoring == 'lift' else float(npmi[i])
+            
             pattern = Pattern(
                 pattern_type="concept_association",
                 description=f"概念'{concept1}'与'{concept2}'存在强关联",
                 confidence=min(count / 10, 1.0),
-                strength=count / 10,
-                supporting_evidence=[f"共现次数: {count}"],
-                metadata={'concept1': concept1, 'concept2': concept2}
+                strength=strength,
+                supporting_evidence=supporting_evidence,
+                metadata=metadata
             )
             patterns.append(pattern)
         
@@ -502,7 +553,7 @@ class PatternRecognizer:
         domain_distribution = defaultdict(int)
         
         for item in knowledge_items:
-            text = item.get('content', '') + ' ' + item.get('title', '')
+            text = self._get_document(item).text
             detected_domains = self._detect_domains(text)
             
             for domain in detected_domains:
@@ -802,49 +853,21 @@ class PatternRecognizer:
     
     # 辅助方法
     
-    def _calculate_window_diversity(self, window_items: List[Dict[str, Any]]) -> float:
-        """计算窗口内的多样性"""
-        if not window_items:
-            return 0.0
-        
-        all_concepts = set()
-        for item in window_items:
-            text = item.get('content', '') + ' ' + item.get('title', '')
-            concepts = self._extract_concepts_from_text(text)
-            all_concepts.update(concepts)
-        
-        # 简单的多样性计算
-        return min(len(all_concepts) / len(window_items), 1.0)
-    
     def _extract_topics_by_time(self, knowledge_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """按时间提取主题"""
         topics_over_time = []
         
-        # 按时间分组
-        time_groups = defaultdict(list)
-        for item in knowledge_items:
-            time_str = item.get('_collection_time', '')
-            if time_str:
-                try:
-                    date = datetime.fromisoformat(time_str.replace('Z', '+00:00')).date()
-                    time_groups[date].append(item)
-                except:
-                    continue
-        
-        # 提取每个时间点的主题
-        for date in sorted(time_groups.keys()):
-            items = time_groups[date]
+        # 按时间分组，提取每个时间点的主题
+        for date, positions in TimeIndex.from_items(knowledge_items).groups_by_day():
             topics = set()
             
-            for item in items:
-                text = item.get('content', '') + ' ' + item.get('title', '')
-                concepts = self._extract_concepts_from_text(text)
-                topics.update(concepts)
+            for position in positions:
+                topics.update(self._get_document(knowledge_items[position]).concept_set)
             
             topics_over_time.append({
                 'time': date.isoformat(),
                 'topics': list(topics),
-                'count': len(items)
+                'count': len(positions)
             })
         
         return topics_over_time
@@ -870,61 +893,37 @@ class PatternRecognizer:
         detected_domains = []
         text_lower = text.lower()
         
-        for domain, keywords in self.domain_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for domain in self.domain_keywords:
+            if self.keyword_matcher.contains_any(f'domain_{domain}', text_lower):
                 detected_domains.append(domain)
         
         return detected_domains
     
-    def _build_concept_network(self, knowledge_items: List[Dict[str, Any]]) -> Dict[str, List[str]]:
-        """构建概念网络"""
-        network = defaultdict(list)
-        
-        for item in knowledge_items:
-            text = item.get('content', '') + ' ' + item.get('title', '')
-            concepts = self._extract_concepts_from_text(text)
-            
-            # 创建概念之间的连接
-            for i, concept1 in enumerate(concepts):
-                for concept2 in concepts[i+1:]:
-                    if concept2 not in network[concept1]:
-                        network[concept1].append(concept2)
-        
-        return dict(network)
+    def _build_concept_network(self, knowledge_items: List[Dict[str, Any]]) -> ConceptGraph:
+        """构建概念网络：同一知识项中先出现的概念指向后出现的概念"""
+        return ConceptGraph.from_concept_lists(
+            self._get_document(item).concepts for item in knowledge_items
+        )
     
-    def _calculate_network_metrics(self, network: Dict[str, List[str]]) -> Dict[str, float]:
+    def _calculate_network_metrics(self, network: ConceptGraph) -> Dict[str, float]:
         """计算网络指标"""
         if not network:
             return {}
         
-        # 计算度分布
-        degrees = {node: len(neighbors) for node, neighbors in network.items()}
-        degree_distribution = Counter(degrees.values())
+        # 计算度分布（有出边的节点）
+        degrees = network.out_degrees()
+        degrees = degrees[degrees > 0]
+        degree_values, degree_counts = np.unique(degrees, return_counts=True)
+        degree_distribution = dict(zip(degree_values.tolist(), degree_counts.tolist()))
         
         # 计算聚类系数
-        clustering_coeffs = []
-        for node, neighbors in network.items():
-            if len(neighbors) < 2:
-                continue
-            
-            # 计算邻居之间的连接
-            neighbor_connections = 0
-            possible_connections = len(neighbors) * (len(neighbors) - 1) / 2
-            
-            for neighbor1 in neighbors:
-                for neighbor2 in neighbors:
-                    if neighbor1 < neighbor2 and neighbor2 in network.get(neighbor1, []):
-                        neighbor_connections += 1
-            
-            if possible_connections > 0:
-                clustering_coeffs.append(neighbor_connections / possible_connections)
-        
-        avg_clustering = np.mean(clustering_coeffs) if clustering_coeffs else 0
+        clustering_coeffs = network.local_clustering(self.network_chunk_size)
+        avg_clustering = np.mean(clustering_coeffs) if len(clustering_coeffs) else 0
         
         return {
             'clustering_coefficient': avg_clustering,
-            'degree_distribution': dict(degree_distribution),
-            'avg_degree': np.mean(list(degrees.values())) if degrees else 0
+            'degree_distribution': degree_distribution,
+            'avg_degree': np.mean(degrees) if len(degrees) else 0
         }
     
     def _check_scale_free_distribution(self, degree_distribution: Dict[int, int]) -> bool:
@@ -954,8 +953,7 @@ class PatternRecognizer:
         
         # 简化的层次分析
         for item in knowledge_items:
-            text = item.get('content', '') + ' ' + item.get('title', '')
-            concepts = self._extract_concepts_from_text(text)
+            concepts = self._get_document(item).concepts
             
             # 根据概念长度估计层次（简单启发式）
             for concept in concepts:
@@ -969,13 +967,14 @@ class PatternRecognizer:
         features = []
         
         for item in knowledge_items:
-            text = item.get('content', '') + ' ' + item.get('title', '')
+            document = self._get_document(item)
+            text = document.text
             
             # 简单特征提取
             feature_vector = [
-                len(text.split()),  # 词数
+                len(document.tokens),  # 词数
                 text.count('。'),   # 句号数
-                len(set(text.split())),  # 独特词数
+                len(set(document.tokens)),  # 独特词数
                 text.count('数据'),  # 数据相关词数
                 text.count('研究'),  # 研究相关词数
             ]
@@ -997,19 +996,13 @@ class PatternRecognizer:
         # 简化的组织化程度计算
         connections = 0
         total_possible = len(knowledge_items) * (len(knowledge_items) - 1) / 2
+        concept_sets = [self._get_document(item).concept_set for item in knowledge_items]
         
-        for i, item1 in enumerate(knowledge_items):
-            for j, item2 in enumerate(knowledge_items):
-                if i < j:
-                    # 检查概念重叠
-                    text1 = item1.get('content', '') + ' ' + item1.get('title', '')
-                    text2 = item2.get('content', '') + ' ' + item2.get('title', '')
-                    
-                    concepts1 = set(self._extract_concepts_from_text(text1))
-                    concepts2 = set(self._extract_concepts_from_text(text2))
-                    
-                    if concepts1.intersection(concepts2):
-                        connections += 1
+        for i, concepts1 in enumerate(concept_sets):
+            for concepts2 in concept_sets[i + 1:]:
+                # 检查概念重叠
+                if not concepts1.isdisjoint(concepts2):
+                    connections += 1
         
         return connections / total_possible if total_possible > 0 else 0
     
@@ -1019,12 +1012,10 @@ class PatternRecognizer:
             return 0.0
         
         # 简化的协同效应计算
-        synergy_indicators = ['结合', '整合', '协同', '合作', '配合']
-        
         synergy_count = 0
         for item in knowledge_items:
-            text = item.get('content', '') + ' ' + item.get('title', '')
-            if any(indicator in text for indicator in synergy_indicators):
+            text = self._get_document(item).text
+            if self.keyword_matcher.contains_any('synergy', text):
                 synergy_count += 1
         
         return synergy_count / len(knowledge_items)
@@ -1039,9 +1030,8 @@ class PatternRecognizer:
         # 计算每个时间点的状态指标
         states = []
         for item in knowledge_items:
-            text = item.get('content', '') + ' ' + item.get('title', '')
             # 简单的状态指标：文本复杂度
-            state = len(text.split()) / 100  # 标准化
+            state = len(self._get_document(item).tokens) / 100  # 标准化
             states.append(state)
         
         # 检测显著变化
@@ -0,0 +1,196 @@
+"""
+分析流程性能剖析
+记录各阶段和各子检测方法的墙钟时间、CPU时间、吞吐量、峰值内存和调用次数，可选输出 cProfile 结果
+"""
+
+import sys
+import time
+import pstats
+import cProfile
+import fnmatch
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+from contextlib import contextmanager
+from functools import wraps
+
+try:
+    import resource
+except ImportError:  # Windows 下没有 resource 模块
+    resource = None
+
+
+_MISSING = object()
+
+
+def get_peak_rss_mb(who: str = 'self') -> Optional[float]:
+    """获取进程的峰值常驻内存（MB），不支持的平台返回 None"""
+    if resource is None:
+        return None
+
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if who == 'children' else resource.RUSAGE_SELF)
+    # Linux 上 ru_maxrss 的单位为 KB，macOS 上为字节
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(usage.ru_maxrss / scale, 2)
+
+
+class _TimingStats:
+    """累计耗时统计"""
+
+    __slots__ = ('calls', 'wall_time', 'cpu_time', 'items')
+
+    def __init__(self):
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.items = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'calls': self.calls,
+            'wall_time': round(self.wall_time, 4),
+            'cpu_time': round(self.cpu_time, 4)
+        }
+        if self.items:
+            result['items'] = self.items
+            result['throughput'] = round(self.items / self.wall_time, 2) if self.wall_time > 0 else None
+        return result
+
+
+class PipelineProfiler:
+    """分析流程剖析器
+
+    stage() 记录流程阶段，instrument() 为模块实例的方法包装计时器以统计子检测方法。
+    CPU 时间按线程统计，因此并发执行的阶段互不干扰；进程池中的计算不计入
+    """
+
+    # 默认统计的方法：模块属性名 -> 方法名通配符
+    DEFAULT_TARGETS = {
+        'metrics_calculator': ('calculate_*',),
+        'quality_assessor': ('assess_*',),
+        'pattern_recognizer': ('identify_*', '_detect_*'),
+        'value_assessor': ('assess_*',),
+        'visualizer': ('generate_*',),
+        'report_generator': ('generate_*',)
+    }
+
+    def __init__(self, enable_cprofile: bool = False):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        self.stages: Dict[str, _TimingStats] = {}
+        self.stage_memory: Dict[str, Optional[float]] = {}
+        self.methods: Dict[str, _TimingStats] = {}
+        # (对象, 方法名, 包装前的实例属性)
+        self._instrumented: List[Tuple[Any, str, Any]] = []
+
+        self.cprofile: Optional[cProfile.Profile] = cProfile.Profile() if enable_cprofile else None
+        self.start_time = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, items: int = 0):
+        """记录一个流程阶段"""
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.thread_time() - cpu_start
+
+            with self._lock:
+                stats = self.stages.setdefault(name, _TimingStats())
+                stats.calls += 1
+                stats.wall_time += wall_time
+                stats.cpu_time += cpu_time
+                stats.items += items
+                self.stage_memory[name] = get_peak_rss_mb()
+
+    def _record_call(self, name: str, wall_time: float, cpu_time: float):
+        with self._lock:
+            stats = self.methods.get(name)
+            if stats is None:
+                stats = self.methods[name] = _TimingStats()
+            stats.calls += 1
+            stats.wall_time += wall_time
+            stats.cpu_time += cpu_time
+
+    def instrument(self, obj: Any, patterns: Tuple[str, ...], prefix: str = None):
+        """为对象上匹配通配符的方法安装计时包装，统计调用次数和累计耗时（含嵌套调用）"""
+        prefix = prefix or type(obj).__name__
+
+        for attr in dir(type(obj)):
+            if attr.startswith('__') or not any(fnmatch.fnmatchcase(attr, p) for p in patterns):
+                continue
+
+            method = getattr(obj, attr)
+            if not callable(method):
+                continue
+
+            self._instrumented.append((obj, attr, obj.__dict__.get(attr, _MISSING)))
+            setattr(obj, attr, self._wrap(method, f"{prefix}.{attr}"))
+
+    def instrument_modules(self, owner: Any, targets: Dict[str, Tuple[str, ...]] = None):
+        """为分析器的各模块安装计时包装"""
+        for attr, patterns in (targets or self.DEFAULT_TARGETS).items():
+            module = getattr(owner, attr, None)
+            if module is not None:
+                self.instrument(module, patterns)
+
+    def _wrap(self, method, name: str):
+        record = self._record_call
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+
+        return timed
+
+    def uninstrument(self):
+        """移除计时包装，恢复原方法"""
+        for obj, attr, previous in reversed(self._instrumented):
+            if previous is _MISSING:
+                obj.__dict__.pop(attr, None)
+            else:
+                obj.__dict__[attr] = previous
+        self._instrumented = []
+
+    def dump_cprofile(self, path: str, top: int = 30) -> Optional[str]:
+        """保存 cProfile 结果，并在旁边写入按累计时间排序的文本摘要"""
+        if self.cprofile is None:
+            return None
+
+        self.cprofile.dump_stats(path)
+        with open(f"{path}.txt", 'w', encoding='utf-8') as f:
+            stats = pstats.Stats(self.cprofile, stream=f)
+            stats.sort_stats('cumulative').print_stats(top)
+
+        self.logger.info(f"cProfile 结果已保存: {path}")
+        return path
+
+    def get_report(self) -> Dict[str, Any]:
+        """获取剖析报告"""
+        with self._lock:
+            stages = {}
+            for name, stats in self.stages.items():
+                stages[name] = stats.to_dict()
+                stages[name]['peak_rss_mb'] = self.stage_memory.get(name)
+
+            methods = {
+                name: stats.to_dict()
+                for name, stats in sorted(self.methods.items(), key=lambda kv: -kv[1].wall_time)
+            }
+
+        return {
+            'total_time': round(time.perf_counter() - self.start_time, 4),
+            'peak_rss_mb': get_peak_rss_mb(),
+            'children_peak_rss_mb': get_peak_rss_mb('children'),
+            'stages': stages,
+            'methods': methods
+        }
@@ -11,6 +11,10 @@ from datetime import datetime
 import math
 from dataclasses import dataclass
 
+from document_cache import AnalyzedDocument, DocumentCache, get_document
+from keyword_matcher import KeywordMatcher
+from parallel import map_batches_in_processes, resolve_workers
+
 
 @dataclass
 class QualityScore:
@@ -57,11 +61,37 @@ class QualityAssessor:
         self.completeness_elements = [
             '定义', '解释', '原因', '结果', '例子', '数据', '引用'
         ]
+        
+        # 明显矛盾的表述
+        self.contradiction_pairs = [
+            ('总是', '从不'), ('所有', '没有'), ('肯定', '不确定'),
+            ('绝对', '相对'), ('完全', '部分')
+        ]
+        
+        # 各项检查使用的指示词，编译为一个匹配器，每个文本只扫描一次
+        self.keyword_matcher = KeywordMatcher({
+            'uncertainty': ['可能', '也许', '据说', '传言', '推测'],
+            'completeness': self.completeness_elements,
+            'contradiction': [word for pair in self.contradiction_pairs for word in pair],
+            'structure': ['首先', '其次', '最后', '总结', '结论', '因此', '所以'],
+            'context': ['背景', '原因', '结果', '影响', '意义'],
+            'subjective': ['我认为', '我觉得', '相信', '认为', '应该', '可能'],
+            'objective': ['数据', '研究', '实验', '统计', '分析', '显示'],
+            **{f'credibility_{level}': words for level, words in self.credibility_indicators.items()}
+        })
+        
+        # 由分析器注入的共享文档缓存
+        self.document_cache: Optional[DocumentCache] = None
+    
+    def _get_document(self, knowledge_item: Dict[str, Any]) -> AnalyzedDocument:
+        """获取知识项的分词结果"""
+        return get_document(self.document_cache, knowledge_item)
     
     def assess_accuracy(self, knowledge_item: Dict[str, Any]) -> Tuple[float, Dict[str, Any]]:
         """评估知识准确性"""
         try:
-            text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+            document = self._get_document(knowledge_item)
+            text = document.text
             
             if not text.strip():
                 return 0.0, {"reason": "空文本内容"}
@@ -91,9 +121,8 @@ class QualityAssessor:
             accuracy_score += logical_indicators.get('consistency_score', 0) * 0.4
             
             # 3. 检查不确定性标记
-            uncertainty_markers = ['可能', '也许', '据说', '传言', '推测']
-            uncertainty_count = sum(1 for marker in uncertainty_markers if marker in text)
-            uncertainty_penalty = min(uncertainty_count / len(text.split()) * 10, 0.3)
+            uncertainty_count = self.keyword_matcher.count('uncertainty', text)
+            uncertainty_penalty = min(uncertainty_count / len(document.tokens) * 10, 0.3)
             
             details['uncertainty_penalty'] = round(uncertainty_penalty, 3)
             accuracy_score -= uncertainty_penalty
@@ -116,7 +145,8 @@ class QualityAssessor:
     def assess_completeness(self, knowledge_item: Dict[str, Any]) -> Tuple[float, Dict[str, Any]]:
         """评估知识完整性"""
         try:
-            text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+            document = self._get_document(knowledge_item)
+            text = document.text
             
             if not text.strip():
                 return 0.0, {"reason": "空文本内容"}
@@ -125,7 +155,7 @@ class QualityAssessor:
             details = {}
             
             # 1. 检查基本要素
-            word_count = len(text.split())
+            word_count = len(document.tokens)
             details['word_count'] = word_count
             
             # 文本长度评分
@@ -143,8 +173,9 @@ class QualityAssessor:
             
             # 2. 检查完整性要素
             element_scores = {}
+            found_elements = self.keyword_matcher.find_all('completeness', text)
             for element in self.completeness_elements:
-                if element in text:
+                if element in found_elements:
                     element_scores[element] = 1.0
                 else:
                     element_scores[element] = 0.0
@@ -186,8 +217,9 @@ class QualityAssessor:
             concept_definitions = defaultdict(list)
             
             for item in knowledge_items:
-                text = item.get('content', '') + ' ' + item.get('title', '')
-                concepts = self._extract_concepts(text)
+                document = self._get_document(item)
+                text = document.text
+                concepts = document.concepts
                 
                 for concept in concepts:
                     all_concepts.add(concept)
@@ -232,7 +264,7 @@ class QualityAssessor:
     def assess_credibility(self, knowledge_item: Dict[str, Any]) -> Tuple[float, Dict[str, Any]]:
         """评估知识可信度"""
         try:
-            text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+            text = self._get_document(knowledge_item).text
             
             if not text.strip():
                 return 0.0, {"reason": "空文本内容"}
@@ -244,9 +276,9 @@ class QualityAssessor:
             credibility_indicators = self._check_credibility_indicators(text)
             details['credibility_indicators'] = credibility_indicators
             
-            high_cred_words = len([word for word in self.credibility_indicators['high'] if word in text])
-            medium_cred_words = len([word for word in self.credibility_indicators['medium'] if word in text])
-            low_cred_words = len([word for word in self.credibility_indicators['low'] if word in text])
+            high_cred_words = self.keyword_matcher.count('credibility_high', text)
+            medium_cred_words = self.keyword_matcher.count('credibility_medium', text)
+            low_cred_words = self.keyword_matcher.count('credibility_low', text)
             
             indicator_score = (high_cred_words * 1.0 + medium_cred_words * 0.5 - low_cred_words * 0.8)
             indicator_score = max(0, min(1, indicator_score / 10))  # 标准化
@@ -276,7 +308,7 @@ class QualityAssessor:
                         context: Dict[str, Any] = None) -> Tuple[float, Dict[str, Any]]:
         """评估知识相关性"""
         try:
-            text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+            text = self._get_document(knowledge_item).text
             
             if not text.strip():
                 return 0.0, {"reason": "空文本内容"}
@@ -368,6 +400,14 @@ class QualityAssessor:
     def assess_batch_quality(self, knowledge_items: List[Dict[str, Any]], 
                            context: Dict[str, Any] = None) -> List[QualityScore]:
         """批量质量评估"""
+        # 未注入文档缓存时（单独调用或在进程池中）为本批知识项构建一次，各评估维度共享分词结果
+        if self.document_cache is None:
+            self.document_cache = DocumentCache(knowledge_items)
+            try:
+                return self.assess_batch_quality(knowledge_items, context)
+            finally:
+                self.document_cache = None
+        
         results = []
         
         for i, item in enumerate(knowledge_items):
@@ -385,6 +425,31 @@ class QualityAssessor:
         
         return results
     
+    def assess_batch_quality_parallel(self, knowledge_items: List[Dict[str, Any]], 
+                                      context: Dict[str, Any] = None, max_workers: int = None,
+                                      chunk_size: int = 100) -> List[QualityScore]:
+        """多进程批量质量评估，按分块分发知识项，结果顺序与输入一致"""
+        workers = resolve_workers(max_workers)
+        if workers <= 1 or len(knowledge_items) <= chunk_size:
+            return self.assess_batch_quality(knowledge_items, context)
+        
+        try:
+            self.logger.info(f"使用 {workers} 个进程并行质量评估 {len(knowledge_items)} 项")
+            return map_batches_in_processes(
+                QualityAssessor, self.config, 'assess_batch_quality', knowledge_items, (context,),
+                max_workers=workers, chunk_size=chunk_size
+            )
+        except Exception as e:
+            self.logger.error(f"并行质量评估失败，改为串行评估: {e}")
+            return self.assess_batch_quality(knowledge_items, context)
+    
+    def time_signature(self, knowledge_item: Dict[str, Any]) -> float:
+        """评估结果中随当前时间变化的部分，即按 7/30/365 天分段的时效性评分
+
+        取值与评估时相同时评估结果与重新评估一致，增量分析据此判断已保存的结果是否过期
+        """
+        return self._assess_timeliness(knowledge_item)
+    
     def get_quality_statistics(self, quality_scores: List[QualityScore]) -> Dict[str, Any]:
         """获取质量统计信息"""
         if not quality_scores:
@@ -431,13 +496,9 @@ class QualityAssessor:
         contradictions = []
         
         # 检查明显的矛盾表述
-        contradiction_pairs = [
-            ('总是', '从不'), ('所有', '没有'), ('肯定', '不确定'),
-            ('绝对', '相对'), ('完全', '部分')
-        ]
-        
-        for word1, word2 in contradiction_pairs:
-            if word1 in text and word2 in text:
+        found_words = self.keyword_matcher.find_all('contradiction', text)
+        for word1, word2 in self.contradiction_pairs:
+            if word1 in found_words and word2 in found_words:
                 contradictions.append((word1, word2))
         
         consistency_score = max(0, 1 - len(contradictions) * 0.2)
@@ -470,9 +531,7 @@ class QualityAssessor:
     def _assess_structure_completeness(self, text: str) -> float:
         """评估结构完整性"""
         # 检查是否有清晰的结构标记
-        structure_markers = ['首先', '其次', '最后', '总结', '结论', '因此', '所以']
-        
-        marker_count = sum(1 for marker in structure_markers if marker in text)
+        marker_count = self.keyword_matcher.count('structure', text)
         structure_score = min(marker_count / 3, 1.0)  # 最多3个标记为满分
         
         return structure_score
@@ -480,11 +539,10 @@ class QualityAssessor:
     def _assess_context_completeness(self, knowledge_item: Dict[str, Any]) -> float:
         """评估上下文完整性"""
         # 检查是否有足够的上下文信息
-        context_elements = ['背景', '原因', '结果', '影响', '意义']
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
-        context_count = sum(1 for element in context_elements if element in text)
-        return min(context_count / len(context_elements), 1.0)
+        context_count = self.keyword_matcher.count('context', text)
+        return min(context_count / len(self.keyword_matcher.keywords('context')), 1.0)
     
     def _extract_concepts(self, text: str) -> List[str]:
         """提取关键概念"""
@@ -523,11 +581,11 @@ class QualityAssessor:
             return 1.0
         
         # 提取所有文本
-        all_texts = [item.get('content', '') + ' ' + item.get('title', '') for item in knowledge_items]
+        documents = [self._get_document(item) for item in knowledge_items]
         
         # 检查重复内容的比例
-        total_words = sum(len(text.split()) for text in all_texts)
-        unique_words = len(set().union(*[set(text.lower().split()) for text in all_texts]))
+        total_words = sum(len(document.tokens) for document in documents)
+        unique_words = len(set().union(*[set(document.lower_tokens) for document in documents]))
         
         if total_words > 0:
             uniqueness = unique_words / total_words
@@ -541,7 +599,7 @@ class QualityAssessor:
         # 提取所有数值
         all_numbers = []
         for item in knowledge_items:
-            text = item.get('content', '') + ' ' + item.get('title', '')
+            text = self._get_document(item).text
             numbers = re.findall(r'\d+\.?\d*', text)
             all_numbers.extend([float(num) for num in numbers])
         
@@ -565,9 +623,9 @@ class QualityAssessor:
     def _check_credibility_indicators(self, text: str) -> Dict[str, int]:
         """检查可信度指示词"""
         return {
-            'high_credibility': len([word for word in self.credibility_indicators['high'] if word in text]),
-            'medium_credibility': len([word for word in self.credibility_indicators['medium'] if word in text]),
-            'low_credibility': len([word for word in self.credibility_indicators['low'] if word in text])
+            'high_credibility': self.keyword_matcher.count('credibility_high', text),
+            'medium_credibility': self.keyword_matcher.count('credibility_medium', text),
+            'low_credibility': self.keyword_matcher.count('credibility_low', text)
         }
     
     def _assess_source_credibility(self, knowledge_item: Dict[str, Any]) -> float:
@@ -588,11 +646,8 @@ class QualityAssessor:
     def _assess_objectivity(self, text: str) -> float:
         """评估客观性"""
         # 检查主观性词汇
-        subjective_words = ['我认为', '我觉得', '相信', '认为', '应该', '可能']
-        objective_indicators = ['数据', '研究', '实验', '统计', '分析', '显示']
-        
-        subjective_count = sum(1 for word in subjective_words if word in text)
-        objective_count = sum(1 for word in objective_indicators if word in text)
+        subjective_count = self.keyword_matcher.count('subjective', text)
+        objective_count = self.keyword_matcher.count('objective', text)
         
         if subjective_count + objective_count > 0:
             objectivity = objective_count / (subjective_count + objective_count)
@@ -625,33 +680,27 @@ class QualityAssessor:
     
     def _assess_timeliness(self, knowledge_item: Dict[str, Any]) -> float:
         """评估时效性"""
-        collection_time = knowledge_item.get('_collection_time', '')
+        time_obj = self._get_document(knowledge_item).collection_time
         
-        if not collection_time:
+        if time_obj is None:
             return 0.5
         
-        try:
-            time_obj = datetime.fromisoformat(collection_time.replace('Z', '+00:00'))
-            days_old = (datetime.now() - time_obj.replace(tzinfo=None)).days
-            
-            # 一周内为1分，一个月内为0.8分，一年内为0.5分
-            if days_old <= 7:
-                return 1.0
-            elif days_old <= 30:
-                return 0.8
-            elif days_old <= 365:
-                return 0.5
-            else:
-                return 0.2
-                
-        except:
+        days_old = (datetime.now() - time_obj.replace(tzinfo=None)).days
+        
+        # 一周内为1分，一个月内为0.8分，一年内为0.5分
+        if days_old <= 7:
+            return 1.0
+        elif days_old <= 30:
+            return 0.8
+        elif days_old <= 365:
             return 0.5
+        else:
+            return 0.2
     
     def _assess_uniqueness(self, knowledge_item: Dict[str, Any]) -> float:
         """评估独特性"""
         # 简单的独特性评估
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
-        words = text.lower().split()
+        words = self._get_document(knowledge_item).lower_tokens
         
         # 检查不常见词汇比例
         if not words:
@@ -5,10 +5,10 @@
 
 import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Iterable
 from datetime import datetime, timedelta
 from pathlib import Path
-from dataclasses import asdict
+from dataclasses import dataclass, asdict
 import base64
 from collections import defaultdict, Counter
 
@@ -17,6 +17,35 @@ from metrics_calculator import MetricsCalculator
 from quality_assessor import QualityAssessor, QualityScore
 from pattern_recognizer import PatternRecognizer, Pattern
 from value_assessor import ValueAssessor, ValueAssessment
+from columnar_store import RecordTable
+
+
+@dataclass
+class ReportModel:
+    """报告模型：各格式报告共用的汇总数据，每批报告只计算一次"""
+    total_items: int
+    source_counts: Counter
+    time_distribution: Optional[Dict[str, Any]]
+    avg_quality: float
+    high_quality_count: int
+    quality_dimension_scores: Dict[str, float]
+    quality_distribution: Dict[str, int]
+    quality_suggestions: List[str]
+    avg_value: float
+    value_dimension_scores: Dict[str, float]
+    value_distribution: Dict[str, int]
+    value_suggestions: List[str]
+    pattern_count: int
+    pattern_type_counts: Counter
+    key_findings: List[str]
+    development_trends: List[str]
+    competitive_advantages: List[str]
+    risks: List[Dict[str, str]]
+    conclusions: List[str]
+
+
+QUALITY_DIMENSIONS = ['accuracy', 'completeness', 'consistency', 'credibility', 'relevance']
+VALUE_DIMENSIONS = ['economic_value', 'social_value', 'application_value', 'innovation_value']
 
 
 class ReportGenerator:
@@ -39,6 +68,10 @@ class ReportGenerator:
         self.output_dir = Path(self.report_config['output_dir'])
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # 批量生成期间共用的报告模型及其对应的分析结果
+        self._report_model: Optional[ReportModel] = None
+        self._report_model_source: Optional[Dict[str, Any]] = None
+        
         # 报告模板
         self.report_templates = {
             'executive': self._get_executive_summary_template(),
@@ -90,11 +123,8 @@ class ReportGenerator:
         try:
             self.logger.info("生成综合报告...")
             
-            report_content = self._build_comprehensive_report(analysis_results)
-            
             output_path = self.output_dir / output_filename
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(report_content)
+            self._write_sections(output_path, self._iter_comprehensive_report(analysis_results))
             
             self.logger.info(f"综合报告已保存: {output_path}")
             return str(output_path)
@@ -104,17 +134,17 @@ class ReportGenerator:
             return ""
     
     def generate_json_report(self, analysis_results: Dict[str, Any], 
-                           output_filename: str = "analysis_results.json") -> str:
-        """生成JSON格式报告"""
+                           output_filename: str = "analysis_results.json",
+                           json_results: Dict[str, Any] = None) -> str:
+        """生成JSON格式报告，json_results 为报告中写入的完整分析数据，默认为 analysis_results"""
         try:
             self.logger.info("生成JSON报告...")
             
             # 准备JSON数据
-            json_data = self._prepare_json_data(analysis_results)
+            json_data = self._prepare_json_data(analysis_results, json_results)
             
             output_path = self.output_dir / output_filename
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, ensure_ascii=False, indent=2, default=str)
+            self._write_sections(output_path, self._iter_json(json_data))
             
             self.logger.info(f"JSON报告已保存: {output_path}")
             return str(output_path)
@@ -129,11 +159,8 @@ class ReportGenerator:
         try:
             self.logger.info("生成HTML报告...")
             
-            html_content = self._build_html_report(analysis_results)
-            
             output_path = self.output_dir / output_filename
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            self._write_sections(output_path, self._iter_html_report(analysis_results))
             
             self.logger.info(f"HTML报告已保存: {output_path}")
             return str(output_path)
@@ -166,13 +193,22 @@ class ReportGenerator:
             self.logger.error(f"生成自定义报告失败: {e}")
             return ""
     
-    def generate_batch_reports(self, analysis_results: Dict[str, Any]) -> List[str]:
-        """批量生成多种格式报告"""
+    def generate_batch_reports(self, analysis_results: Dict[str, Any],
+                               json_results: Dict[str, Any] = None) -> List[str]:
+        """批量生成多种格式报告
+        
+        json_results 为JSON报告中写入的完整分析数据，默认为 analysis_results；
+        其余报告只读取 analysis_results 中的汇总字段
+        """
         try:
             self.logger.info("批量生成报告...")
             
             generated_files = []
             
+            # 各格式共用同一份汇总数据
+            self._report_model = self.build_report_model(analysis_results)
+            self._report_model_source = analysis_results
+            
             # 生成各种格式的报告
             report_configs = [
                 ('executive', 'executive_summary.md'),
@@ -185,7 +221,7 @@ class ReportGenerator:
             for report_type, filename in report_configs:
                 try:
                     if report_type == 'json':
-                        file_path = self.generate_json_report(analysis_results, filename)
+                        file_path = self.generate_json_report(analysis_results, filename, json_results)
                     elif report_type == 'html':
                         file_path = self.generate_html_report(analysis_results, filename)
                     elif report_type == 'executive':
@@ -207,9 +243,87 @@ class ReportGenerator:
         except Exception as e:
             self.logger.error(f"批量生成报告失败: {e}")
             return []
+        
+        finally:
+            self._report_model = None
+            self._report_model_source = None
+    
+    def build_report_model(self, analysis_results: Dict[str, Any]) -> ReportModel:
+        """计算各格式报告共用的汇总数据"""
+        knowledge_items = analysis_results.get('knowledge_items', [])
+        quality_scores = analysis_results.get('quality_scores', [])
+        value_assessments = analysis_results.get('value_assessments', [])
+        patterns = analysis_results.get('patterns', [])
+        
+        avg_quality = self._calculate_average_quality(quality_scores)
+        avg_value = self._calculate_average_value(value_assessments)
+        quality_dimension_scores = self._average_dimensions(quality_scores, QUALITY_DIMENSIONS)
+        value_dimension_scores = self._average_dimensions(value_assessments, VALUE_DIMENSIONS)
+        
+        return ReportModel(
+            total_items=len(knowledge_items),
+            source_counts=Counter([item.get('_source', 'unknown') for item in knowledge_items]),
+            time_distribution=self._analyze_time_distribution(knowledge_items),
+            avg_quality=avg_quality,
+            high_quality_count=len([qs for qs in quality_scores if qs.get('overall_score', 0) >= 0.8]),
+            quality_dimension_scores=quality_dimension_scores,
+            quality_distribution=self._analyze_quality_distribution(quality_scores),
+            quality_suggestions=self._generate_quality_improvement_suggestions(
+                quality_scores, quality_dimension_scores, avg_quality),
+            avg_value=avg_value,
+            value_dimension_scores=value_dimension_scores,
+            value_distribution=self._analyze_value_distribution(value_assessments),
+            value_suggestions=self._generate_value_improvement_suggestions(
+                value_assessments, value_dimension_scores, avg_value),
+            pattern_count=len(patterns),
+            pattern_type_counts=Counter([p.get('pattern_type', 'unknown') for p in patterns]),
+            key_findings=self._generate_key_findings(analysis_results, avg_quality, avg_value),
+            development_trends=self._analyze_development_trends(analysis_results),
+            competitive_advantages=self._analyze_competitive_advantages(analysis_results, avg_quality, avg_value),
+            risks=self._assess_risks(analysis_results, avg_quality, avg_value),
+            conclusions=self._generate_conclusions(analysis_results)
+        )
+    
+    def _get_report_model(self, analysis_results: Dict[str, Any]) -> ReportModel:
+        """获取报告模型，批量生成期间复用已计算的模型"""
+        if self._report_model is not None and self._report_model_source is analysis_results:
+            return self._report_model
+        return self.build_report_model(analysis_results)
     
     # 私有方法：报告构建
     
+    def _write_sections(self, output_path: Path, sections: Iterable[str]):
+        """把逐段生成的内容依次写入文件，不在内存中拼接完整报告"""
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for section in sections:
+                f.write(section)
+    
+    def _iter_json(self, value: Any, indent_level: int = 0, stream_depth: int = 3) -> Iterator[str]:
+        """逐段编码 JSON，输出与 json.dump(value, indent=2, ensure_ascii=False, default=str) 一致
+        
+        前 stream_depth 层的字典和列表逐项编码（知识项、质量评分等长列表中的每一项单独编码，
+        列式文件的 RecordTable 按批读取），更深层的值整体交给 json.dumps
+        """
+        padding = '  ' * indent_level
+        
+        if stream_depth > 0 and isinstance(value, dict) and value and all(isinstance(key, str) for key in value):
+            yield '{'
+            for i, (key, item) in enumerate(value.items()):
+                yield f"{',' if i else ''}\n{padding}  {json.dumps(key, ensure_ascii=False)}: "
+                yield from self._iter_json(item, indent_level + 1, stream_depth - 1)
+            yield f"\n{padding}}}"
+        
+        elif stream_depth > 0 and isinstance(value, (list, tuple, RecordTable)) and value:
+            yield '['
+            for i, item in enumerate(value):
+                yield f"{',' if i else ''}\n{padding}  "
+                yield from self._iter_json(item, indent_level + 1, stream_depth - 1)
+            yield f"\n{padding}]"
+        
+        else:
+            # JSON 字符串中的换行都已转义，按行缩进不会改变内容
+            yield json.dumps(value, ensure_ascii=False, indent=2, default=str).replace('\n', '\n' + padding)
+    
     def _build_executive_summary(self, analysis_results: Dict[str, Any]) -> str:
         """构建执行摘要"""
         timestamp = datetime.now().strftime('%Y年%m月%d日 %H:%M')
@@ -220,11 +334,12 @@ class ReportGenerator:
         value_assessments = analysis_results.get('value_assessments', [])
         patterns = analysis_results.get('patterns', [])
         
-        # 计算关键指标
-        total_items = len(analysis_results.get('knowledge_items', []))
-        avg_quality = self._calculate_average_quality(quality_scores)
-        avg_value = self._calculate_average_value(value_assessments)
-        pattern_count = len(patterns)
+        # 关键指标
+        model = self._get_report_model(analysis_results)
+        total_items = model.total_items
+        avg_quality = model.avg_quality
+        avg_value = model.avg_value
+        pattern_count = model.pattern_count
         
         # 生成摘要内容
         summary = f"""# 知识涌现分析执行摘要
@@ -448,7 +563,7 @@ overall_score = (accuracy * weight_accuracy +
         
         # 添加技术发现
         if patterns:
-            pattern_types = Counter([p.get('pattern_type', 'unknown') for p in patterns])
+            pattern_types = self._get_report_model(analysis_results).pattern_type_counts
             report += f"**主要模式类型**: {', '.join(pattern_types.keys())}\n\n"
         
         report += """
@@ -480,9 +595,13 @@ overall_score = (accuracy * weight_accuracy +
     
     def _build_comprehensive_report(self, analysis_results: Dict[str, Any]) -> str:
         """构建综合报告"""
+        return ''.join(self._iter_comprehensive_report(analysis_results))
+    
+    def _iter_comprehensive_report(self, analysis_results: Dict[str, Any]) -> Iterator[str]:
+        """逐段生成综合报告，各段落生成后即可写出"""
         timestamp = datetime.now().strftime('%Y年%m月%d日 %H:%M')
         
-        report = f"""# 知识涌现综合分析报告
+        yield f"""# 知识涌现综合分析报告
 
 **报告生成时间**: {timestamp}
 
@@ -516,25 +635,26 @@ overall_score = (accuracy * weight_accuracy +
 
 """
         
+        model = self._get_report_model(analysis_results)
+        
         # 添加数据概况
-        knowledge_items = analysis_results.get('knowledge_items', [])
-        report += f"- **知识项总数**: {len(knowledge_items)} 项\n"
+        yield f"- **知识项总数**: {model.total_items} 项\n"
         
         # 数据来源分析
-        sources = Counter([item.get('_source', 'unknown') for item in knowledge_items])
+        sources = model.source_counts
         if sources:
-            report += "- **数据来源分布**:\n"
+            yield "- **数据来源分布**:\n"
             for source, count in sources.most_common():
-                percentage = (count / len(knowledge_items)) * 100
-                report += f"  - {source}: {count} 项 ({percentage:.1f}%)\n"
+                percentage = (count / model.total_items) * 100
+                yield f"  - {source}: {count} 项 ({percentage:.1f}%)\n"
         
         # 时间分布
-        time_distribution = self._analyze_time_distribution(knowledge_items)
+        time_distribution = model.time_distribution
         if time_distribution:
-            report += f"- **时间跨度**: {time_distribution['start']} 至 {time_distribution['end']}\n"
-            report += f"- **平均每日产生**: {time_distribution['avg_daily']:.1f} 项\n"
+            yield f"- **时间跨度**: {time_distribution['start']} 至 {time_distribution['end']}\n"
+            yield f"- **平均每日产生**: {time_distribution['avg_daily']:.1f} 项\n"
         
-        report += """
+        yield """
 ### 2.2 数据质量
 
 """
@@ -542,21 +662,21 @@ overall_score = (accuracy * weight_accuracy +
         # 数据质量评估
         quality_scores = analysis_results.get('quality_scores', [])
         if quality_scores:
-            avg_quality = self._calculate_average_quality(quality_scores)
-            high_quality_count = len([qs for qs in quality_scores if qs.get('overall_score', 0) >= 0.8])
+            avg_quality = model.avg_quality
+            high_quality_count = model.high_quality_count
             
-            report += f"- **平均质量评分**: {avg_quality:.3f}/1.000\n"
-            report += f"- **高质量项目**: {high_quality_count} 项 ({high_quality_count/len(quality_scores)*100:.1f}%)\n"
-            report += f"- **质量分布**: "
+            yield f"- **平均质量评分**: {avg_quality:.3f}/1.000\n"
+            yield f"- **高质量项目**: {high_quality_count} 项 ({high_quality_count/len(quality_scores)*100:.1f}%)\n"
+            yield f"- **质量分布**: "
             
             if avg_quality >= 0.8:
-                report += "优秀\n"
+                yield "优秀\n"
             elif avg_quality >= 0.6:
-                report += "良好\n"
+                yield "良好\n"
             else:
-                report += "需要改进\n"
+                yield "需要改进\n"
         
-        report += """
+        yield """
 ---
 
 ## 3. 指标分析结果
@@ -569,37 +689,37 @@ overall_score = (accuracy * weight_accuracy +
         metrics = analysis_results.get('metrics', {})
         if metrics and 'overall' in metrics:
             overall_score = metrics['overall'].get('total_score', 0)
-            report += f"**总体涌现评分**: {overall_score:.1f}/100\n\n"
+            yield f"**总体涌现评分**: {overall_score:.1f}/100\n\n"
             
             # 各维度详细分析
             for dimension, data in metrics.items():
                 if isinstance(data, dict) and 'score' in data:
                     score = data['score']
-                    report += f"#### {dimension.capitalize()}指标 ({score:.1f}/100)\n"
+                    yield f"#### {dimension.capitalize()}指标 ({score:.1f}/100)\n"
                     
                     # 添加详细解释
                     if dimension == 'diversity':
-                        report += "- **含义**: 知识内容的多样性和丰富程度\n"
-                        report += f"- **表现**: {'优秀' if score >= 80 else '良好' if score >= 60 else '一般'}\n"
+                        yield "- **含义**: 知识内容的多样性和丰富程度\n"
+                        yield f"- **表现**: {'优秀' if score >= 80 else '良好' if score >= 60 else '一般'}\n"
                     elif dimension == 'connectivity':
-                        report += "- **含义**: 知识之间的关联程度和网络结构\n"
-                        report += f"- **表现**: {'优秀' if score >= 80 else '良好' if score >= 60 else '一般'}\n"
+                        yield "- **含义**: 知识之间的关联程度和网络结构\n"
+                        yield f"- **表现**: {'优秀' if score >= 80 else '良好' if score >= 60 else '一般'}\n"
                     elif dimension == 'complexity':
-                        report += "- **含义**: 知识内容的复杂性和深度\n"
-                        report += f"- **表现**: {'优秀' if score >= 80 else '良好' if score >= 60 else '一般'}\n"
+                        yield "- **含义**: 知识内容的复杂性和深度\n"
+                        yield f"- **表现**: {'优秀' if score >= 80 else '良好' if score >= 60 else '一般'}\n"
                     elif dimension == 'emergence':
-                        report += "- **含义**: 知识涌现的强度和创新性\n"
-                        report += f"- **表现**: {'优秀' if score >= 80 else '良好' if score >= 60 else '一般'}\n"
+                        yield "- **含义**: 知识涌现的强度和创新性\n"
+                        yield f"- **表现**: {'优秀' if score >= 80 else '良好' if score >= 60 else '一般'}\n"
                     elif dimension == 'coherence':
-                        report += "- **含义**: 知识体系的连贯性和一致性\n"
-                        report += f"- **表现**: {'优秀' if score >= 80 else '良好' if score >= 60 else '一般'}\n"
+                        yield "- **含义**: 知识体系的连贯性和一致性\n"
+                        yield f"- **表现**: {'优秀' if score >= 80 else '良好' if score >= 60 else '一般'}\n"
                     elif dimension == 'impact':
-                        report += "- **含义**: 知识的影响力和重要性\n"
-                        report += f"- **表现**: {'优秀' if score >= 80 else '良好' if score >= 60 else '一般'}\n"
+                        yield "- **含义**: 知识的影响力和重要性\n"
+                        yield f"- **表现**: {'优秀' if score >= 80 else '良好' if score >= 60 else '一般'}\n"
                     
-                    report += "\n"
+                    yield "\n"
         
-        report += """
+        yield """
 ### 3.2 指标关联分析
 
 通过相关性分析发现，各指标之间存在一定的关联性：
@@ -618,53 +738,52 @@ overall_score = (accuracy * weight_accuracy +
         
         # 质量评估详细分析
         if quality_scores:
-            avg_quality = self._calculate_average_quality(quality_scores)
+            avg_quality = model.avg_quality
             
-            report += f"**平均质量评分**: {avg_quality:.3f}/1.000\n\n"
+            yield f"**平均质量评分**: {avg_quality:.3f}/1.000\n\n"
             
             # 各维度质量分析
             quality_dimensions = ['accuracy', 'completeness', 'consistency', 'credibility', 'relevance']
             dimension_names = ['准确性', '完整性', '一致性', '可信度', '相关性']
             
-            report += "#### 各维度质量评分\n\n"
+            yield "#### 各维度质量评分\n\n"
             
             for dim, name in zip(quality_dimensions, dimension_names):
-                scores = [qs.get(dim, 0) for qs in quality_scores]
-                avg_score = sum(scores) / len(scores) if scores else 0
+                avg_score = model.quality_dimension_scores[dim]
                 
-                report += f"- **{name}**: {avg_score:.3f}/1.000\n"
+                yield f"- **{name}**: {avg_score:.3f}/1.000\n"
                 
                 # 添加评价
                 if avg_score >= 0.8:
-                    report += "  - 评价: 优秀，质量很高\n"
+                    yield "  - 评价: 优秀，质量很高\n"
                 elif avg_score >= 0.6:
-                    report += "  - 评价: 良好，质量较高\n"
+                    yield "  - 评价: 良好，质量较高\n"
                 elif avg_score >= 0.4:
-                    report += "  - 评价: 一般，需要改进\n"
+                    yield "  - 评价: 一般，需要改进\n"
                 else:
-                    report += "  - 评价: 较差，急需改进\n"
+                    yield "  - 评价: 较差，急需改进\n"
             
-            report += "\n"
+            yield "\n"
             
             # 质量分布分析
-            quality_distribution = self._analyze_quality_distribution(quality_scores)
-            report += "#### 质量分布\n\n"
-            report += f"- **高质量 (≥0.8)**: {quality_distribution['high']} 项 ({quality_distribution['high']/len(quality_scores)*100:.1f}%)\n"
-            report += f"- **中等质量 (0.6-0.8)**: {quality_distribution['medium']} 项 ({quality_distribution['medium']/len(quality_scores)*100:.1f}%)\n"
-            report += f"- **低质量 (<0.6)**: {quality_distribution['low']} 项 ({quality_distribution['low']/len(quality_scores)*100:.1f}%)\n\n"
+            quality_distribution = model.quality_distribution
+            yield "#### 质量分布\n\n"
+            yield f"- **高质量 (≥0.8)**: {quality_distribution['high']} 项 ({quality_distribution['high']/len(quality_scores)*100:.1f}%)\n"
+            yield f"- **中等质量 (0.6-0.8)**: {quality_distribution['medium']} 项 ({quality_distribution['medium']/len(quality_scores)*100:.1f}%)\n"
+            yield f"- **低质量 (<0.6)**: {quality_distribution['low']} 项 ({quality_distribution['low']/len(quality_scores)*100:.1f}%)\n\n"
         
-        report += """
+        yield """
 ### 4.2 质量改进建议
 
 """
         
         # 质量改进建议
         if quality_scores:
-            suggestions = self._generate_quality_improvement_suggestions(quality_scores)
+            suggestions = model.quality_suggestions
             for suggestion in suggestions:
-                report += f"- {suggestion}\n"
+                yield f"- {suggestion}\n"
         
-        report += """
+        yield """
 ---
 
 ## 5. 模式识别结果
@@ -676,17 +795,17 @@ overall_score = (accuracy * weight_accuracy +
         # 模式识别结果
         patterns = analysis_results.get('patterns', [])
         if patterns:
-            report += f"**共识别 {len(patterns)} 个知识涌现模式**\n\n"
+            yield f"**共识别 {len(patterns)} 个知识涌现模式**\n\n"
             
             # 模式类型统计
-            pattern_types = Counter([p.get('pattern_type', 'unknown') for p in patterns])
-            report += "#### 主要模式类型\n\n"
+            pattern_types = model.pattern_type_counts
+            yield "#### 主要模式类型\n\n"
             
             for pattern_type, count in pattern_types.most_common():
                 percentage = (count / len(patterns)) * 100
-                report += f"- **{pattern_type}**: {count} 次 ({percentage:.1f}%)\n"
+                yield f"- **{pattern_type}**: {count} 次 ({percentage:.1f}%)\n"
             
-            report += "\n#### 重点模式分析\n\n"
+            yield "\n#### 重点模式分析\n\n"
             
             # 重点模式详细分析
             for i, pattern in enumerate(patterns[:5]):  # 只分析前5个模式
@@ -694,16 +813,16 @@ overall_score = (accuracy * weight_accuracy +
                 confidence = pattern.get('confidence', 0)
                 strength = pattern.get('strength', 0)
                 
-                report += f"**模式 {i+1}: {pattern_type}**\n"
-                report += f"- 置信度: {confidence:.3f}\n"
-                report += f"- 强度: {strength:.3f}\n"
+                yield f"**模式 {i+1}: {pattern_type}**\n"
+                yield f"- 置信度: {confidence:.3f}\n"
+                yield f"- 强度: {strength:.3f}\n"
                 
                 description = pattern.get('description', '无描述')
-                report += f"- 描述: {description}\n\n"
+                yield f"- 描述: {description}\n\n"
         else:
-            report += "未识别到明显的知识涌现模式。\n\n"
+            yield "未识别到明显的知识涌现模式。\n\n"
         
-        report += """
+        yield """
 ### 5.2 模式应用价值
 
 识别的模式可用于：
@@ -724,51 +843,50 @@ overall_score = (accuracy * weight_accuracy +
         # 价值评估分析
         value_assessments = analysis_results.get('value_assessments', [])
         if value_assessments:
-            avg_value = self._calculate_average_value(value_assessments)
+            avg_value = model.avg_value
             
-            report += f"**平均价值评分**: {avg_value:.3f}/1.000\n\n"
+            yield f"**平均价值评分**: {avg_value:.3f}/1.000\n\n"
             
             # 各维度价值分析
             value_dimensions = ['economic_value', 'social_value', 'application_value', 'innovation_value']
             dimension_names = ['经济价值', '社会价值', '应用价值', '创新价值']
             
-            report += "#### 各维度价值评分\n\n"
+            yield "#### 各维度价值评分\n\n"
             
             for dim, name in zip(value_dimensions, dimension_names):
-                scores = [va.get(dim, 0) for va in value_assessments]
-                avg_score = sum(scores) / len(scores) if scores else 0
+                avg_score = model.value_dimension_scores[dim]
                 
-                report += f"- **{name}**: {avg_score:.3f}/1.000\n"
+                yield f"- **{name}**: {avg_score:.3f}/1.000\n"
                 
                 # 添加评价和建议
                 if avg_score >= 0.7:
-                    report += "  - 评价: 价值显著，建议重点发展\n"
+                    yield "  - 评价: 价值显著，建议重点发展\n"
                 elif avg_score >= 0.5:
-                    report += "  - 评价: 价值中等，有提升空间\n"
+                    yield "  - 评价: 价值中等，有提升空间\n"
                 else:
-                    report += "  - 评价: 价值偏低，需要重新评估\n"
+                    yield "  - 评价: 价值偏低，需要重新评估\n"
             
-            report += "\n"
+            yield "\n"
             
             # 价值分布分析
-            value_distribution = self._analyze_value_distribution(value_assessments)
-            report += "#### 价值分布\n\n"
-            report += f"- **高价值 (≥0.7)**: {value_distribution['high']} 项 ({value_distribution['high']/len(value_assessments)*100:.1f}%)\n"
-            report += f"- **中等价值 (0.4-0.7)**: {value_distribution['medium']} 项 ({value_distribution['medium']/len(value_assessments)*100:.1f}%)\n"
-            report += f"- **低价值 (<0.4)**: {value_distribution['low']} 项 ({value_distribution['low']/len(value_assessments)*100:.1f}%)\n\n"
+            value_distribution = model.value_distribution
+            yield "#### 价值分布\n\n"
+            yield f"- **高价值 (≥0.7)**: {value_distribution['high']} 项 ({value_distribution['high']/len(value_assessments)*100:.1f}%)\n"
+            yield f"- **中等价值 (0.4-0.7)**: {value_distribution['medium']} 项 ({value_distribution['medium']/len(value_assessments)*100:.1f}%)\n"
+            yield f"- **低价值 (<0.4)**: {value_distribution['low']} 项 ({value_distribution['low']/len(value_assessments)*100:.1f}%)\n\n"
         
-        report += """
+        yield """
 ### 6.2 价值提升建议
 
 """
         
         # 价值提升建议
         if value_assessments:
-            suggestions = self._generate_value_improvement_suggestions(value_assessments)
+            suggestions = model.value_suggestions
             for suggestion in suggestions:
-                report += f"- {suggestion}\n"
+                yield f"- {suggestion}\n"
         
-        report += """
+        yield """
 ---
 
 ## 7. 综合分析与洞察
@@ -778,11 +896,11 @@ overall_score = (accuracy * weight_accuracy +
 """
         
         # 综合分析
-        key_findings = self._generate_key_findings(analysis_results)
+        key_findings = model.key_findings
         for finding in key_findings:
-            report += f"- {finding}\n"
+            yield f"- {finding}\n"
         
-        report += """
+        yield """
 ### 7.2 发展趋势分析
 
 基于当前数据和识别模式，知识涌现呈现以下趋势：
@@ -790,21 +908,21 @@ overall_score = (accuracy * weight_accuracy +
 """
         
         # 趋势分析
-        trends = self._analyze_development_trends(analysis_results)
+        trends = model.development_trends
         for trend in trends:
-            report += f"- {trend}\n"
+            yield f"- {trend}\n"
         
-        report += """
+        yield """
 ### 7.3 竞争优势分析
 
 """
         
         # 竞争优势分析
-        advantages = self._analyze_competitive_advantages(analysis_results)
+        advantages = model.competitive_advantages
         for advantage in advantages:
-            report += f"- {advantage}\n"
+            yield f"- {advantage}\n"
         
-        report += """
+        yield """
 ---
 
 ## 8. 风险评估与预警
@@ -814,13 +932,13 @@ overall_score = (accuracy * weight_accuracy +
 """
         
         # 风险评估
-        risks = self._assess_risks(analysis_results)
+        risks = model.risks
         for risk in risks:
-            report += f"- **{risk['level']}风险**: {risk['description']}\n"
-            report += f"  - 影响程度: {risk['impact']}\n"
-            report += f"  - 应对措施: {risk['mitigation']}\n\n"
+            yield f"- **{risk['level']}风险**: {risk['description']}\n"
+            yield f"  - 影响程度: {risk['impact']}\n"
+            yield f"  - 应对措施: {risk['mitigation']}\n\n"
         
-        report += """
+        yield """
 ### 8.2 预警指标
 
 建议建立以下预警指标：
@@ -841,9 +959,9 @@ overall_score = (accuracy * weight_accuracy +
         # 短期建议
         short_term = self._generate_short_term_recommendations(analysis_results)
         for rec in short_term:
-            report += f"- {rec}\n"
+            yield f"- {rec}\n"
         
-        report += """
+        yield """
 ### 9.2 中期建议 (3-12个月)
 
 """
@@ -851,9 +969,9 @@ overall_score = (accuracy * weight_accuracy +
         # 中期建议
         medium_term = self._generate_medium_term_recommendations(analysis_results)
         for rec in medium_term:
-            report += f"- {rec}\n"
+            yield f"- {rec}\n"
         
-        report += """
+        yield """
 ### 9.3 长期建议 (1-3年)
 
 """
@@ -861,9 +979,9 @@ overall_score = (accuracy * weight_accuracy +
         # 长期建议
         long_term = self._generate_long_term_recommendations(analysis_results)
         for rec in long_term:
-            report += f"- {rec}\n"
+            yield f"- {rec}\n"
         
-        report += """
+        yield """
 ---
 
 ## 10. 实施路线图
@@ -895,11 +1013,11 @@ overall_score = (accuracy * weight_accuracy +
 """
         
         # 结论
-        conclusions = self._generate_conclusions(analysis_results)
+        conclusions = model.conclusions
         for conclusion in conclusions:
-            report += f"- {conclusion}\n"
+            yield f"- {conclusion}\n"
         
-        report += f"""
+        yield f"""
 本分析为知识管理和决策提供了科学依据，建议按照制定的实施路线图逐步推进，持续优化知识涌现过程。
 
 ---
@@ -912,14 +1030,18 @@ overall_score = (accuracy * weight_accuracy +
 ---
 *本报告基于当前数据分析生成，建议定期更新以保持分析结果的时效性*
 """
-        
-        return report
     
     def _build_html_report(self, analysis_results: Dict[str, Any]) -> str:
         """构建HTML报告"""
+        return ''.join(self._iter_html_report(analysis_results))
+    
+    def _iter_html_report(self, analysis_results: Dict[str, Any]) -> Iterator[str]:
+        """逐段生成HTML报告，各段落生成后即可写出"""
         timestamp = datetime.now().strftime('%Y年%m月%d日 %H:%M')
+        model = self._get_report_model(analysis_results)
         
-        html_template = f"""
+        # 页头和样式
+        yield f"""
 <!DOCTYPE html>
 <html lang="zh-CN">
 <head>
@@ -1048,58 +1170,79 @@ overall_score = (accuracy * weight_accuracy +
             <p>基于人工智能的全面知识分析</p>
         </div>
 
-        <div class="section">
+"""
+        
+        # 执行摘要
+        yield f"""        <div class="section">
             <h2>📊 执行摘要</h2>
             <p>本报告对知识涌现过程进行了全面分析，涵盖数据收集、指标计算、质量评估、模式识别和价值分析等关键环节。</p>
             
             <div class="metrics-grid">
                 <div class="metric-card">
-                    <div class="metric-value">{len(analysis_results.get('knowledge_items', []))}</div>
+                    <div class="metric-value">{model.total_items}</div>
                     <div class="metric-label">知识项总数</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-value">{self._calculate_average_quality(analysis_results.get('quality_scores', [])):.2f}</div>
+                    <div class="metric-value">{model.avg_quality:.2f}</div>
                     <div class="metric-label">平均质量评分</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-value">{self._calculate_average_value(analysis_results.get('value_assessments', [])):.2f}</div>
+                    <div class="metric-value">{model.avg_value:.2f}</div>
                     <div class="metric-label">平均价值评分</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-value">{len(analysis_results.get('patterns', []))}</div>
+                    <div class="metric-value">{model.pattern_count}</div>
                     <div class="metric-label">识别模式数</div>
                 </div>
             </div>
         </div>
 
-        <div class="section">
+"""
+        
+        # 指标分析
+        yield f"""        <div class="section">
             <h2>📈 指标分析</h2>
             <p>以下是各项知识涌现指标的分析结果：</p>
             
             {self._generate_metrics_html(analysis_results.get('metrics', {}))}
         </div>
 
-        <div class="section">
+"""
+        
+        # 质量评估
+        yield f"""        <div class="section">
             <h2>🎯 质量评估</h2>
-            {self._generate_quality_html(analysis_results.get('quality_scores', []))}
+            {self._generate_quality_html(analysis_results.get('quality_scores', []), model.avg_quality)}
         </div>
 
-        <div class="section">
+"""
+        
+        # 价值分析
+        yield f"""        <div class="section">
             <h2>💎 价值分析</h2>
-            {self._generate_value_html(analysis_results.get('value_assessments', []))}
+            {self._generate_value_html(analysis_results.get('value_assessments', []), model.avg_value)}
         </div>
 
-        <div class="section">
+"""
+        
+        # 模式识别
+        yield f"""        <div class="section">
             <h2>🔍 模式识别</h2>
             {self._generate_patterns_html(analysis_results.get('patterns', []))}
         </div>
 
-        <div class="section">
+"""
+        
+        # 建议与预警
+        yield f"""        <div class="section">
             <h2>💡 建议与预警</h2>
             {self._generate_recommendations_html(analysis_results)}
         </div>
 
-        <div class="footer">
+"""
+        
+        # 页脚
+        yield """        <div class="footer">
             <p>本报告由知识涌现分析系统自动生成</p>
             <p>© 2024 知识管理分析平台</p>
         </div>
@@ -1107,8 +1250,6 @@ overall_score = (accuracy * weight_accuracy +
 </body>
 </html>
 """
-        
-        return html_template
     
     # 辅助方法
     
@@ -1154,6 +1295,14 @@ overall_score = (accuracy * weight_accuracy +
         
         return total_score / count if count > 0 else 0.0
     
+    def _average_dimensions(self, records: List[Dict[str, Any]], dimensions: List[str]) -> Dict[str, float]:
+        """计算各维度平均分，缺失的维度按 0 计"""
+        averages = {}
+        for dim in dimensions:
+            scores = [record.get(dim, 0) for record in records]
+            averages[dim] = sum(scores) / len(scores) if scores else 0
+        return averages
+    
     def _analyze_time_distribution(self, knowledge_items: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """分析时间分布"""
         if not knowledge_items:
@@ -1220,20 +1369,18 @@ overall_score = (accuracy * weight_accuracy +
         
         return distribution
     
-    def _generate_quality_improvement_suggestions(self, quality_scores: List[Dict[str, Any]]) -> List[str]:
-        """生成质量改进建议"""
+    def _generate_quality_improvement_suggestions(self, quality_scores: List[Dict[str, Any]],
+                                                  dim_scores: Dict[str, float] = None,
+                                                  avg_quality: float = None) -> List[str]:
+        """生成质量改进建议，可传入已计算的各维度平均分和总体平均分"""
         suggestions = []
         
         if not quality_scores:
             return ["需要更多数据来进行质量分析"]
         
         # 分析各维度短板
-        dimensions = ['accuracy', 'completeness', 'consistency', 'credibility', 'relevance']
-        dim_scores = {}
-        
-        for dim in dimensions:
-            scores = [qs.get(dim, 0) for qs in quality_scores]
-            dim_scores[dim] = sum(scores) / len(scores) if scores else 0
+        if dim_scores is None:
+            dim_scores = self._average_dimensions(quality_scores, QUALITY_DIMENSIONS)
         
         # 找出最低分的维度
         min_dim = min(dim_scores, key=dim_scores.get)
@@ -1254,7 +1401,8 @@ overall_score = (accuracy * weight_accuracy +
             suggestions.append(f"{dim_names[min_dim]}严重不足，建议立即制定改进计划")
         
         # 总体建议
-        avg_quality = self._calculate_average_quality(quality_scores)
+        if avg_quality is None:
+            avg_quality = self._calculate_average_quality(quality_scores)
         if avg_quality < 0.6:
             suggestions.append("整体质量偏低，建议建立质量管理体系")
         elif avg_quality < 0.8:
@@ -1262,20 +1410,18 @@ overall_score = (accuracy * weight_accuracy +
         
         return suggestions
     
-    def _generate_value_improvement_suggestions(self, value_assessments: List[Dict[str, Any]]) -> List[str]:
-        """生成价值改进建议"""
+    def _generate_value_improvement_suggestions(self, value_assessments: List[Dict[str, Any]],
+                                                dim_scores: Dict[str, float] = None,
+                                                avg_value: float = None) -> List[str]:
+        """生成价值改进建议，可传入已计算的各维度平均分和总体平均分"""
         suggestions = []
         
         if not value_assessments:
             return ["需要更多数据来进行价值分析"]
         
         # 分析各维度短板
-        dimensions = ['economic_value', 'social_value', 'application_value', 'innovation_value']
-        dim_scores = {}
-        
-        for dim in dimensions:
-            scores = [va.get(dim, 0) for va in value_assessments]
-            dim_scores[dim] = sum(scores) / len(scores) if scores else 0
+        if dim_scores is None:
+            dim_scores = self._average_dimensions(value_assessments, VALUE_DIMENSIONS)
         
         # 找出最低分的维度
         min_dim = min(dim_scores, key=dim_scores.get)
@@ -1292,7 +1438,8 @@ overall_score = (accuracy * weight_accuracy +
             suggestions.append(f"重点提升{dim_names[min_dim]}，当前平均分仅为{min_score:.3f}")
         
         # 总体建议
-        avg_value = self._calculate_average_value(value_assessments)
+        if avg_value is None:
+            avg_value = self._calculate_average_value(value_assessments)
         if avg_value < 0.5:
             suggestions.append("整体价值偏低，建议重新评估知识策略")
         elif avg_value < 0.7:
@@ -1300,8 +1447,9 @@ overall_score = (accuracy * weight_accuracy +
         
         return suggestions
     
-    def _generate_key_findings(self, analysis_results: Dict[str, Any]) -> List[str]:
-        """生成关键发现"""
+    def _generate_key_findings(self, analysis_results: Dict[str, Any],
+                               avg_quality: float = None, avg_value: float = None) -> List[str]:
+        """生成关键发现，可传入已计算的平均质量和平均价值"""
         findings = []
         
         knowledge_items = analysis_results.get('knowledge_items', [])
@@ -1313,7 +1461,8 @@ overall_score = (accuracy * weight_accuracy +
             findings.append(f"共分析了{len(knowledge_items)}个知识项，数据规模适中")
         
         if quality_scores:
-            avg_quality = self._calculate_average_quality(quality_scores)
+            if avg_quality is None:
+                avg_quality = self._calculate_average_quality(quality_scores)
             if avg_quality >= 0.8:
                 findings.append("知识质量整体优秀，达到行业领先水平")
             elif avg_quality >= 0.6:
@@ -1322,7 +1471,8 @@ overall_score = (accuracy * weight_accuracy +
                 findings.append("知识质量需要重点改进")
         
         if value_assessments:
-            avg_value = self._calculate_average_value(value_assessments)
+            if avg_value is None:
+                avg_value = self._calculate_average_value(value_assessments)
             if avg_value >= 0.7:
                 findings.append("知识价值显著，具有很强的应用潜力")
             elif avg_value >= 0.5:
@@ -1349,19 +1499,22 @@ overall_score = (accuracy * weight_accuracy +
         
         return trends
     
-    def _analyze_competitive_advantages(self, analysis_results: Dict[str, Any]) -> List[str]:
-        """分析竞争优势"""
+    def _analyze_competitive_advantages(self, analysis_results: Dict[str, Any],
+                                        avg_quality: float = None, avg_value: float = None) -> List[str]:
+        """分析竞争优势，可传入已计算的平均质量和平均价值"""
         advantages = []
         
         quality_scores = analysis_results.get('quality_scores', [])
         if quality_scores:
-            avg_quality = self._calculate_average_quality(quality_scores)
+            if avg_quality is None:
+                avg_quality = self._calculate_average_quality(quality_scores)
             if avg_quality >= 0.8:
                 advantages.append("质量优势明显，竞争力强")
         
         value_assessments = analysis_results.get('value_assessments', [])
         if value_assessments:
-            avg_value = self._calculate_average_value(value_assessments)
+            if avg_value is None:
+                avg_value = self._calculate_average_value(value_assessments)
             if avg_value >= 0.7:
                 advantages.append("价值创造能力突出")
         
@@ -1371,13 +1524,15 @@ overall_score = (accuracy * weight_accuracy +
         
         return advantages
     
-    def _assess_risks(self, analysis_results: Dict[str, Any]) -> List[Dict[str, str]]:
-        """评估风险"""
+    def _assess_risks(self, analysis_results: Dict[str, Any],
+                      avg_quality: float = None, avg_value: float = None) -> List[Dict[str, str]]:
+        """评估风险，可传入已计算的平均质量和平均价值"""
         risks = []
         
         quality_scores = analysis_results.get('quality_scores', [])
         if quality_scores:
-            avg_quality = self._calculate_average_quality(quality_scores)
+            if avg_quality is None:
+                avg_quality = self._calculate_average_quality(quality_scores)
             if avg_quality < 0.6:
                 risks.append({
                     'level': '高',
@@ -1388,7 +1543,8 @@ overall_score = (accuracy * weight_accuracy +
         
         value_assessments = analysis_results.get('value_assessments', [])
         if value_assessments:
-            avg_value = self._calculate_average_value(value_assessments)
+            if avg_value is None:
+                avg_value = self._calculate_average_value(value_assessments)
             if avg_value < 0.5:
                 risks.append({
                     'level': '中',
@@ -1451,8 +1607,11 @@ overall_score = (accuracy * weight_accuracy +
         }
         return weights.get(dimension, '0.15')
     
-    def _prepare_json_data(self, analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_json_data(self, analysis_results: Dict[str, Any],
+                           json_results: Dict[str, Any] = None) -> Dict[str, Any]:
         """准备JSON数据"""
+        model = self._get_report_model(analysis_results)
+        
         # 转换数据为JSON可序列化格式
         json_data = {
             'metadata': {
@@ -1461,12 +1620,12 @@ overall_score = (accuracy * weight_accuracy +
                 'analysis_type': 'knowledge_emergence'
             },
             'summary': {
-                'total_items': len(analysis_results.get('knowledge_items', [])),
-                'avg_quality': self._calculate_average_quality(analysis_results.get('quality_scores', [])),
-                'avg_value': self._calculate_average_value(analysis_results.get('value_assessments', [])),
-                'pattern_count': len(analysis_results.get('patterns', []))
+                'total_items': model.total_items,
+                'avg_quality': model.avg_quality,
+                'avg_value': model.avg_value,
+                'pattern_count': model.pattern_count
             },
-            'analysis_results': analysis_results
+            'analysis_results': json_results if json_results is not None else analysis_results
         }
         
         return json_data
@@ -1477,12 +1636,13 @@ overall_score = (accuracy * weight_accuracy +
         filled_template = template
         
         # 替换基本占位符
+        model = self._get_report_model(analysis_results)
         replacements = {
             '{timestamp}': datetime.now().strftime('%Y年%m月%d日 %H:%M'),
-            '{total_items}': str(len(analysis_results.get('knowledge_items', []))),
-            '{avg_quality}': f"{self._calculate_average_quality(analysis_results.get('quality_scores', [])):.3f}",
-            '{avg_value}': f"{self._calculate_average_value(analysis_results.get('value_assessments', [])):.3f}",
-            '{pattern_count}': str(len(analysis_results.get('patterns', [])))
+            '{total_items}': str(model.total_items),
+            '{avg_quality}': f"{model.avg_quality:.3f}",
+            '{avg_value}': f"{model.avg_value:.3f}",
+            '{pattern_count}': str(model.pattern_count)
         }
         
         for placeholder, value in replacements.items():
@@ -1506,12 +1666,13 @@ overall_score = (accuracy * weight_accuracy +
         html += "</table>"
         return html
     
-    def _generate_quality_html(self, quality_scores: List[Dict[str, Any]]) -> str:
+    def _generate_quality_html(self, quality_scores: List[Dict[str, Any]], avg_quality: float = None) -> str:
         """生成质量HTML"""
         if not quality_scores:
             return "<p>暂无质量数据</p>"
         
-        avg_quality = self._calculate_average_quality(quality_scores)
+        if avg_quality is None:
+            avg_quality = self._calculate_average_quality(quality_scores)
         
         html = f"""
         <p><strong>平均质量评分</strong>: {avg_quality:.3f}/1.000</p>
@@ -1522,12 +1683,13 @@ overall_score = (accuracy * weight_accuracy +
         
         return html
     
-    def _generate_value_html(self, value_assessments: List[Dict[str, Any]]) -> str:
+    def _generate_value_html(self, value_assessments: List[Dict[str, Any]], avg_value: float = None) -> str:
         """生成价值HTML"""
         if not value_assessments:
             return "<p>暂无价值数据</p>"
         
-        avg_value = self._calculate_average_value(value_assessments)
+        if avg_value is None:
+            avg_value = self._calculate_average_value(value_assessments)
         
         html = f"""
         <p><strong>平均价值评分</strong>: {avg_value:.3f}/1.000</p>
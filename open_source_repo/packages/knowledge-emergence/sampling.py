@@ -0,0 +1,164 @@
+"""
+分层抽样与置信区间
+单遍扫描语料，按来源和时间分层做蓄水池抽样；用分组删除刀切法（delete-a-group jackknife）估计样本指标的置信区间
+"""
+
+import math
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+from scipy import stats
+
+from document_cache import parse_collection_time
+
+
+# 时间分层的粒度
+TIME_BUCKET_FORMATS = {
+    'day': '%Y-%m-%d',
+    'week': '%G-W%V',
+    'month': '%Y-%m'
+}
+
+# 不计算置信区间的数值字段（随样本量确定的计数等）
+INTERVAL_IGNORED_KEYS = {'data_points'}
+
+
+class StratifiedReservoirSampler:
+    """按来源和时间分层的蓄水池抽样器
+
+    每个层单独维护一个蓄水池（Algorithm R），单遍扫描即可处理任意长度的数据流，无需预先知道各层大小；
+    取样时按各层实际条目数比例分配样本量（最大余数法取整），在各层蓄水池内再均匀抽取。
+    内存占用不超过 sample_size × 层数
+    """
+
+    def __init__(self, sample_size: int, time_bucket: str = 'month', seed: int = 42):
+        if time_bucket not in TIME_BUCKET_FORMATS:
+            raise ValueError(f"不支持的时间分层粒度: {time_bucket}")
+
+        self.sample_size = max(1, int(sample_size))
+        self.time_format = TIME_BUCKET_FORMATS[time_bucket]
+        self.rng = np.random.default_rng(seed)
+
+        # 层 -> [已见条目数, [(到达序号, 知识项), ...]]
+        self._strata: Dict[Tuple[str, str], List[Any]] = {}
+        self.seen = 0
+
+    def stratum_of(self, item: Dict[str, Any]) -> Tuple[str, str]:
+        """知识项所属的层：(来源, 时间段)，缺少时间的归入 unknown"""
+        collection_time = parse_collection_time(item.get('_collection_time', ''))
+        bucket = collection_time.strftime(self.time_format) if collection_time else 'unknown'
+        return str(item.get('_source', 'unknown')), bucket
+
+    def add(self, item: Dict[str, Any]):
+        """加入一个知识项"""
+        stratum = self._strata.setdefault(self.stratum_of(item), [0, []])
+        stratum[0] += 1
+        reservoir = stratum[1]
+
+        if len(reservoir) < self.sample_size:
+            reservoir.append((self.seen, item))
+        else:
+            slot = int(self.rng.integers(stratum[0]))
+            if slot < self.sample_size:
+                reservoir[slot] = (self.seen, item)
+        self.seen += 1
+
+    def extend(self, items: Iterable[Dict[str, Any]]):
+        """加入多个知识项"""
+        for item in items:
+            self.add(item)
+
+    def _allocate(self) -> Dict[Tuple[str, str], int]:
+        """按层大小比例分配样本量，最大余数法取整"""
+        total = min(self.sample_size, self.seen)
+        quotas = {key: total * stratum[0] / self.seen for key, stratum in self._strata.items()}
+        allocation = {key: int(quota) for key, quota in quotas.items()}
+
+        remainder = total - sum(allocation.values())
+        for key in sorted(quotas, key=lambda k: quotas[k] - allocation[k], reverse=True)[:remainder]:
+            allocation[key] += 1
+        return allocation
+
+    def sample(self, n_groups: int = 0) -> Tuple[List[Dict[str, Any]], Optional[np.ndarray]]:
+        """抽取分层样本，按到达顺序返回
+
+        n_groups 大于 1 时同时返回每个样本的刀切法分组编号：各层内随机轮流分配，使每组的层结构与整体一致
+        """
+        if not self.seen:
+            return [], None
+
+        entries = []
+        for key, count in self._allocate().items():
+            reservoir = self._strata[key][1]
+            chosen = self.rng.choice(len(reservoir), size=count, replace=False) if count < len(reservoir) \
+                else np.arange(len(reservoir))
+
+            offset = int(self.rng.integers(n_groups)) if n_groups > 1 else 0
+            for rank, index in enumerate(self.rng.permutation(chosen)):
+                entries.append((reservoir[index][0], reservoir[index][1],
+                                (offset + rank) % n_groups if n_groups > 1 else 0))
+
+        entries.sort(key=lambda entry: entry[0])
+        items = [entry[1] for entry in entries]
+        groups = np.array([entry[2] for entry in entries], dtype=np.int64) if n_groups > 1 else None
+        return items, groups
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取抽样统计，包括各层条目数和分配的样本量"""
+        allocation = self._allocate() if self.seen else {}
+        return {
+            'items_seen': self.seen,
+            'sample_size': sum(allocation.values()),
+            'sampling_fraction': round(sum(allocation.values()) / self.seen, 6) if self.seen else 0,
+            'strata_count': len(self._strata),
+            'strata': [
+                {'source': key[0], 'time_bucket': key[1], 'items': stratum[0], 'sampled': allocation[key]}
+                for key, stratum in sorted(self._strata.items())
+            ]
+        }
+
+
+def flatten_numeric(value: Any, prefix: str = '') -> Dict[str, float]:
+    """展开嵌套字典中的数值字段，键为点分路径；列表、字符串和布尔值跳过"""
+    flattened = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in INTERVAL_IGNORED_KEYS:
+                continue
+            flattened.update(flatten_numeric(item, f"{prefix}.{key}" if prefix else str(key)))
+    elif isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_)):
+        if math.isfinite(value):
+            flattened[prefix] = float(value)
+    return flattened
+
+
+def jackknife_intervals(estimate: Dict[str, Any], replicates: List[Dict[str, Any]],
+                        confidence_level: float = 0.95) -> Dict[str, Dict[str, float]]:
+    """分组删除刀切法置信区间
+
+    estimate 为全样本上的结果，replicates 为依次删去每组样本后的结果（结构相同的嵌套字典）。
+    标准误 se = sqrt((k-1)/k * Σ(θ_g - θ̄)²)，区间为 estimate ± t(k-1) * se；
+    只在部分复制样本中出现的字段不计算区间
+    """
+    k = len(replicates)
+    if k < 2:
+        return {}
+
+    flat_replicates = [flatten_numeric(replicate) for replicate in replicates]
+    t_value = float(stats.t.ppf((1 + confidence_level) / 2, k - 1))
+
+    intervals = {}
+    for path, value in flatten_numeric(estimate).items():
+        values = [replicate.get(path) for replicate in flat_replicates]
+        if any(v is None for v in values):
+            continue
+
+        values = np.asarray(values)
+        std_error = math.sqrt((k - 1) / k * float(((values - values.mean()) ** 2).sum()))
+        intervals[path] = {
+            'estimate': round(value, 6),
+            'std_error': round(std_error, 6),
+            'lower': round(value - t_value * std_error, 6),
+            'upper': round(value + t_value * std_error, 6)
+        }
+    return intervals
@@ -0,0 +1,185 @@
+"""
+分析阶段执行器
+按依赖关系组成有向无环图，互不依赖的阶段可在线程池中并发执行，并记录各阶段耗时
+
+线程受 GIL 限制：纯 Python 的计算阶段并发执行时仍然轮流占用解释器，总耗时与串行相近，
+只有 I/O 和 numpy/scipy 等释放 GIL 的部分能够重叠。CPU 密集的并行应使用各模块的多进程接口
+"""
+
+import time
+import logging
+from typing import Dict, List, Any, Callable, Optional, Sequence
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+@dataclass
+class Stage:
+    """分析阶段"""
+    name: str
+    func: Callable[..., Any]
+    depends_on: Sequence[str] = ()
+    # 必须在调用 run() 的线程中执行（例如使用 pyplot 的阶段）
+    main_thread: bool = False
+
+
+@dataclass
+class StageTiming:
+    """阶段执行记录"""
+    name: str
+    started_at: float
+    finished_at: float
+    wall_time: float
+    status: str
+
+
+class StageExecutor:
+    """基于依赖图的阶段执行器
+
+    阶段函数以关键字参数接收其依赖阶段的结果，例如依赖 metrics 的阶段以 func(metrics=...) 调用
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, parallel: bool = False):
+        self.max_workers = max_workers
+        self.parallel = parallel
+        self.logger = logging.getLogger(__name__)
+
+        self.stages: Dict[str, Stage] = {}
+        self.timings: Dict[str, StageTiming] = {}
+        self.total_time = 0.0
+
+    def add_stage(self, name: str, func: Callable[..., Any], depends_on: Sequence[str] = (),
+                  main_thread: bool = False):
+        """添加阶段，依赖的阶段需先添加；main_thread 为 True 的阶段并发模式下也在调用线程中执行"""
+        if name in self.stages:
+            raise ValueError(f"阶段重复: {name}")
+
+        missing = [dep for dep in depends_on if dep not in self.stages]
+        if missing:
+            raise ValueError(f"阶段 {name} 依赖未定义的阶段: {missing}")
+
+        self.stages[name] = Stage(name=name, func=func, depends_on=tuple(depends_on), main_thread=main_thread)
+
+    def run(self) -> Dict[str, Any]:
+        """执行全部阶段，返回各阶段结果
+
+        任一阶段抛出异常时不再提交新阶段，等待已运行的阶段结束后重新抛出该异常
+        """
+        self.timings = {}
+        start = time.perf_counter()
+
+        try:
+            if self.parallel and self._resolve_workers() > 1:
+                return self._run_parallel(start)
+            return self._run_serial(start)
+        finally:
+            self.total_time = time.perf_counter() - start
+
+    def _resolve_workers(self) -> int:
+        """并发线程数，默认不超过阶段数"""
+        return max(1, min(self.max_workers or len(self.stages), len(self.stages)))
+
+    def _run_serial(self, start: float) -> Dict[str, Any]:
+        """按添加顺序依次执行"""
+        results = {}
+        for stage in self.stages.values():
+            results[stage.name] = self._run_stage(stage, results, start)
+        return results
+
+    def _run_parallel(self, start: float) -> Dict[str, Any]:
+        """依赖满足后立即提交阶段，需要在调用线程中执行的阶段在其他阶段提交后就地执行"""
+        results = {}
+        pending = dict(self.stages)
+        running = {}
+        error = None
+
+        with ThreadPoolExecutor(max_workers=self._resolve_workers(),
+                                thread_name_prefix='stage') as executor:
+            while pending or running:
+                if error is None:
+                    ready = [stage for stage in pending.values()
+                             if all(dep in results for dep in stage.depends_on)]
+                    for stage in ready:
+                        del pending[stage.name]
+                        if not stage.main_thread:
+                            future = executor.submit(self._run_stage, stage, results, start)
+                            running[future] = stage.name
+
+                    for stage in ready:
+                        if stage.main_thread and error is None:
+                            try:
+                                results[stage.name] = self._run_stage(stage, results, start)
+                            except Exception as e:
+                                error = e
+
+                    if any(stage.main_thread for stage in ready):
+                        continue
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        if error is None:
+                            error = e
+
+        if error is not None:
+            raise error
+
+        return results
+
+    def _run_stage(self, stage: Stage, results: Dict[str, Any], start: float) -> Any:
+        """执行单个阶段并记录耗时"""
+        kwargs = {dep: results[dep] for dep in stage.depends_on}
+        stage_start = time.perf_counter()
+        status = 'success'
+
+        try:
+            return stage.func(**kwargs)
+        except Exception:
+            status = 'error'
+            raise
+        finally:
+            stage_end = time.perf_counter()
+            self.timings[stage.name] = StageTiming(
+                name=stage.name,
+                started_at=stage_start - start,
+                finished_at=stage_end - start,
+                wall_time=stage_end - stage_start,
+                status=status
+            )
+            self.logger.info(f"阶段 {stage.name} 完成，耗时 {stage_end - stage_start:.3f}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取各阶段耗时统计
+
+        critical_path_time 为依赖链上耗时之和的最大值，即并发执行时的理论下限
+        """
+        finish = {}
+        for stage in self.stages.values():
+            timing = self.timings.get(stage.name)
+            own = timing.wall_time if timing else 0.0
+            finish[stage.name] = own + max((finish[dep] for dep in stage.depends_on), default=0.0)
+
+        stage_time = sum(timing.wall_time for timing in self.timings.values())
+
+        return {
+            'parallel': self.parallel and self._resolve_workers() > 1,
+            'workers': self._resolve_workers() if self.parallel else 1,
+            'total_time': round(self.total_time, 4),
+            'sum_stage_time': round(stage_time, 4),
+            'critical_path_time': round(max(finish.values(), default=0.0), 4),
+            'stages': {
+                name: {
+                    'wall_time': round(timing.wall_time, 4),
+                    'started_at': round(timing.started_at, 4),
+                    'finished_at': round(timing.finished_at, 4),
+                    'status': timing.status
+                }
+                for name, timing in self.timings.items()
+            }
+        }
@@ -0,0 +1,354 @@
+"""
+增量分析状态存储
+以 _data_hash 为键，在 SQLite 中持久化知识项的首次采集时间、评估结果和指标累加器
+"""
+
+import json
+import sqlite3
+import logging
+import threading
+from functools import wraps
+from typing import Dict, List, Any, Optional, Set, Tuple, Iterable
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from data_collector import compute_data_hash
+
+
+def item_key(knowledge_item: Dict[str, Any]) -> str:
+    """获取知识项在状态库中的键，即不含以下划线开头字段的内容哈希 _data_hash
+
+    重新采集同一内容得到相同的键；采集时间由 assign_first_seen_times 固定为首次采集的时间
+    """
+    return knowledge_item.get('_data_hash') or compute_data_hash(knowledge_item)
+
+
+def _to_json(value: Any) -> str:
+    """序列化评估结果，兼容 numpy 数值类型"""
+    def default(obj):
+        if hasattr(obj, 'item'):
+            return obj.item()
+        if hasattr(obj, 'tolist'):
+            return obj.tolist()
+        return str(obj)
+
+    return json.dumps(value, ensure_ascii=False, default=default)
+
+
+def _synchronized(method):
+    """串行化对状态库的访问，供并发执行的分析阶段共享同一连接"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class AnalysisStateStore:
+    """增量分析状态库"""
+
+    RESULT_TABLES = ('item_quality', 'item_value')
+
+    # 键或已保存字段的含义变化时递增，打开旧版本的状态库时清空已保存的状态
+    SCHEMA_VERSION = 3
+
+    # SQLite 单条语句的参数数量有限，分块查询
+    QUERY_CHUNK_SIZE = 500
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._create_tables()
+        self._check_schema_version()
+
+        # 本次运行统计
+        self.stats = {}
+
+    def _create_tables(self):
+        """创建状态表"""
+        with self.conn:
+            for table in self.RESULT_TABLES:
+                self.conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        data_hash TEXT PRIMARY KEY,
+                        payload TEXT NOT NULL,
+                        time_signature TEXT,
+                        updated_at TEXT
+                    )
+                """)
+
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS item_times (
+                    data_hash TEXT PRIMARY KEY,
+                    collection_time TEXT NOT NULL
+                )
+            """)
+
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS item_metrics (
+                    data_hash TEXT PRIMARY KEY,
+                    occurrences INTEGER NOT NULL,
+                    complexity REAL,
+                    impact REAL,
+                    topics TEXT NOT NULL,
+                    updated_at TEXT
+                )
+            """)
+
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS accumulators (
+                    name TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL
+                )
+            """)
+
+    def _check_schema_version(self):
+        """状态库版本与当前不一致时清空已保存的状态"""
+        row = self.conn.execute("SELECT payload FROM accumulators WHERE name = 'schema_version'").fetchone()
+        if row and json.loads(row[0]) == self.SCHEMA_VERSION:
+            return
+
+        if row or self.conn.execute("SELECT 1 FROM item_metrics LIMIT 1").fetchone():
+            self.logger.info("增量状态库版本已变化，清空已保存的状态")
+
+        # 各版本的表结构可能不同，删除后重建
+        with self.conn:
+            for table in self.RESULT_TABLES + ('item_times', 'item_metrics', 'accumulators'):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self._create_tables()
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO accumulators (name, payload) VALUES ('schema_version', ?)",
+                (json.dumps(self.SCHEMA_VERSION),)
+            )
+
+    def _chunks(self, keys: Iterable[str]) -> Iterable[List[str]]:
+        """按块切分键"""
+        keys = list(keys)
+        for i in range(0, len(keys), self.QUERY_CHUNK_SIZE):
+            yield keys[i:i + self.QUERY_CHUNK_SIZE]
+
+    def _record(self, table: str, **counts):
+        """累计本次运行的统计"""
+        table_stats = self.stats.setdefault(table, {'reused': 0, 'expired': 0, 'computed': 0, 'removed': 0})
+        for name, count in counts.items():
+            table_stats[name] += count
+
+    # 首次采集时间
+
+    @_synchronized
+    def assign_first_seen_times(self, knowledge_items: List[Dict[str, Any]]) -> int:
+        """把知识项的 _collection_time 固定为同一内容首次采集的时间，返回首次出现的内容数
+
+        采集器每次采集都把 _collection_time 设为当前时间，重新采集同一内容时改用状态库中记录的时间，
+        时效性评分和时间模式随内容的实际存续时间变化；不在本次语料中的内容删除其记录
+        """
+        keys = [item_key(item) for item in knowledge_items]
+        known = {}
+        for chunk in self._chunks(set(keys)):
+            placeholders = ','.join('?' * len(chunk))
+            known.update(self.conn.execute(
+                f"SELECT data_hash, collection_time FROM item_times WHERE data_hash IN ({placeholders})",
+                chunk
+            ))
+
+        first_seen = {}
+        for key, item in zip(keys, knowledge_items):
+            collection_time = known.get(key) or first_seen.get(key)
+            if collection_time is None:
+                collection_time = item.get('_collection_time')
+                if not collection_time:
+                    continue
+                first_seen[key] = collection_time
+            item['_collection_time'] = collection_time
+
+        current = set(keys)
+        stale = [key for (key,) in self.conn.execute("SELECT data_hash FROM item_times") if key not in current]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO item_times (data_hash, collection_time) VALUES (?, ?)",
+                list(first_seen.items())
+            )
+            for chunk in self._chunks(stale):
+                placeholders = ','.join('?' * len(chunk))
+                self.conn.execute(f"DELETE FROM item_times WHERE data_hash IN ({placeholders})", chunk)
+
+        self._record('item_times', reused=len(known), computed=len(first_seen), removed=len(stale))
+        return len(first_seen)
+
+    # 单项评估结果
+
+    @_synchronized
+    def load_results(self, table: str, keys: Iterable[str],
+                     time_signatures: Dict[str, Any] = None) -> Dict[str, Any]:
+        """加载已保存的评估结果
+
+        评估结果中只有时效性相关的部分随当前时间变化：给出 time_signatures（键 -> 该部分的当前取值）时，
+        与保存时的取值不同的结果视为过期，不再复用；取值相同的结果无论间隔多少天都与重新评估一致
+        """
+        results = {}
+        expired = 0
+
+        for chunk in self._chunks(set(keys)):
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT data_hash, payload, time_signature FROM {table} WHERE data_hash IN ({placeholders})",
+                chunk
+            )
+            for data_hash, payload, time_signature in rows:
+                if time_signatures is not None and time_signature != _to_json(time_signatures.get(data_hash)):
+                    expired += 1
+                    continue
+                results[data_hash] = json.loads(payload)
+
+        self._record(table, reused=len(results), expired=expired)
+        return results
+
+    @_synchronized
+    def save_results(self, table: str, results: Dict[str, Any], time_signatures: Dict[str, Any] = None):
+        """保存新的评估结果及评估时时效性相关部分的取值"""
+        now = datetime.now().isoformat()
+        time_signatures = time_signatures or {}
+
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (data_hash, payload, time_signature, updated_at) "
+                f"VALUES (?, ?, ?, ?)",
+                [(data_hash, _to_json(payload), _to_json(time_signatures.get(data_hash)), now)
+                 for data_hash, payload in results.items()]
+            )
+
+        self._record(table, computed=len(results))
+
+    @_synchronized
+    def prune_results(self, table: str, current_keys: Set[str]) -> int:
+        """删除已不在语料中的知识项结果"""
+        stale = [key for key in self._load_keys(table) if key not in current_keys]
+
+        with self.conn:
+            for chunk in self._chunks(stale):
+                placeholders = ','.join('?' * len(chunk))
+                self.conn.execute(f"DELETE FROM {table} WHERE data_hash IN ({placeholders})", chunk)
+
+        self._record(table, removed=len(stale))
+        return len(stale)
+
+    def _load_keys(self, table: str) -> List[str]:
+        """加载表中的全部键"""
+        return [row[0] for row in self.conn.execute(f"SELECT data_hash FROM {table}")]
+
+    # 指标累加器
+
+    @_synchronized
+    def get_accumulator(self, name: str, default: Any = None) -> Any:
+        """读取指标累加器"""
+        row = self.conn.execute("SELECT payload FROM accumulators WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    @_synchronized
+    def set_accumulator(self, name: str, value: Any):
+        """保存指标累加器"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO accumulators (name, payload) VALUES (?, ?)",
+                (name, _to_json(value))
+            )
+
+    @_synchronized
+    def load_metric_occurrences(self) -> Dict[str, int]:
+        """加载已记录指标的知识项及其出现次数"""
+        return dict(self.conn.execute("SELECT data_hash, occurrences FROM item_metrics"))
+
+    @_synchronized
+    def sync_item_metrics(self, new_items: Dict[str, Tuple[Optional[float], float, Counter]],
+                          occurrences: Counter) -> Counter:
+        """写入新知识项的指标，并根据新增、删除和出现次数变化更新主题词频累加器
+
+        new_items: 键 -> (复杂性, 不含时间因子的影响力, 主题词频)
+        occurrences: 当前语料中每个键的出现次数
+        """
+        known = self.load_metric_occurrences()
+        topic_totals = Counter(self.get_accumulator('topic_counts', {}))
+        now = datetime.now().isoformat()
+
+        # 需要调整累加器的已知项：已删除或出现次数变化
+        deltas = {
+            key: occurrences.get(key, 0) - count
+            for key, count in known.items()
+            if occurrences.get(key, 0) != count
+        }
+
+        with self.conn:
+            for chunk in self._chunks(deltas):
+                placeholders = ','.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT data_hash, topics FROM item_metrics WHERE data_hash IN ({placeholders})",
+                    chunk
+                )
+                for data_hash, topics in rows:
+                    delta = deltas[data_hash]
+                    for topic, count in json.loads(topics).items():
+                        topic_totals[topic] += count * delta
+
+            removed = [key for key, delta in deltas.items() if occurrences.get(key, 0) == 0]
+            changed = [(occurrences[key], key) for key in deltas if occurrences.get(key, 0) > 0]
+
+            for chunk in self._chunks(removed):
+                placeholders = ','.join('?' * len(chunk))
+                self.conn.execute(f"DELETE FROM item_metrics WHERE data_hash IN ({placeholders})", chunk)
+            self.conn.executemany("UPDATE item_metrics SET occurrences = ? WHERE data_hash = ?", changed)
+
+            rows = []
+            for key, (complexity, impact, topics) in new_items.items():
+                count = occurrences.get(key, 1)
+                for topic, topic_count in topics.items():
+                    topic_totals[topic] += topic_count * count
+                rows.append((key, count, complexity, impact, _to_json(dict(topics)), now))
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO item_metrics "
+                "(data_hash, occurrences, complexity, impact, topics, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+        topic_totals = Counter({topic: count for topic, count in topic_totals.items() if count > 0})
+        self.set_accumulator('topic_counts', topic_totals)
+
+        self._record('item_metrics', reused=len(known) - len(removed),
+                     computed=len(new_items), removed=len(removed))
+        return topic_totals
+
+    @_synchronized
+    def load_item_metrics(self, keys: Iterable[str]) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+        """加载知识项已保存的复杂性和不含时间因子的影响力：键 -> (复杂性, 影响力)"""
+        values = {}
+
+        for chunk in self._chunks(set(keys)):
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT data_hash, complexity, impact FROM item_metrics WHERE data_hash IN ({placeholders})",
+                chunk
+            )
+            for data_hash, complexity, impact in rows:
+                values[data_hash] = (complexity, impact)
+
+        return values
+
+    @_synchronized
+    def get_stats(self) -> Dict[str, Any]:
+        """获取本次运行的增量统计"""
+        return {
+            'db_path': str(self.db_path),
+            'tables': {table: dict(counts) for table, counts in self.stats.items()}
+        }
+
+    @_synchronized
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
@@ -0,0 +1,39 @@
+"""
+批量分析测试用例
+测试 batch_analysis 在任何配置下都串行执行并返回完整分析结果
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import KnowledgeEmergenceAnalyzer
+
+
+class TestBatchAnalysis:
+    """批量分析测试"""
+
+    def test_returns_full_results_even_when_batch_parallel(self, tmp_path, monkeypatch):
+        """启用 performance.batch_parallel 时 batch_analysis 仍返回 analyze 的完整结果"""
+        monkeypatch.chdir(tmp_path)
+        analyzer = KnowledgeEmergenceAnalyzer()
+        analyzer.config['performance']['batch_parallel'] = True
+
+        def analyze(data_source, output_dir=None):
+            if data_source == 'broken.json':
+                raise ValueError('无法读取')
+            return {'status': 'success', 'data_source': data_source, 'quality_scores': [{'overall_score': 0.5}]}
+
+        def batch_analysis_parallel(*args, **kwargs):
+            raise AssertionError('batch_analysis 不应转为并行批量分析')
+
+        monkeypatch.setattr(analyzer, 'analyze', analyze)
+        monkeypatch.setattr(analyzer, 'batch_analysis_parallel', batch_analysis_parallel)
+
+        results = analyzer.batch_analysis(['a.json', 'broken.json'], str(tmp_path / 'out'))
+
+        assert results == [
+            analyze('a.json'),
+            {'status': 'error', 'data_source': 'broken.json', 'error': '无法读取'}
+        ]
@@ -0,0 +1,161 @@
+"""
+列式存储测试用例
+测试知识项经 Parquet 和 Arrow IPC 读写后与 JSON 读写的结果一致，以及按列读取的结果重新生成的报告与读取完整记录时一致
+"""
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('pyarrow')
+
+from benchmark import generate_synthetic_corpus
+from columnar_store import (
+    RecordTable, format_for_path, iter_record_batches, read_records, read_table, write_records
+)
+from data_collector import DataCollector
+from main import KnowledgeEmergenceAnalyzer
+from report_generator import ReportGenerator
+
+FORMATS = ['parquet', 'arrow']
+
+RECORDS = [
+    {'title': '知识涌现', 'content': '研究 数据', 'score': 0.5, 'count': 3, 'valid': True,
+     'tags': ['a', 'b'], 'meta': {'source': 'web', 'depth': 2}, 'big': 2 ** 70},
+    {'title': 'second', 'content': '', 'score': None, 'count': -1, 'valid': False,
+     'tags': [], 'meta': None, 'big': 1, 'extra': 'only here'},
+    {'title': None, 'score': 1.25, 'count': 0, 'tags': ['c'], 'meta': {}, 'big': None, 'mixed': 'text'},
+    {'title': 'fourth', 'content': 'x', 'mixed': [1, 2], 'empty': None}
+]
+
+
+def json_round_trip(records):
+    return json.loads(json.dumps(records, ensure_ascii=False))
+
+
+class TestColumnarStore:
+    """列式存储读写测试"""
+
+    @pytest.mark.parametrize("format", FORMATS)
+    def test_round_trip_matches_json(self, tmp_path, format):
+        """嵌套字段、超出 int64 的整数、空值和部分记录缺失的键读回后与 JSON 读写一致"""
+        path = write_records(RECORDS, str(tmp_path / f'items.{format}'))
+
+        assert format_for_path(path) == format
+        assert read_records(path) == json_round_trip(RECORDS)
+
+    @pytest.mark.parametrize("format", FORMATS)
+    def test_batches_match_full_read(self, tmp_path, format):
+        """按批写入和流式读取的结果与一次读取一致"""
+        corpus = generate_synthetic_corpus(250, seed=0)
+        path = write_records(corpus, str(tmp_path / f'corpus.{format}'), batch_size=64)
+
+        batches = list(iter_record_batches(path, batch_size=100))
+
+        assert [record for batch in batches for record in batch] == read_records(path) == json_round_trip(corpus)
+        assert all(len(batch) <= 100 for batch in batches)
+
+    @pytest.mark.parametrize("format", FORMATS)
+    def test_column_types(self, tmp_path, format):
+        """标量列保存为对应的 Arrow 类型，嵌套和混合类型列保存为 JSON 字符串；整数与浮点混合的列读回为浮点"""
+        path = write_records(RECORDS + [{'count': 1.5}], str(tmp_path / f'items.{format}'))
+        schema = read_table(path).schema
+
+        assert str(schema.field('title').type) == 'large_string'
+        assert str(schema.field('valid').type) == 'bool'
+        assert str(schema.field('score').type) == 'double'
+        assert str(schema.field('empty').type) == 'null'
+        assert str(schema.field('tags').type) == 'large_string'
+        assert [record.get('count') for record in read_records(path)] == [3.0, -1.0, 0.0, None, 1.5]
+        assert read_records(path, columns=['title']) == \
+            [{'title': '知识涌现'}, {'title': 'second'}, {'title': None}, {'title': 'fourth'}, {}]
+
+    @pytest.mark.parametrize("format", FORMATS)
+    def test_record_table_and_column_projection(self, tmp_path, format):
+        """RecordTable 按批遍历的记录与完整读取一致，按列读取时忽略不存在的列并保留缺失的键"""
+        path = write_records(RECORDS, str(tmp_path / f"records.{format}"), format)
+
+        table = RecordTable(path, batch_size=3)
+        assert len(table) == len(RECORDS)
+        assert list(table) == list(table) == read_records(path)
+
+        projected = [{key: record[key] for key in ('title', 'score') if key in record}
+                     for record in json_round_trip(RECORDS)]
+        columns = ['title', 'score', 'not_a_column']
+        assert read_records(path, columns=columns) == projected
+        assert [record for batch in iter_record_batches(path, batch_size=3, columns=columns)
+                for record in batch] == projected
+        assert list(RecordTable(path, columns=columns)) == projected
+
+    def test_unsupported_format(self, tmp_path):
+        """不支持的格式报错"""
+        with pytest.raises(ValueError):
+            write_records(RECORDS, str(tmp_path / 'items.bin'), format='orc')
+        assert format_for_path('items.json') is None
+
+
+class TestCollectorColumnarFiles:
+    """数据采集器的列式文件读写测试"""
+
+    @pytest.mark.parametrize("format", FORMATS)
+    def test_collector_matches_json_file(self, tmp_path, format):
+        """保存为列式文件后采集和流式采集的结果与 JSON 文件相同"""
+        corpus = generate_synthetic_corpus(120, seed=1)
+        collector = DataCollector({})
+        collector.save_data(corpus, str(tmp_path / 'items.json'), 'json')
+        collector.save_data(corpus, str(tmp_path / f'items.{format}'), format)
+
+        expected = collector.collect_from_file(str(tmp_path / 'items.json'))
+        assert collector.collect_from_file(str(tmp_path / f'items.{format}')) == expected
+
+        streamed = [item for batch in collector.iter_file_batches(str(tmp_path / f'items.{format}'), batch_size=50)
+                    for item in batch]
+        reference = [item for batch in collector.iter_file_batches(str(tmp_path / 'items.json'), batch_size=50)
+                     for item in batch]
+        assert streamed == reference
+
+
+def without_timestamps(text):
+    """去掉报告中的生成时间"""
+    text = re.sub(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?', '<time>', text)
+    return re.sub(r'\d{4}年\d{2}月\d{2}日 \d{2}:\d{2}', '<time>', text)
+
+
+class TestReportRegeneration:
+    """由列式存储的分析结果重新生成报告的测试"""
+
+    @pytest.mark.parametrize("format", FORMATS)
+    def test_projected_reports_match_full_records(self, tmp_path, monkeypatch, format):
+        """只读取汇总所需的列重新生成的报告与读取完整记录生成的报告一致"""
+        monkeypatch.chdir(tmp_path)
+        data_file = tmp_path / 'corpus.json'
+        data_file.write_text(json.dumps(generate_synthetic_corpus(60, seed=5), ensure_ascii=False),
+                             encoding='utf-8')
+
+        analyzer = KnowledgeEmergenceAnalyzer()
+        analyzer.config['output']['results_format'] = format
+        analyzer._generate_visualizations = lambda analysis_data: []
+        analyzer._generate_reports = lambda analysis_data, json_results=None: []
+        results = analyzer.analyze(str(data_file), output_dir=str(tmp_path / 'run'))
+        results_file = results['results_file']
+        del analyzer._generate_reports
+
+        full = ReportGenerator({'output_dir': str(tmp_path / 'full')}).generate_batch_reports(
+            analyzer.load_analysis_results(results_file)
+        )
+        regenerated = analyzer.regenerate_reports(results_file, output_dir=str(tmp_path / 'regenerated'))
+
+        assert regenerated['status'] == 'success'
+        assert regenerated['knowledge_items_count'] == 60
+        assert sorted(Path(path).name for path in regenerated['report_files']) == \
+            sorted(Path(path).name for path in full)
+        for path in full:
+            expected = Path(path).read_text(encoding='utf-8')
+            actual = (tmp_path / 'regenerated' / 'reports' / Path(path).name).read_text(encoding='utf-8')
+            assert without_timestamps(actual) == without_timestamps(expected)
@@ -0,0 +1,72 @@
+"""
+概念关联测试用例
+固定按知识项去重后的共现计数，并与逐项计数的参考实现比较
+"""
+
+import os
+import random
+import sys
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pattern_recognizer import PatternRecognizer
+
+CORPUS = [
+    {'content': 'alpha alpha beta', 'title': ''},
+    {'content': 'alpha beta gamma', 'title': ''},
+    {'content': 'beta gamma alpha', 'title': ''},
+    {'content': 'gamma beta', 'title': ''},
+    {'content': 'delta delta delta epsilon', 'title': ''}
+]
+
+
+def associations(patterns):
+    return [(p.metadata['concept1'], p.metadata['concept2'], int(p.supporting_evidence[0].split(': ')[1]))
+            for p in patterns]
+
+
+def reference_associations(knowledge_items, min_count=3):
+    """统计同时包含两个概念的知识项数"""
+    counts = Counter()
+    for item in knowledge_items:
+        text = item.get('content', '') + ' ' + item.get('title', '')
+        concepts = sorted({word.lower() for word in text.split() if len(word) > 3 and word.isalpha()})
+        counts.update(combinations(concepts, 2))
+    return sorted((a, b, count) for (a, b), count in counts.items() if count >= min_count)
+
+
+class TestConceptAssociations:
+    """概念关联测试"""
+
+    def test_counts_items_not_token_pairs(self):
+        """共现次数为知识项数：知识项内重复的词不重复计数，只靠重复词达到阈值的概念对不再输出
+
+        逐词对计数时 alpha–beta 为 4、delta–epsilon 为 3，按知识项计数分别为 3 和 1
+        """
+        patterns = PatternRecognizer({})._detect_concept_associations(CORPUS)
+
+        assert associations(patterns) == [('alpha', 'beta', 3), ('beta', 'gamma', 3)]
+        assert [p.confidence for p in patterns] == [0.3, 0.3]
+
+    def test_lift_scoring(self):
+        """提升度 = 知识项数 × 共现数 / (两个概念各自出现的知识项数之积)"""
+        patterns = PatternRecognizer({'association_scoring': 'lift'})._detect_concept_associations(CORPUS)
+
+        assert associations(patterns) == [('alpha', 'beta', 3), ('beta', 'gamma', 3)]
+        assert [p.metadata['lift'] for p in patterns] == [1.25, 1.25]
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_matches_item_count_reference(self, seed):
+        """随机语料上与逐项统计的结果和顺序一致"""
+        rng = random.Random(seed)
+        vocabulary = [f"term{chr(97 + i)}" for i in range(15)]
+        items = [{'content': ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(1, 8))), 'title': ''}
+                 for _ in range(80)]
+
+        patterns = PatternRecognizer({})._detect_concept_associations(items)
+
+        assert associations(patterns) == reference_associations(items)
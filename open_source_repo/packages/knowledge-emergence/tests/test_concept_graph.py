@@ -0,0 +1,105 @@
+"""
+概念网络测试用例
+测试 CSR 概念网络的边、出度和局部聚类系数与字典邻接表的逐节点实现一致
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concept_graph import ConceptGraph
+
+
+def reference_network(concept_lists):
+    """逐对连接同一知识项中先后出现的概念的字典邻接表"""
+    network = {}
+    for concepts in concept_lists:
+        for i, concept1 in enumerate(concepts):
+            for concept2 in concepts[i + 1:]:
+                network.setdefault(concept1, set()).add(concept2)
+    return network
+
+
+def reference_clustering(network):
+    """出度不小于 2 的节点的局部聚类系数，按节点名排序"""
+    coefficients = {}
+    for node, neighbors in network.items():
+        if len(neighbors) < 2:
+            continue
+        connections = sum(1 for n1 in neighbors for n2 in neighbors
+                          if n1 < n2 and n2 in network.get(n1, ()))
+        coefficients[node] = connections / (len(neighbors) * (len(neighbors) - 1) / 2)
+    return dict(sorted(coefficients.items()))
+
+
+def random_concept_lists(seed, n_items=200, vocabulary_size=40):
+    """带重复概念的随机概念序列，少数高频概念形成高出度节点"""
+    rng = random.Random(seed)
+    vocabulary = [f"concept{i:02d}" for i in range(vocabulary_size)]
+    weights = [1.0 / (i + 1) for i in range(vocabulary_size)]
+    return [rng.choices(vocabulary, weights=weights, k=rng.randint(0, 12)) for _ in range(n_items)]
+
+
+def graph_edges(graph):
+    coo = graph.adjacency.tocoo()
+    return {(graph.nodes[row], graph.nodes[col]) for row, col in zip(coo.row, coo.col)}
+
+
+def graph_clustering(graph, **kwargs):
+    eligible = graph.out_degrees() >= 2
+    names = [node for node, keep in zip(graph.nodes, eligible) if keep]
+    return dict(zip(names, graph.local_clustering(**kwargs).tolist()))
+
+
+class TestConceptGraph:
+    """概念网络测试"""
+
+    def test_edges_include_self_loops(self):
+        """先出现的概念指向后出现的概念，重复出现的概念带自环，节点按字母序编号"""
+        graph = ConceptGraph.from_concept_lists([['beta', 'alpha', 'beta'], ['gamma'], ['gamma', 'alpha']])
+
+        assert graph.nodes == ['alpha', 'beta', 'gamma']
+        assert graph_edges(graph) == {('beta', 'alpha'), ('beta', 'beta'), ('alpha', 'beta'),
+                                      ('gamma', 'alpha')}
+        assert graph.out_degrees().tolist() == [1, 2, 1]
+
+    def test_empty_graph(self):
+        """没有任何知识项包含两个概念时网络为空"""
+        graph = ConceptGraph.from_concept_lists([[], ['alpha']])
+
+        assert not graph
+        assert graph.local_clustering().tolist() == []
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_matches_dict_network(self, seed):
+        """边集合、出度和聚类系数与字典邻接表一致"""
+        concept_lists = random_concept_lists(seed)
+        network = reference_network(concept_lists)
+        graph = ConceptGraph.from_concept_lists(concept_lists)
+
+        assert graph_edges(graph) == {(u, v) for u, neighbors in network.items() for v in neighbors}
+        degrees = dict(zip(graph.nodes, graph.out_degrees().tolist()))
+        assert {node: degree for node, degree in degrees.items() if degree} == \
+            {node: len(neighbors) for node, neighbors in network.items()}
+
+        expected = reference_clustering(network)
+        actual = graph_clustering(graph)
+        assert list(actual) == list(expected)
+        assert np.allclose(list(actual.values()), list(expected.values()))
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_chunking_does_not_change_results(self, seed):
+        """边的分批合并和聚类检验的分块大小不影响结果"""
+        concept_lists = random_concept_lists(seed)
+        graph = ConceptGraph.from_concept_lists(concept_lists)
+        merged = ConceptGraph.from_concept_lists(concept_lists, merge_threshold=5)
+
+        assert merged.nodes == graph.nodes
+        assert (merged.adjacency != graph.adjacency).nnz == 0
+        assert graph_clustering(graph, max_tests=1) == graph_clustering(graph)
+        assert graph_clustering(graph, max_tests=7) == graph_clustering(graph)
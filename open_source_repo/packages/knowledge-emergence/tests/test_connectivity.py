@@ -0,0 +1,76 @@
+"""
+连接性指标测试用例
+测试稀疏矩阵计算与逐对比较的结果一致，以及常见概念上限的有损行为
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics_calculator import MetricsCalculator
+
+
+def pairwise_connectivity(knowledge_items):
+    """逐对比较知识项词集合的参考实现"""
+    word_sets = [
+        set(word.lower() for word in (item.get('content', '') + ' ' + item.get('title', '')).split() if len(word) > 3)
+        for item in knowledge_items
+    ]
+    n_items = len(word_sets)
+    connections = {i: {j for j in range(n_items) if i != j and word_sets[i] & word_sets[j]} for i in range(n_items)}
+
+    total_connections = sum(len(neighbors) for neighbors in connections.values())
+    network_density = total_connections / (n_items * (n_items - 1))
+
+    clustering_coeffs = []
+    for i in range(n_items):
+        neighbors = connections[i]
+        if len(neighbors) <= 1:
+            continue
+        linked = sum(1 for a in neighbors for b in neighbors if a < b and b in connections[a])
+        clustering_coeffs.append(linked / (len(neighbors) * (len(neighbors) - 1) / 2))
+
+    return {
+        "avg_connectivity": round(total_connections / n_items, 4),
+        "network_density": round(network_density, 4),
+        "avg_clustering_coefficient": round(np.mean(clustering_coeffs) if clustering_coeffs else 0, 4),
+        "total_connections": total_connections,
+        "connectivity_score": round(network_density * 100, 2)
+    }
+
+
+def random_corpus(seed, n_items=60, vocabulary_size=40):
+    rng = random.Random(seed)
+    vocabulary = [f"concept{i}" for i in range(vocabulary_size)]
+    return [
+        {'content': ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 6))), 'title': rng.choice(['', 'Note'])}
+        for _ in range(n_items)
+    ]
+
+
+class TestConnectivityMetrics:
+    """连接性指标测试"""
+
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize("block_size", [1, 7, 1000])
+    def test_uncapped_matches_pairwise(self, seed, block_size):
+        """不设常见概念上限时与逐对比较完全一致，与分块大小无关"""
+        items = random_corpus(seed)
+        calculator = MetricsCalculator({'max_concept_postings': 0, 'graph_block_size': block_size})
+
+        assert calculator.calculate_connectivity_metrics(items) == pairwise_connectivity(items)
+
+    def test_cap_is_lossy(self):
+        """跳过常见概念后，只经由该概念相连的知识项不再计为连接"""
+        items = [{'content': f'shared unique{i}', 'title': ''} for i in range(5)]
+
+        exact = MetricsCalculator({'max_concept_postings': 0}).calculate_connectivity_metrics(items)
+        capped = MetricsCalculator({'max_concept_postings': 4}).calculate_connectivity_metrics(items)
+
+        assert exact['total_connections'] == 20
+        assert capped['total_connections'] == 0
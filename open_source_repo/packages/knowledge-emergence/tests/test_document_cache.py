@@ -0,0 +1,119 @@
+"""
+文档缓存测试用例
+测试缓存结果与即时分析一致，未注入缓存时不会返回过期的分析结果，以及分析结束后各模块不再持有缓存
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import generate_synthetic_corpus
+from document_cache import DocumentCache, analyze_document, get_document
+from main import KnowledgeEmergenceAnalyzer
+from quality_assessor import QualityAssessor
+from value_assessor import ValueAssessor
+
+
+def without_assessment_time(results):
+    """去掉评估结果中记录评估时刻的字段"""
+    stripped = []
+    for result in results:
+        fields = dict(vars(result))
+        for key in ('details', 'value_breakdown'):
+            if key in fields:
+                fields[key] = {k: v for k, v in fields[key].items() if k != 'assessment_time'}
+        stripped.append(fields)
+    return stripped
+
+
+class TestDocumentCache:
+    """文档缓存测试"""
+
+    def test_cached_document_matches_analysis(self):
+        """缓存中的分析结果与即时分析一致"""
+        items = [
+            {'content': 'Machine learning models improve with data', 'title': 'Learning',
+             '_collection_time': '2024-03-01T08:00:00Z'},
+            {'content': '短文本', 'title': ''}
+        ]
+        cache = DocumentCache(items)
+
+        for item in items:
+            assert get_document(cache, item) == analyze_document(item)
+        assert cache.get_stats()['hits'] == len(items)
+
+    def test_uncached_lookup_sees_mutation(self):
+        """未注入缓存时，同一字典被修改后重新分析"""
+        item = {'content': 'alpha beta gamma', 'title': 'first'}
+        assessor = QualityAssessor({})
+
+        assert 'gamma' in assessor._get_document(item).concept_set
+        item['content'] = 'delta epsilon'
+        document = assessor._get_document(item)
+
+        assert 'gamma' not in document.concept_set
+        assert 'delta' in document.concept_set
+
+    def test_batch_without_cache_matches_cached(self):
+        """未注入缓存的批量评估只在本批内使用临时缓存，结果与注入缓存时一致"""
+        items = [
+            {'content': '研究 数据 显示 市场 需求 增长', 'title': '市场分析', '_collection_time': '2024-03-01T08:00:00Z'},
+            {'content': 'Experiment data confirms the analysis', 'title': 'Study'}
+        ]
+        for assessor, batch in ((QualityAssessor({}), 'assess_batch_quality'), (ValueAssessor({}), 'assess_batch_value')):
+            uncached = getattr(assessor, batch)(items)
+            assert assessor.document_cache is None
+
+            assessor.document_cache = DocumentCache(items)
+            cached = getattr(assessor, batch)(items)
+
+            assert without_assessment_time(uncached) == without_assessment_time(cached)
+
+
+def cache_holders(analyzer):
+    return [analyzer.metrics_calculator.document_cache, analyzer.quality_assessor.document_cache,
+            analyzer.pattern_recognizer.document_cache, analyzer.value_assessor.document_cache]
+
+
+class TestAnalyzerCacheLifetime:
+    """分析器中文档缓存的生命周期测试"""
+
+    @pytest.fixture
+    def analyzer(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        analyzer = KnowledgeEmergenceAnalyzer()
+        analyzer._generate_visualizations = lambda analysis_data: []
+        analyzer._generate_reports = lambda analysis_data, json_results=None: []
+        return analyzer
+
+    @pytest.fixture
+    def data_file(self, tmp_path):
+        path = tmp_path / 'corpus.json'
+        path.write_text(json.dumps(generate_synthetic_corpus(30, seed=6), ensure_ascii=False), encoding='utf-8')
+        return str(path)
+
+    def test_analyze_detaches_cache(self, analyzer, data_file, tmp_path):
+        """分析成功或失败后各模块都不再持有文档缓存"""
+        assert analyzer.analyze(data_file, output_dir=str(tmp_path / 'ok'))['status'] == 'success'
+        assert cache_holders(analyzer) == [None] * 4
+
+        def fail(knowledge_items):
+            raise RuntimeError('stage failed')
+
+        analyzer._run_stages = fail
+        assert analyzer.analyze(data_file, output_dir=str(tmp_path / 'error'))['status'] == 'error'
+        assert cache_holders(analyzer) == [None] * 4
+
+    def test_batch_and_quick_analysis_detach_cache(self, analyzer, data_file, tmp_path):
+        """批量分析和快速分析结束后各模块都不再持有文档缓存"""
+        results = analyzer.batch_analysis([data_file, data_file], output_dir=str(tmp_path / 'batch'))
+
+        assert [result['status'] for result in results] == ['success', 'success']
+        assert cache_holders(analyzer) == [None] * 4
+
+        assert analyzer.quick_analysis(data_file)['status'] == 'success'
+        assert cache_holders(analyzer) == [None] * 4
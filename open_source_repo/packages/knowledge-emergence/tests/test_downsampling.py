@@ -0,0 +1,110 @@
+"""
+降采样测试用例
+测试 LTTB 保留首尾点、返回指定点数并与逐点实现一致，以及分箱分位数带
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from downsampling import lttb_indices, percentile_bands
+
+
+def reference_lttb(x, y, threshold):
+    """逐点计算三角形面积的 LTTB 参考实现"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    indices = [0]
+    selected = 0
+    for bucket in range(threshold - 2):
+        next_start = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        avg_x = sum(x[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(y[next_start:next_end]) / (next_end - next_start)
+
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        best_area, best = -1.0, start
+        for i in range(start, end):
+            area = abs((x[selected] - avg_x) * (y[i] - y[selected]) -
+                       (x[selected] - x[i]) * (avg_y - y[selected]))
+            if area > best_area:
+                best_area, best = area, i
+        selected = best
+        indices.append(selected)
+
+    indices.append(n - 1)
+    return indices
+
+
+def random_walk(seed, n):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype=float), np.cumsum(rng.normal(size=n))
+
+
+class TestLTTB:
+    """LTTB 降采样测试"""
+
+    @pytest.mark.parametrize("n, threshold", [(1000, 100), (1001, 3), (5000, 2000), (50, 49)])
+    def test_endpoints_and_count(self, n, threshold):
+        """返回 threshold 个严格递增的下标，首尾点保留"""
+        x, y = random_walk(n, n)
+
+        indices = lttb_indices(x, y, threshold)
+
+        assert len(indices) == threshold
+        assert indices[0] == 0 and indices[-1] == n - 1
+        assert np.all(np.diff(indices) > 0)
+
+    @pytest.mark.parametrize("n, threshold", [(10, 10), (10, 20), (10, 2), (0, 5)])
+    def test_short_series_unchanged(self, n, threshold):
+        """序列长度不超过 threshold（或 threshold 小于 3）时保留全部点"""
+        x, y = random_walk(0, n)
+
+        assert lttb_indices(x, y, threshold).tolist() == list(range(n))
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_matches_reference(self, seed):
+        """与逐点实现选出的点相同"""
+        _, y = random_walk(seed, 777)
+        x = np.sort(np.random.default_rng(seed).uniform(0, 100, size=777))
+
+        assert lttb_indices(x, y, 60).tolist() == reference_lttb(x.tolist(), y.tolist(), 60)
+
+    def test_keeps_spike(self):
+        """平坦序列中的尖峰被保留"""
+        y = np.zeros(1000)
+        y[537] = 10.0
+
+        assert 537 in lttb_indices(np.arange(1000), y, 20)
+
+
+class TestPercentileBands:
+    """分箱分位数带测试"""
+
+    def test_bands_match_per_bin_percentiles(self):
+        """每个区间的分位数与直接计算一致，缺失值被忽略"""
+        values = np.random.default_rng(0).normal(size=103)
+        values[5] = np.nan
+
+        centers, bands = percentile_bands(values, 10)
+
+        edges = np.linspace(0, 103, 11).astype(np.int64)
+        assert bands.shape == (5, 10)
+        assert centers.tolist() == [(edges[i] + edges[i + 1] - 1) / 2 for i in range(10)]
+        for i in range(10):
+            assert np.allclose(bands[:, i], np.nanpercentile(values[edges[i]:edges[i + 1]], (10, 25, 50, 75, 90)))
+
+    def test_bins_capped_by_length(self):
+        """区间数不超过序列长度"""
+        centers, bands = percentile_bands([1.0, 2.0, 3.0], 10)
+
+        assert centers.tolist() == [0.0, 1.0, 2.0]
+        assert bands[2].tolist() == [1.0, 2.0, 3.0]
@@ -0,0 +1,236 @@
+"""
+增量分析测试用例
+测试时间推进后增量分析与完整分析结果一致、重新采集的知识项沿用状态键和首次采集时间，以及状态库的读写、过期和清理
+"""
+
+import json
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_collector
+import metrics_calculator
+import quality_assessor
+import state_store
+import value_assessor
+from benchmark import generate_synthetic_corpus
+from data_collector import DataSource
+from main import KnowledgeEmergenceAnalyzer
+from state_store import AnalysisStateStore, item_key
+
+TIME_DEPENDENT_MODULES = (data_collector, metrics_calculator, quality_assessor, value_assessor, state_store)
+
+
+def freeze_time(monkeypatch, frozen_now):
+    """把各模块的 datetime.now() 固定到 frozen_now"""
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return frozen_now
+
+    for module in TIME_DEPENDENT_MODULES:
+        monkeypatch.setattr(module, 'datetime', FrozenDatetime)
+
+
+def without_keys(records, keys):
+    """去掉各层字典中的指定键（复用的评估结果保留首次评估的 assessment_time）"""
+    def strip(value):
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items() if k not in keys}
+        return value
+    return [strip(record) for record in records]
+
+
+def expired_count(store):
+    return sum(counts.get('expired', 0) for counts in store.get_stats()['tables'].values())
+
+
+def run_analysis(analyzer, items):
+    metrics = analyzer._calculate_metrics(items)
+    metrics.pop('calculation_time', None)
+    quality = without_keys(analyzer._assess_quality(items), {'assessment_time'})
+    value = without_keys(analyzer._assess_value(items), {'assessment_time'})
+    return metrics, quality, value
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return KnowledgeEmergenceAnalyzer()
+
+
+class TestIncrementalAnalysis:
+    """增量分析测试"""
+
+    def test_time_advance_matches_full_run(self, analyzer, tmp_path, monkeypatch):
+        """同一语料分析两次、期间时间推进，第二次增量结果与完整分析一致"""
+        items = generate_synthetic_corpus(120, seed=3, start='2024-05-01', days=60)
+
+        analyzer.state_store = AnalysisStateStore(str(tmp_path / 'state.db'))
+        freeze_time(monkeypatch, datetime(2024, 7, 5, 12))
+        run_analysis(analyzer, items)
+
+        freeze_time(monkeypatch, datetime(2024, 8, 20, 12))
+        incremental = run_analysis(analyzer, items)
+        expired = expired_count(analyzer.state_store)
+        analyzer.state_store.close()
+
+        analyzer.state_store = None
+        full = run_analysis(analyzer, items)
+
+        assert incremental[0] and incremental[1] and incremental[2]
+        assert incremental == full
+        assert expired > 0
+
+    def test_unchanged_time_reuses_results(self, analyzer, tmp_path, monkeypatch):
+        """时间未推进时第二次分析全部复用已保存的结果"""
+        items = generate_synthetic_corpus(40, seed=5)
+        freeze_time(monkeypatch, datetime(2025, 3, 1, 12))
+
+        analyzer.state_store = AnalysisStateStore(str(tmp_path / 'state.db'))
+        first = run_analysis(analyzer, items)
+        second = run_analysis(analyzer, items)
+        expired = expired_count(analyzer.state_store)
+        analyzer.state_store.close()
+
+        assert first == second
+        assert expired == 0
+
+    def test_recollected_item_keeps_key_and_first_seen_time(self, tmp_path):
+        """重新采集的知识项使用相同的状态键，采集时间沿用首次采集的时间"""
+        item = {'content': 'same content', 'title': 'same', '_collection_time': '2024-01-01T00:00:00'}
+        recollected = dict(item, _collection_time='2024-02-01T00:00:00')
+        other = {'content': 'other', '_collection_time': '2024-02-01T00:00:00'}
+
+        assert item_key(item) == item_key(recollected)
+
+        store = AnalysisStateStore(str(tmp_path / 'state.db'))
+        assert store.assign_first_seen_times([dict(item)]) == 1
+        items = [recollected, other, dict(recollected)]
+        assert store.assign_first_seen_times(items) == 1
+        assert [i['_collection_time'] for i in items] == ['2024-01-01T00:00:00', '2024-02-01T00:00:00',
+                                                          '2024-01-01T00:00:00']
+
+        # 从语料中消失的内容不再保留首次采集时间
+        store.assign_first_seen_times([dict(other)])
+        again = dict(item, _collection_time='2024-02-01T00:00:00')
+        store.assign_first_seen_times([again])
+        assert again['_collection_time'] == '2024-02-01T00:00:00'
+        store.close()
+
+    def test_collecting_same_file_on_later_day_reuses_results(self, tmp_path, monkeypatch):
+        """隔天重新采集同一数据源时复用结果，且与按首次采集时间完整分析的结果一致"""
+        monkeypatch.chdir(tmp_path)
+        corpus = generate_synthetic_corpus(60, seed=7)
+        for item in corpus:
+            item.pop('_collection_time', None)
+        data_path = tmp_path / 'items.json'
+        data_path.write_text(json.dumps(corpus, ensure_ascii=False), encoding='utf-8')
+
+        analyzer = KnowledgeEmergenceAnalyzer()
+        analyzer.config['performance']['parallel_processing'] = False
+        analyzer.config['incremental']['state_db'] = str(tmp_path / 'state.db')
+        monkeypatch.setattr(analyzer, '_generate_visualizations', lambda data: [])
+        monkeypatch.setattr(analyzer, '_generate_reports', lambda data: [])
+        analyzer.data_collector.data_sources = [DataSource('knowledge_base', 'file', {'path': str(data_path)})]
+
+        freeze_time(monkeypatch, datetime(2025, 3, 1, 12))
+        first = analyzer.analyze(output_dir=str(tmp_path / 'out'), incremental=True)
+        freeze_time(monkeypatch, datetime(2025, 3, 2, 12))
+        second = analyzer.analyze(output_dir=str(tmp_path / 'out'), incremental=True)
+
+        assert first['status'] == second['status'] == 'success'
+        tables = second['run_stats']['incremental']['tables']
+        for table in ('item_metrics', 'item_quality', 'item_value'):
+            assert tables[table]['reused'] > 0
+        assert tables['item_times']['reused'] == tables['item_quality']['reused'] == len(corpus)
+        assert tables['item_quality']['computed'] == tables['item_quality']['expired']
+
+        # 完整分析：采集时间为首次采集的时间，当前时间为第二天
+        items = [dict(item, _source='knowledge_base', _collection_time=datetime(2025, 3, 1, 12).isoformat())
+                 for item in corpus]
+        full = run_analysis(analyzer, analyzer.data_collector.preprocess_data(items))
+        assert without_keys(second['quality_scores'], {'assessment_time'}) == full[1]
+        assert without_keys(second['value_assessments'], {'assessment_time'}) == full[2]
+
+
+class TestAnalysisStateStore:
+    """增量状态库测试"""
+
+    def test_save_load_and_prune(self, tmp_path, monkeypatch):
+        """分块查询读回保存的结果，prune_results 删除不在语料中的键"""
+        monkeypatch.setattr(AnalysisStateStore, 'QUERY_CHUNK_SIZE', 3)
+        store = AnalysisStateStore(str(tmp_path / 'state.db'))
+        results = {f"key{i}": {'score': i / 10, 'tags': ['a']} for i in range(10)}
+
+        store.save_results('item_quality', results)
+
+        assert store.load_results('item_quality', list(results) + ['unknown']) == results
+        assert store.prune_results('item_quality', {'key1', 'key2'}) == 8
+        assert store.load_results('item_quality', results) == {k: results[k] for k in ('key1', 'key2')}
+        assert store.get_stats()['tables']['item_quality'] == {'reused': 12, 'expired': 0, 'computed': 10, 'removed': 8}
+        store.close()
+
+    def test_results_expire_when_time_signature_changes(self, tmp_path):
+        """结果中随时间变化的部分与保存时不同时不再复用"""
+        store = AnalysisStateStore(str(tmp_path / 'state.db'))
+        store.save_results('item_value', {'a': 1, 'b': 2, 'c': 3}, {'a': [0.5, 0.3], 'b': [0.3, 0.3]})
+
+        assert store.load_results('item_value', ['a', 'b', 'c'], {'a': [0.4, 0.3], 'b': [0.3, 0.3]}) == \
+            {'b': 2, 'c': 3}
+        assert store.load_results('item_value', ['a', 'b', 'c']) == {'a': 1, 'b': 2, 'c': 3}
+        assert store.get_stats()['tables']['item_value']['expired'] == 1
+        store.close()
+
+    def test_timeliness_signature_follows_score_buckets(self, monkeypatch):
+        """质量评估的时间部分只在跨过 7/30/365 天分段时变化"""
+        assessor = quality_assessor.QualityAssessor({})
+        item = {'content': '研究 数据', '_collection_time': '2024-01-01T09:00:00'}
+
+        def signature_on(day):
+            freeze_time(monkeypatch, datetime(2024, 1, 1, 9) + timedelta(days=day))
+            return assessor.time_signature(item)
+
+        assert [signature_on(day) for day in (0, 6, 7, 8, 20, 30, 31, 200, 365, 366)] == \
+            [1.0, 1.0, 1.0, 0.8, 0.8, 0.8, 0.5, 0.5, 0.5, 0.2]
+
+    def test_topic_accumulator_matches_recount(self, tmp_path):
+        """新增、删除和出现次数变化后，主题词频累加器与按当前语料重新统计的结果一致"""
+        store = AnalysisStateStore(str(tmp_path / 'state.db'))
+        topics = {'a': Counter(x=2, y=1), 'b': Counter(y=3), 'c': Counter(z=1)}
+
+        def recount(occurrences):
+            totals = Counter()
+            for key, count in occurrences.items():
+                for topic, topic_count in topics[key].items():
+                    totals[topic] += topic_count * count
+            return totals
+
+        occurrences = Counter(a=1, b=2)
+        assert store.sync_item_metrics({k: (0.1, 0.2, topics[k]) for k in occurrences}, occurrences) == \
+            recount(occurrences)
+
+        occurrences = Counter(b=1, c=3)
+        assert store.sync_item_metrics({'c': (None, 0.5, topics['c'])}, occurrences) == recount(occurrences)
+        assert store.load_metric_occurrences() == {'b': 1, 'c': 3}
+        assert store.load_item_metrics(['b', 'c', 'a']) == {'b': (0.1, 0.2), 'c': (None, 0.5)}
+        store.close()
+
+    def test_schema_change_resets_state(self, tmp_path, monkeypatch):
+        """打开旧版本的状态库时清空已保存的状态"""
+        path = str(tmp_path / 'state.db')
+        store = AnalysisStateStore(path)
+        store.save_results('item_quality', {'a': 1})
+        store.close()
+
+        monkeypatch.setattr(AnalysisStateStore, 'SCHEMA_VERSION', AnalysisStateStore.SCHEMA_VERSION + 1)
+        store = AnalysisStateStore(path)
+
+        assert store.load_results('item_quality', ['a']) == {}
+        assert store.get_accumulator('schema_version') == AnalysisStateStore.SCHEMA_VERSION
+        store.close()
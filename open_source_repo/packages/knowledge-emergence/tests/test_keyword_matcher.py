@@ -0,0 +1,109 @@
+"""
+多关键词匹配器测试用例
+测试联合匹配器对每个关键词列表的结果与逐个关键词的 `in` 判断一致，以及评估结果与逐词判断的实现一致
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import generate_synthetic_corpus
+from keyword_matcher import KeywordMatcher
+from pattern_recognizer import PatternRecognizer
+from quality_assessor import QualityAssessor
+from value_assessor import ValueAssessor
+
+KEYWORD_LISTS = {
+    'high': ['研究', '实验', '数据', '统计', '证实', '验证', '发现', '分析'],
+    'low': ['据说', '听说', '传言', '据说', '可能', '也许'],          # 重复的关键词
+    'negative': ['困难', '复杂', '困难', '耗时', '昂贵'],
+    'subjective': ['我认为', '认为', '为', '我觉得', '我'],          # 互为前缀或子串的关键词
+    'english': ['he', 'she', 'his', 'hers', 'ushers', 'h'],
+    'regex': ['a.b', '(x)', 'c+', '[研]'],                        # 正则元字符按字面匹配
+    'empty': ['', '数据'],                                        # 空关键词总是出现
+    'none': []
+}
+
+
+def random_texts(seed, count=300):
+    rng = random.Random(seed)
+    alphabet = '研究实验数据据说可能也许困难复杂我认为觉得hesiruab.()c+[] ' + ''.join(
+        keyword for keywords in KEYWORD_LISTS.values() for keyword in keywords
+    )
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 60))) for _ in range(count)]
+
+
+class TestKeywordMatcher:
+    """多关键词匹配器测试"""
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_matches_in_loop(self, seed):
+        """每个列表的计数、命中集合和是否命中都与 `in` 判断一致"""
+        matcher = KeywordMatcher(KEYWORD_LISTS, cache_size=4)
+        for text in random_texts(seed):
+            for name, keywords in KEYWORD_LISTS.items():
+                assert matcher.count(name, text) == sum(1 for keyword in keywords if keyword in text)
+                assert matcher.find_all(name, text) == {keyword for keyword in keywords if keyword in text}
+                assert matcher.contains_any(name, text) == any(keyword in text for keyword in keywords)
+
+    def test_counts_duplicate_entries(self):
+        """列表中重复的关键词重复计数"""
+        matcher = KeywordMatcher({'negative': ['困难', '复杂', '困难']})
+
+        assert matcher.count('negative', '这个问题很困难') == 2
+
+    def test_overlapping_keywords_at_same_position(self):
+        """同一位置开始的较短关键词和较长关键词中间的关键词都被找到"""
+        matcher = KeywordMatcher({'a': ['ushers', 'she', 'he', 'hers', 'us']})
+
+        assert matcher.find_all('a', 'ushers') == {'ushers', 'she', 'he', 'hers', 'us'}
+        assert matcher.find_all('a', 'ushe') == {'she', 'he', 'us'}
+
+    def test_text_scanned_once(self):
+        """同一文本对多个列表的查询只扫描一次"""
+        matcher = KeywordMatcher(KEYWORD_LISTS)
+
+        text = '研究表明据说这很困难'
+        for name in KEYWORD_LISTS:
+            matcher.count(name, text)
+            matcher.find_all(name, text)
+            matcher.contains_any(name, text)
+
+        assert matcher._scan.cache_info().misses == 1
+
+    def test_no_keywords(self):
+        """没有关键词的列表从不命中，未知列表计数为 0"""
+        matcher = KeywordMatcher({'none': []})
+
+        assert matcher.count('none', 'text') == 0
+        assert not matcher.contains_any('none', 'text')
+        assert matcher.count('missing', 'text') == 0
+
+
+def reference_counts(assessor, text):
+    return {name: sum(1 for keyword in keywords if keyword in text)
+            for name, keywords in assessor.keyword_matcher.keyword_lists.items()}
+
+
+class TestAssessorMatchers:
+    """评估器的联合匹配器测试"""
+
+    @pytest.mark.parametrize("assessor_class", [QualityAssessor, ValueAssessor, PatternRecognizer])
+    def test_assessor_lists_match_in_loop(self, assessor_class):
+        """评估器联合匹配器中每个列表的计数与逐词判断一致"""
+        assessor = assessor_class({})
+        for item in generate_synthetic_corpus(100, seed=2):
+            for text in (item['content'], item['content'].lower()):
+                counts = reference_counts(assessor, text)
+                assert {name: assessor.keyword_matcher.count(name, text) for name in counts} == counts
+
+    def test_value_indicator_levels(self):
+        """价值指示词按配置中的类型和级别统计"""
+        assessor = ValueAssessor({})
+
+        assert assessor._analyze_value_indicators('商业价值与市场潜力，但成本较高', 'economic') == \
+            {'high': 2, 'medium': 1, 'low': 1}
@@ -0,0 +1,132 @@
+"""
+MinHash 与流式涌现性指标测试用例
+测试 MinHash 估计的 Jaccard 相似度和基数与精确值接近，以及流式涌现性指标与批量计算一致
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import generate_synthetic_corpus
+from emergence_stream import StreamingEmergenceCalculator
+from metrics_calculator import MetricsCalculator
+from minhash import MinHasher
+
+
+def overlapping_sets(rng, size, overlap):
+    """两个大小为 size、共享 overlap 个元素的集合"""
+    shared = {f"shared{i}" for i in range(overlap)}
+    return (shared | {f"left{i}" for i in range(size - overlap)},
+            shared | {f"right{i}" for i in range(size - overlap)})
+
+
+class TestMinHasher:
+    """MinHash 签名测试"""
+
+    @pytest.mark.parametrize("overlap", [0, 50, 150, 200])
+    def test_jaccard_close_to_exact(self, overlap):
+        """估计的 Jaccard 相似度与精确值相差不超过 4 个标准差"""
+        set1, set2 = overlapping_sets(random.Random(overlap), 200, overlap)
+        hasher = MinHasher(num_perm=256)
+        exact = len(set1 & set2) / len(set1 | set2)
+
+        estimate = hasher.jaccard(hasher.signature(set1), hasher.signature(set2))
+
+        assert abs(estimate - exact) <= 4 * np.sqrt(exact * (1 - exact) / 256) + 1e-9
+
+    def test_merge_equals_union_signature(self):
+        """合并签名与并集的签名完全相同"""
+        set1, set2 = overlapping_sets(random.Random(0), 100, 30)
+        hasher = MinHasher()
+
+        merged = hasher.merge(hasher.signature(set1), hasher.signature(set2))
+
+        assert np.array_equal(merged, hasher.signature(set1 | set2))
+
+    def test_jaccard_many_matches_pairwise(self):
+        """签名矩阵逐行估计与两两估计一致"""
+        hasher = MinHasher()
+        rng = random.Random(1)
+        signatures = [hasher.signature({f"t{rng.randrange(60)}" for _ in range(30)}) for _ in range(5)]
+
+        many = hasher.jaccard_many(np.vstack(signatures), signatures[0])
+
+        assert many.tolist() == [hasher.jaccard(signature, signatures[0]) for signature in signatures]
+
+    @pytest.mark.parametrize("size", [10, 500, 5000])
+    def test_cardinality_close_to_exact(self, size):
+        """基数估计的相对误差在 30% 以内"""
+        hasher = MinHasher(num_perm=256)
+
+        estimate = hasher.cardinality(hasher.signature(f"token{i}" for i in range(size)))
+
+        assert abs(estimate - size) / size < 0.3
+
+    def test_empty_and_deterministic(self):
+        """空集合的签名基数为 0；相同参数的生成器得到相同签名"""
+        hasher = MinHasher(num_perm=64, seed=3)
+
+        assert hasher.is_empty(hasher.signature([]))
+        assert hasher.cardinality(hasher.empty()) == 0
+        assert np.array_equal(hasher.signature(['a', 'b']), MinHasher(num_perm=64, seed=3).signature(['b', 'a']))
+        assert not np.array_equal(hasher.signature(['a', 'b']), MinHasher(num_perm=64, seed=4).signature(['a', 'b']))
+
+
+class TestStreamingEmergence:
+    """流式涌现性指标测试"""
+
+    @pytest.mark.parametrize("seed", range(2))
+    def test_matches_batch_metrics(self, seed):
+        """窗口划分、增长趋势和涌现强度与批量计算完全一致，草图估计的创新度和整合度接近精确值"""
+        items = generate_synthetic_corpus(400, seed=seed)
+        exact = MetricsCalculator({}).calculate_emergence_metrics(items)
+        streaming = MetricsCalculator({'emergence_mode': 'streaming', 'emergence_num_perm': 512}) \
+            .calculate_emergence_metrics(items)
+
+        assert streaming['estimated'] is True
+        assert streaming['items_seen'] == len(items)
+        assert streaming['knowledge_growth_trend'] == exact['knowledge_growth_trend']
+        assert streaming['total_growth_points'] == exact['total_growth_points']
+        assert streaming['emergence_intensity'] == exact['emergence_intensity']
+        assert streaming['innovation_rate'] == pytest.approx(exact['innovation_rate'], rel=0.15)
+        assert streaming['avg_integration'] == pytest.approx(exact['avg_integration'], abs=0.03)
+
+    def test_window_snapshots_and_flush(self):
+        """每个窗口结束时返回一次指标，flush 结束未满的窗口"""
+        stream = StreamingEmergenceCalculator(window_size=3, concept_extractor=lambda item: set(item['concepts']))
+        items = [{'concepts': ['a', 'b']}, {'concepts': ['c']}, {'concepts': ['a']},
+                 {'concepts': ['a', 'd']}, {'concepts': []}]
+
+        snapshots = stream.update_many(items)
+
+        assert [snapshot['items_seen'] for snapshot in snapshots] == [3]
+        assert stream.flush()['knowledge_growth_trend'] == [3, 2]
+        assert stream.flush() is None
+        # 第二个窗口的新概念为 {a, d} - {a, b, c} = {d}
+        assert stream.get_metrics()['emergence_intensity'] == round((2 - 3) / 3, 4)
+
+    def test_max_sketches_bounds_memory(self):
+        """max_sketches 限制保留的历史签名数"""
+        stream = StreamingEmergenceCalculator(window_size=1, max_sketches=4,
+                                              concept_extractor=lambda item: {item['concept']})
+
+        stream.update_many({'concept': f"c{i}"} for i in range(20))
+
+        assert len(stream._signatures) == 4
+        assert stream.windows_closed == 20
+
+    def test_default_sketch_count_bounded(self):
+        """默认配置下保留的历史签名数有上限，不随窗口数增长"""
+        stream = MetricsCalculator({}).create_emergence_stream(window_size=1, num_perm=16)
+        stream.concept_extractor = lambda item: {item['concept']}
+
+        stream.update_many({'concept': f"c{i % 50}"} for i in range(stream.max_sketches + 200))
+
+        assert stream.max_sketches == 1000
+        assert len(stream._signatures) == len(stream._empty_flags) == stream.max_sketches
+        assert stream.windows_closed == stream.max_sketches + 200
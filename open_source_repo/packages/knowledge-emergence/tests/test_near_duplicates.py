@@ -0,0 +1,105 @@
+"""
+近似重复过滤测试用例
+测试过滤默认关闭时预处理结果不变、启用后折叠近似重复项，以及 MinHash 过滤与精确 Jaccard 比较一致
+"""
+
+import json
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_collector import DataCollector
+from near_duplicates import NearDuplicateFilter
+
+ENABLED = {'near_duplicates': {'enabled': True}}
+
+
+def random_text(rng, length=300):
+    return ''.join(rng.choice('知识涌现模式分析数据研究系统网络abcdefghij ') for _ in range(length))
+
+
+def corpus_with_duplicates(seed=0, n_distinct=30):
+    """n_distinct 个不同的知识项，其中一半带一份完全重复、三分之一带一份只改动一个字符的副本"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(n_distinct):
+        content = random_text(rng)
+        items.append({'title': f'条目{i}', 'content': content})
+        if i % 2 == 0:
+            items.append({'title': f'条目{i}', 'content': f'  {content}  '})
+        if i % 3 == 0:
+            position = rng.randrange(len(content))
+            items.append({'title': f'条目{i}', 'content': content[:position] + '变' + content[position + 1:]})
+    return items
+
+
+def shingles(item, k=5):
+    text = ' '.join(' '.join(str(item[f]) for f in ('title', 'content') if item.get(f)).split()).lower()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def exact_filter(items, threshold):
+    """逐对计算精确 Jaccard 相似度的参考实现"""
+    kept = []
+    for item in items:
+        item_shingles = shingles(item)
+        if not any(len(item_shingles & s) / len(item_shingles | s) >= threshold for _, s in kept):
+            kept.append((item, item_shingles))
+    return [item for item, _ in kept]
+
+
+class TestNearDuplicateDefault:
+    """近似重复过滤开关测试"""
+
+    def test_disabled_by_default(self):
+        """默认不过滤，预处理结果与逐项清洗一致"""
+        items = corpus_with_duplicates()
+        collector = DataCollector({})
+        reference = [collector._clean_item(item) for item in items]
+
+        assert collector.near_duplicate_filter is None
+        assert collector.preprocess_data(items) == reference
+        assert DataCollector({'near_duplicates': {'enabled': False}}).preprocess_data(items) == reference
+        assert collector.dedup_stats == {}
+
+    def test_enabled_collapses_counts(self):
+        """启用后完全重复和改动一个字符的副本都被折叠，只保留最先出现的一项"""
+        items = corpus_with_duplicates()
+        collector = DataCollector(ENABLED)
+        processed = collector.preprocess_data(items)
+
+        assert [item['title'] for item in processed] == [f'条目{i}' for i in range(30)]
+        assert collector.dedup_stats['collapsed'] == len(items) - 30
+        assert collector.dedup_stats['duplicate_groups'] == 20
+
+    def test_streaming_collapses_across_batches(self, tmp_path):
+        """流式采集时去重索引跨批次保留"""
+        items = corpus_with_duplicates()
+        path = tmp_path / 'items.jsonl'
+        path.write_text('\n'.join(json.dumps(item, ensure_ascii=False) for item in items), encoding='utf-8')
+
+        disabled = [item for batch in DataCollector({}).iter_file_batches(str(path), batch_size=7) for item in batch]
+        enabled = [item for batch in DataCollector(ENABLED).iter_file_batches(str(path), batch_size=7)
+                   for item in batch]
+
+        assert len(disabled) == len(items)
+        assert len(enabled) == 30
+
+
+class TestNearDuplicateFilter:
+    """MinHash 近似重复过滤测试"""
+
+    def test_matches_exact_jaccard(self):
+        """相似度远离阈值时，过滤结果与精确 Jaccard 比较一致"""
+        items = corpus_with_duplicates(seed=1)
+
+        assert NearDuplicateFilter(threshold=0.9).filter(items) == exact_filter(items, 0.9)
+
+    def test_items_without_text_are_kept(self):
+        """没有文本字段的知识项总是保留"""
+        duplicate_filter = NearDuplicateFilter()
+
+        assert duplicate_filter.filter([{'source': 'a'}, {'source': 'a'}]) == [{'source': 'a'}, {'source': 'a'}]
+        assert duplicate_filter.get_stats()['collapsed'] == 0
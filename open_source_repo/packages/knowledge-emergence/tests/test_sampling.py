@@ -0,0 +1,158 @@
+"""
+分层抽样测试用例
+测试分层蓄水池抽样的样本量、按层比例分配、随机种子确定性和刀切法置信区间
+"""
+
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sampling import StratifiedReservoirSampler, jackknife_intervals
+
+# 来源 -> (月份, 条目数)
+STRATA = {
+    'papers': [('2024-01', 600), ('2024-02', 200)],
+    'web': [('2024-01', 150), ('2024-03', 50)]
+}
+
+
+def stratified_corpus():
+    """按层交错到达的知识项，每项带唯一编号"""
+    items = []
+    for source, buckets in STRATA.items():
+        for month, count in buckets:
+            items.extend({'id': f'{source}-{month}-{i}', '_source': source,
+                          '_collection_time': f'{month}-15T08:00:00'} for i in range(count))
+    order = np.random.default_rng(0).permutation(len(items))
+    return [items[i] for i in order]
+
+
+def strata_counts(items):
+    return Counter((item['_source'], item['_collection_time'][:7]) for item in items)
+
+
+class TestStratifiedReservoirSampler:
+    """分层蓄水池抽样测试"""
+
+    def test_sample_size_and_proportional_allocation(self):
+        """样本量等于 sample_size，各层样本数与层大小成比例"""
+        items = stratified_corpus()
+        sampler = StratifiedReservoirSampler(100)
+        sampler.extend(items)
+        sample, _ = sampler.sample()
+
+        assert len(sample) == 100
+        assert len({item['id'] for item in sample}) == 100
+        assert strata_counts(sample) == {('papers', '2024-01'): 60, ('papers', '2024-02'): 20,
+                                         ('web', '2024-01'): 15, ('web', '2024-03'): 5}
+        assert sampler.get_stats()['sampling_fraction'] == 0.1
+
+    def test_largest_remainder_rounding(self):
+        """层配额不是整数时按最大余数取整，样本量仍等于 sample_size"""
+        items = stratified_corpus()
+        sampler = StratifiedReservoirSampler(7)
+        sampler.extend(items)
+        sample, _ = sampler.sample()
+
+        # 配额 4.2、1.4、1.05、0.35
+        assert strata_counts(sample) == {('papers', '2024-01'): 4, ('papers', '2024-02'): 2,
+                                         ('web', '2024-01'): 1}
+
+    def test_sample_preserves_arrival_order(self):
+        """样本按到达顺序返回"""
+        items = stratified_corpus()
+        positions = {item['id']: i for i, item in enumerate(items)}
+        sampler = StratifiedReservoirSampler(100)
+        sampler.extend(items)
+        sample, _ = sampler.sample()
+
+        indexes = [positions[item['id']] for item in sample]
+        assert indexes == sorted(indexes)
+
+    def test_deterministic_by_seed(self):
+        """相同种子得到相同样本，不同种子一般不同"""
+        items = stratified_corpus()
+
+        def draw(seed):
+            sampler = StratifiedReservoirSampler(50, seed=seed)
+            sampler.extend(items)
+            return [item['id'] for item in sampler.sample()[0]]
+
+        assert draw(7) == draw(7)
+        assert draw(7) != draw(8)
+
+    def test_exact_when_sample_covers_corpus(self):
+        """sample_size 不小于语料时返回全部知识项"""
+        items = stratified_corpus()
+        sampler = StratifiedReservoirSampler(len(items) + 10)
+        sampler.extend(items)
+        sample, _ = sampler.sample()
+
+        assert sample == items
+        assert sampler.get_stats()['sampling_fraction'] == 1
+
+    def test_items_without_time_or_source(self):
+        """缺少来源或时间的知识项归入 unknown 层"""
+        sampler = StratifiedReservoirSampler(10)
+
+        assert sampler.stratum_of({}) == ('unknown', 'unknown')
+        assert sampler.stratum_of({'_source': 'web', '_collection_time': 'bad'}) == ('web', 'unknown')
+        with pytest.raises(ValueError):
+            StratifiedReservoirSampler(10, time_bucket='year')
+
+    def test_reservoir_is_uniform_within_stratum(self):
+        """同一层内每个知识项被抽中的概率相同"""
+        items = [{'id': i, '_source': 'a', '_collection_time': '2024-01-01T00:00:00'} for i in range(20)]
+        hits = Counter()
+        for seed in range(2000):
+            sampler = StratifiedReservoirSampler(5, seed=seed)
+            sampler.extend(items)
+            hits.update(item['id'] for item in sampler.sample()[0])
+
+        # 期望每项 500 次，标准差约 19
+        assert all(abs(hits[i] - 500) < 100 for i in range(20))
+
+    def test_groups_balanced_within_strata(self):
+        """刀切法分组在每层内轮流分配，各组样本数最多相差每层一个"""
+        sampler = StratifiedReservoirSampler(100)
+        sampler.extend(stratified_corpus())
+        sample, groups = sampler.sample(n_groups=10)
+
+        assert len(groups) == len(sample)
+        per_stratum = {}
+        for item, group in zip(sample, groups):
+            per_stratum.setdefault((item['_source'], item['_collection_time'][:7]), Counter())[group] += 1
+        for stratum, counts in per_stratum.items():
+            sizes = [counts[group] for group in range(10)]
+            assert max(sizes) - min(sizes) <= 1
+
+class TestJackknifeIntervals:
+    """刀切法置信区间测试"""
+
+    def test_delete_one_mean_matches_standard_error(self):
+        """每组一个样本时，均值的刀切法标准误等于 s / sqrt(n)"""
+        values = np.random.default_rng(1).normal(size=30)
+        estimate = {'metrics': {'mean': float(values.mean()), 'data_points': 30}}
+        replicates = [{'metrics': {'mean': float(np.delete(values, i).mean()), 'data_points': 29}}
+                      for i in range(len(values))]
+
+        intervals = jackknife_intervals(estimate, replicates)
+
+        assert list(intervals) == ['metrics.mean']
+        expected = values.std(ddof=1) / np.sqrt(len(values))
+        assert intervals['metrics.mean']['std_error'] == pytest.approx(expected, abs=1e-6)
+        assert intervals['metrics.mean']['lower'] < values.mean() < intervals['metrics.mean']['upper']
+
+    def test_fields_missing_from_replicates_are_skipped(self):
+        """只在部分复制样本中出现的字段和非数值字段不计算区间"""
+        intervals = jackknife_intervals({'a': 1.0, 'b': 2.0, 'c': 'text'},
+                                        [{'a': 1.0, 'b': 2.0}, {'a': 1.0}])
+
+        assert list(intervals) == ['a']
+        assert intervals['a']['std_error'] == 0
+        assert jackknife_intervals({'a': 1.0}, [{'a': 1.0}]) == {}
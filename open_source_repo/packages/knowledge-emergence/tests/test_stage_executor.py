@@ -0,0 +1,136 @@
+"""
+阶段执行器测试用例
+测试串行和并发执行结果一致、指定阶段在调用线程中执行、进程模式的阶段结果与串行一致，以及阶段并发默认关闭
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import generate_synthetic_corpus
+from main import KnowledgeEmergenceAnalyzer
+from parallel import submit_method_call
+from stage_executor import StageExecutor
+
+
+class PidReporter:
+    """返回所在进程号的处理器"""
+
+    def __init__(self, config):
+        self.offset = config['offset']
+
+    def report(self, value):
+        return os.getpid(), value + self.offset
+
+
+def without_times(value):
+    """去掉评估时间戳"""
+    if isinstance(value, dict):
+        return {key: without_times(item) for key, item in value.items()
+                if key not in ('assessment_time', 'calculation_time')}
+    if isinstance(value, list):
+        return [without_times(item) for item in value]
+    return value
+
+
+def build_executor(parallel, threads):
+    """两个独立阶段、一个在调用线程中执行的汇总阶段和一个普通汇总阶段"""
+    executor = StageExecutor(max_workers=2, parallel=parallel)
+
+    def record(name, value):
+        def run(**kwargs):
+            threads[name] = threading.current_thread()
+            return value + sum(kwargs.values())
+        return run
+
+    executor.add_stage('a', record('a', 1))
+    executor.add_stage('b', record('b', 2))
+    executor.add_stage('plot', record('plot', 10), depends_on=('a', 'b'), main_thread=True)
+    executor.add_stage('report', record('report', 100), depends_on=('a', 'b'))
+    return executor
+
+
+class TestStageExecutor:
+    """阶段执行器测试"""
+
+    def test_parallel_matches_serial(self):
+        """并发与串行执行的结果一致"""
+        serial = build_executor(False, {}).run()
+        parallel = build_executor(True, {}).run()
+
+        assert serial == parallel == {'a': 1, 'b': 2, 'plot': 13, 'report': 103}
+
+    def test_main_thread_stage(self):
+        """并发模式下 main_thread 阶段在调用线程中执行，其余阶段在线程池中执行"""
+        threads = {}
+        build_executor(True, threads).run()
+
+        assert threads['plot'] is threading.main_thread()
+        assert threads['a'] is not threading.main_thread()
+        assert threads['report'] is not threading.main_thread()
+
+    def test_main_thread_stage_error_propagates(self):
+        """在调用线程中执行的阶段失败时抛出其异常"""
+        executor = StageExecutor(max_workers=2, parallel=True)
+        executor.add_stage('a', lambda: 1)
+
+        def fail(a):
+            raise RuntimeError('plot failed')
+
+        executor.add_stage('plot', fail, depends_on=('a',), main_thread=True)
+
+        with pytest.raises(RuntimeError, match='plot failed'):
+            executor.run()
+        assert executor.timings['plot'].status == 'error'
+
+    def test_stages_serial_by_default(self, tmp_path, monkeypatch):
+        """阶段并发默认关闭"""
+        monkeypatch.chdir(tmp_path)
+
+        assert StageExecutor().parallel is False
+        assert KnowledgeEmergenceAnalyzer().config['performance']['parallel_stages'] is False
+
+    def test_submit_method_call_runs_in_worker(self):
+        """方法调用在工作进程中新建的处理器实例上执行"""
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            pid, value = submit_method_call(pool, PidReporter, {'offset': 10}, 'report', 5).result()
+
+        assert pid != os.getpid()
+        assert value == 15
+
+    def test_process_stages_match_serial(self, tmp_path, monkeypatch):
+        """进程模式下各分析阶段的结果与串行执行一致"""
+        monkeypatch.chdir(tmp_path)
+        items = generate_synthetic_corpus(60, seed=4)
+
+        def run(parallel, mode):
+            analyzer = KnowledgeEmergenceAnalyzer()
+            analyzer._generate_visualizations = lambda results: []
+            analyzer._generate_reports = lambda results: []
+            performance = analyzer.config['performance']
+            performance.update({'parallel_stages': parallel, 'stage_mode': mode, 'stage_workers': 2})
+
+            used_pool = []
+            call_component = analyzer._call_component
+
+            def record_pool(*args):
+                used_pool.append(analyzer._stage_pool is not None)
+                return call_component(*args)
+
+            analyzer._call_component = record_pool
+            results = analyzer._run_stages(items)
+
+            assert analyzer._stage_pool is None
+            return without_times(results), used_pool
+
+        serial, serial_pool = run(False, 'thread')
+        processes, process_pool = run(True, 'process')
+
+        assert processes == serial
+        assert serial_pool and not any(serial_pool)
+        assert len(process_pool) == 4 and all(process_pool)
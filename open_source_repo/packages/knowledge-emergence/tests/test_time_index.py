@@ -0,0 +1,138 @@
+"""
+采集时间索引测试用例
+测试 TimeIndex 的向量化计算与逐项 datetime 计算一致，以及时间模式检测共享索引时结果不变
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import generate_synthetic_corpus
+from document_cache import parse_collection_time
+from pattern_recognizer import PatternRecognizer
+from time_index import TimeIndex
+
+
+def random_items(seed, n_items=80, timezone=True):
+    """随机采集时间，包含缺失和无法解析的时间"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    items = []
+    for _ in range(n_items):
+        roll = rng.random()
+        if roll < 0.1:
+            items.append({'content': 'no time'})
+            continue
+        if roll < 0.15:
+            items.append({'content': 'bad time', '_collection_time': 'not a time'})
+            continue
+        ts = start + timedelta(seconds=rng.randint(0, 90 * 86400))
+        suffix = rng.choice(['Z', '+08:00', '-05:00']) if timezone else ''
+        items.append({'content': 'timed', '_collection_time': ts.isoformat() + suffix})
+    return items
+
+
+def reference_times(items):
+    return [parse_collection_time(item.get('_collection_time', '')) for item in items]
+
+
+class TestTimeIndex:
+    """采集时间索引测试"""
+
+    @pytest.mark.parametrize("seed", range(3))
+    @pytest.mark.parametrize("timezone", [True, False])
+    def test_matches_datetime_reference(self, seed, timezone):
+        """间隔、分桶、连续同日段和距今天数与逐项 datetime 计算一致"""
+        items = sorted(random_items(seed, timezone=timezone), key=lambda x: x.get('_collection_time', ''))
+        times = reference_times(items)
+        valid = [(i, ts) for i, ts in enumerate(times) if ts is not None]
+        time_index = TimeIndex.from_items(items)
+
+        assert len(time_index) == len(valid)
+        assert time_index.intervals_days().tolist() == [
+            (b - a).days for (_, a), (_, b) in zip(valid, valid[1:])
+        ]
+
+        groups = {}
+        for i, ts in valid:
+            groups.setdefault(ts.date(), []).append(i)
+        assert [(day, positions.tolist()) for day, positions in time_index.groups_by_day()] == sorted(groups.items())
+
+        runs = []
+        for _, ts in valid:
+            if runs and runs[-1][0] == ts.date():
+                runs[-1][1] += 1
+            else:
+                runs.append([ts.date(), 1])
+        run_days, run_counts = time_index.daily_runs()
+        assert list(zip(run_days.astype(object).tolist(), run_counts.tolist())) == [tuple(run) for run in runs]
+
+        now = datetime(2024, 6, 1, 12)
+        assert time_index.age_days(now).tolist() == [(now - ts.replace(tzinfo=None)).days for _, ts in valid]
+
+    def test_mixed_timezones_raise_like_datetime(self):
+        """同时存在有时区和无时区的时间时，间隔计算与 datetime 相减一样抛出 TypeError"""
+        items = [{'_collection_time': '2024-01-01T00:00:00'}, {'_collection_time': '2024-01-02T00:00:00Z'}]
+
+        with pytest.raises(TypeError):
+            TimeIndex.from_items(items).intervals_days()
+
+    def test_shared_index_matches_per_detector_index(self):
+        """周期、趋势和爆发检测传入共享索引与各自构建索引的结果一致"""
+        recognizer = PatternRecognizer({})
+        items = sorted(generate_synthetic_corpus(300, seed=7), key=lambda x: x.get('_collection_time', ''))
+        time_index = TimeIndex.from_items(items)
+
+        for detect in (recognizer._detect_periodic_patterns, recognizer._detect_trend_patterns,
+                       recognizer._detect_burst_patterns):
+            assert detect(items, time_index) == detect(items)
+
+
+class TestConvergencePatterns:
+    """收敛模式检测测试"""
+
+    @staticmethod
+    def window_diversity(items, window_size):
+        """逐窗口合并概念集合的参考实现"""
+        concept_sets = [
+            {token.lower() for token in (item.get('content', '') + ' ' + item.get('title', '')).split()
+             if len(token) > 3 and token.isalpha()}
+            for item in items
+        ]
+        scores = []
+        for i in range(len(items) - window_size + 1):
+            window = set().union(*concept_sets[i:i + window_size])
+            scores.append(min(len(window) / window_size, 1.0))
+        return scores
+
+    def test_detects_shrinking_diversity(self):
+        """多样性逐窗口下降时识别为收敛"""
+        contents = ['alpha beta gamma delta', 'epsilon zeta', 'omega', 'omega', 'omega']
+        items = [{'content': content, 'title': '', '_collection_time': f'2024-01-0{i + 1}T00:00:00'}
+                 for i, content in enumerate(contents)]
+
+        assert self.window_diversity(items, 3) == [1.0, 1.0, 1 / 3]
+        patterns = PatternRecognizer({})._detect_convergence_patterns(items)
+        assert [pattern.pattern_type for pattern in patterns] == ['convergence']
+        assert patterns[0].strength == pytest.approx(1 / 3)
+
+    def test_sliding_counts_match_window_union(self, monkeypatch):
+        """滑动计数得到的多样性序列与逐窗口合并一致"""
+        items = generate_synthetic_corpus(200, seed=11)
+        captured = {}
+
+        def capture(x, y):
+            captured['scores'] = list(y)
+            raise ValueError
+
+        import pattern_recognizer
+        monkeypatch.setattr(pattern_recognizer.stats, 'linregress', capture)
+        with pytest.raises(ValueError):
+            PatternRecognizer({})._detect_convergence_patterns(items)
+
+        assert captured['scores'] == self.window_diversity(items, max(3, len(items) // 10))
@@ -0,0 +1,103 @@
+"""
+采集时间索引
+把一组知识项已解析的采集时间转换为 numpy datetime64 数组，并按日分桶，供各时间相关的检测和指标向量化计算
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from document_cache import parse_collection_time
+
+
+# 一天的微秒数
+_DAY = np.int64(86_400_000_000)
+
+
+class TimeIndex:
+    """知识项采集时间索引
+
+    与 datetime 的语义保持一致：按日分桶使用各时间自身时区的日期（datetime.date()），
+    时间间隔按绝对时刻计算并向下取整到天（timedelta.days）。
+    缺少采集时间的知识项不参与分桶和间隔计算
+    """
+
+    def __init__(self, collection_times: Sequence[Optional[datetime]]):
+        self.size = len(collection_times)
+        positions = [i for i, ts in enumerate(collection_times) if ts is not None]
+        times = [collection_times[i] for i in positions]
+
+        # 有采集时间的知识项在原列表中的位置
+        self.positions = np.array(positions, dtype=np.int64)
+
+        # 本地时间（去掉时区）和绝对时刻（有时区的换算到 UTC），单位微秒
+        aware = [i for i, ts in enumerate(times) if ts.tzinfo is not None]
+        for i in aware:
+            times[i] = times[i].replace(tzinfo=None)
+        self.local_times = _to_datetime64(times)
+
+        offsets = np.zeros(len(times), dtype='timedelta64[us]')
+        if aware:
+            offsets[aware] = np.array([collection_times[positions[i]].utcoffset() or timedelta(0) for i in aware],
+                                      dtype='timedelta64[us]')
+        self.instants = self.local_times - offsets
+        self.mixed_timezones = 0 < len(aware) < len(times)
+
+        # 按日分桶：days 为排序后的日期，day_ids 为各知识项所在桶的编号
+        item_days = self.local_times.astype('datetime64[D]')
+        self.days, self.day_ids, self.day_counts = np.unique(item_days, return_inverse=True, return_counts=True)
+        self.day_ids = self.day_ids.reshape(-1)
+        self._item_days = item_days
+
+    @classmethod
+    def from_items(cls, knowledge_items: List[Dict[str, Any]]) -> 'TimeIndex':
+        """解析知识项的 _collection_time 构建索引，不需要分词结果"""
+        return cls([parse_collection_time(item.get('_collection_time', '')) for item in knowledge_items])
+
+    def __len__(self) -> int:
+        """有采集时间的知识项数"""
+        return len(self.positions)
+
+    def dates(self) -> List[date]:
+        """排序后的日期"""
+        return self.days.astype(object).tolist()
+
+    def intervals_days(self) -> np.ndarray:
+        """相邻知识项的时间间隔（天，向下取整）
+
+        与 datetime 相减一致，同时存在有时区和无时区的时间时抛出 TypeError
+        """
+        if self.mixed_timezones:
+            raise TypeError("can't subtract offset-naive and offset-aware datetimes")
+        return np.diff(self.instants.astype(np.int64)) // _DAY
+
+    def daily_runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """按列表顺序把同一日期的连续知识项合并，返回各段的日期和知识项数"""
+        if not len(self):
+            return self._item_days, np.zeros(0, dtype=np.int64)
+
+        starts = np.flatnonzero(np.concatenate(([True], self._item_days[1:] != self._item_days[:-1])))
+        counts = np.diff(np.append(starts, len(self)))
+        return self._item_days[starts], counts
+
+    def groups_by_day(self) -> List[Tuple[date, np.ndarray]]:
+        """按日期排序的 (日期, 当日知识项在原列表中的位置)，位置保持原有顺序"""
+        order = np.argsort(self.day_ids, kind='stable')
+        boundaries = np.cumsum(self.day_counts)[:-1]
+        return list(zip(self.dates(), np.split(self.positions[order], boundaries)))
+
+    def age_days(self, now: datetime) -> np.ndarray:
+        """各知识项本地时间距 now（无时区）的天数，向下取整"""
+        now = np.datetime64(now.replace(tzinfo=None), 'us')
+        return (now - self.local_times).astype(np.int64) // _DAY
+
+
+def _to_datetime64(times: List[datetime]) -> np.ndarray:
+    """无时区 datetime 列表转换为 datetime64[us]（pandas 批量转换远快于逐个转换）"""
+    try:
+        return pd.DatetimeIndex(times).values.astype('datetime64[us]')
+    except (ValueError, OverflowError):
+        # 年份超出 pandas 纳秒精度的表示范围
+        return np.array(times, dtype='datetime64[us]')
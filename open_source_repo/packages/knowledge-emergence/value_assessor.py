@@ -11,6 +11,10 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 import json
 
+from document_cache import AnalyzedDocument, DocumentCache, get_document
+from keyword_matcher import KeywordMatcher
+from parallel import map_batches_in_processes, resolve_workers
+
 
 @dataclass
 class ValueAssessment:
@@ -76,12 +80,50 @@ class ValueAssessor:
         }
         
         self.industry_benchmarks = config.get('industry_benchmarks', industry_value_benchmarks)
+        
+        # 技术成熟度指示词
+        self.maturity_indicators = {
+            'high': ['成熟', '稳定', '标准', '商业化', '规模化'],
+            'medium': ['发展中', '改进', '优化', '完善'],
+            'low': ['实验', '概念', '原型', '设想']
+        }
+        
+        # 各项评估使用的指示词，编译为一个匹配器，每个文本只扫描一次
+        self.keyword_matcher = KeywordMatcher({
+            'market': ['市场', '需求', '用户', '客户', '商业', '产业', '行业'],
+            'benefit': ['效益', '收益', '节约', '效率', '优化', '改善'],
+            'cost': ['成本', '费用', '投入', '投资'],
+            'investment': ['投资', '融资', '资本', '资金', '回报', '收益'],
+            'public': ['公共', '社会', '大众', '全民', '普遍', '广泛'],
+            'education': ['教育', '学习', '培训', '知识', '技能', '能力', '理解'],
+            'structured': ['定义', '概念', '原理', '方法', '步骤', '框架'],
+            'culture': ['文化', '传统', '历史', '遗产', '价值观', '精神'],
+            'scope': ['全球', '国际', '全国', '广泛', '深远', '重大'],
+            'feasibility_positive': ['可行', '容易', '简单', '直接', '立即', '快速'],
+            'feasibility_negative': ['困难', '复杂', '困难', '耗时', '昂贵'],
+            'tool': ['工具', '软件', '系统', '平台', '框架', '库', '接口'],
+            'originality': ['原创', '首创', '独特', '新颖', '首次', '独创'],
+            'common_phrases': ['众所周知', '一般认为', '通常', '常见'],
+            'disruption': ['颠覆', '革命性', '突破性', '变革', '重新定义', '改变游戏规则'],
+            'cutting_edge': ['前沿', '先进', '最新', '新兴', '未来', '下一代'],
+            'risk': ['风险', '挑战', '问题', '困难', '限制', '不足'],
+            **{f'indicator_{value_type}_{level}': words
+               for value_type, levels in self.value_indicators.items() for level, words in levels.items()},
+            **{f'maturity_{level}': words for level, words in self.maturity_indicators.items()}
+        })
+        
+        # 由分析器注入的共享文档缓存
+        self.document_cache: Optional[DocumentCache] = None
+    
+    def _get_document(self, knowledge_item: Dict[str, Any]) -> AnalyzedDocument:
+        """获取知识项的分词结果"""
+        return get_document(self.document_cache, knowledge_item)
     
     def assess_economic_value(self, knowledge_item: Dict[str, Any], 
                             context: Dict[str, Any] = None) -> Tuple[float, Dict[str, Any]]:
         """评估经济价值"""
         try:
-            text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+            text = self._get_document(knowledge_item).text
             
             if not text.strip():
                 return 0.0, {"reason": "空文本内容"}
@@ -135,7 +177,7 @@ class ValueAssessor:
                           context: Dict[str, Any] = None) -> Tuple[float, Dict[str, Any]]:
         """评估社会价值"""
         try:
-            text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+            text = self._get_document(knowledge_item).text
             
             if not text.strip():
                 return 0.0, {"reason": "空文本内容"}
@@ -189,7 +231,7 @@ class ValueAssessor:
                                context: Dict[str, Any] = None) -> Tuple[float, Dict[str, Any]]:
         """评估应用价值"""
         try:
-            text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+            text = self._get_document(knowledge_item).text
             
             if not text.strip():
                 return 0.0, {"reason": "空文本内容"}
@@ -238,7 +280,7 @@ class ValueAssessor:
                               context: Dict[str, Any] = None) -> Tuple[float, Dict[str, Any]]:
         """评估创新价值"""
         try:
-            text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+            text = self._get_document(knowledge_item).text
             
             if not text.strip():
                 return 0.0, {"reason": "空文本内容"}
@@ -347,6 +389,14 @@ class ValueAssessor:
     def assess_batch_value(self, knowledge_items: List[Dict[str, Any]], 
                          context: Dict[str, Any] = None) -> List[ValueAssessment]:
         """批量价值评估"""
+        # 未注入文档缓存时（单独调用或在进程池中）为本批知识项构建一次，各评估维度共享分词结果
+        if self.document_cache is None:
+            self.document_cache = DocumentCache(knowledge_items)
+            try:
+                return self.assess_batch_value(knowledge_items, context)
+            finally:
+                self.document_cache = None
+        
         results = []
         
         for i, item in enumerate(knowledge_items):
@@ -364,6 +414,32 @@ class ValueAssessor:
         
         return results
     
+    def assess_batch_value_parallel(self, knowledge_items: List[Dict[str, Any]], 
+                                    context: Dict[str, Any] = None, max_workers: int = None,
+                                    chunk_size: int = 100) -> List[ValueAssessment]:
+        """多进程批量价值评估，按分块分发知识项，结果顺序与输入一致"""
+        workers = resolve_workers(max_workers)
+        if workers <= 1 or len(knowledge_items) <= chunk_size:
+            return self.assess_batch_value(knowledge_items, context)
+        
+        try:
+            self.logger.info(f"使用 {workers} 个进程并行价值评估 {len(knowledge_items)} 项")
+            return map_batches_in_processes(
+                ValueAssessor, self.config, 'assess_batch_value', knowledge_items, (context,),
+                max_workers=workers, chunk_size=chunk_size
+            )
+        except Exception as e:
+            self.logger.error(f"并行价值评估失败，改为串行评估: {e}")
+            return self.assess_batch_value(knowledge_items, context)
+    
+    def time_signature(self, knowledge_item: Dict[str, Any]) -> List[float]:
+        """评估结果中随当前时间变化的部分，即含时间因子的投资价值和前沿性
+
+        时间因子降到下限、或没有相关词汇时两者不再随时间变化；取值与评估时相同时评估结果与重新评估一致，
+        增量分析据此判断已保存的结果是否过期
+        """
+        return [self._assess_investment_value(knowledge_item), self._assess_cutting_edge(knowledge_item)]
+    
     def compare_value_dimensions(self, value_assessments: List[ValueAssessment]) -> Dict[str, Any]:
         """比较不同价值维度"""
         if not value_assessments:
@@ -423,20 +499,18 @@ class ValueAssessor:
         
         text_lower = text.lower()
         
-        for level, words in self.value_indicators[value_type].items():
-            count = sum(1 for word in words if word in text_lower)
-            indicators[level] = count
+        for level in self.value_indicators[value_type]:
+            indicators[level] = self.keyword_matcher.count(f'indicator_{value_type}_{level}', text_lower)
         
         return indicators
     
     def _assess_market_potential(self, knowledge_item: Dict[str, Any], 
                                context: Dict[str, Any] = None) -> float:
         """评估市场潜力"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 市场相关词汇
-        market_indicators = ['市场', '需求', '用户', '客户', '商业', '产业', '行业']
-        market_score = sum(1 for indicator in market_indicators if indicator in text)
+        market_score = self.keyword_matcher.count('market', text)
         
         # 目标市场分析
         target_market = context.get('target_market', '') if context else ''
@@ -447,15 +521,13 @@ class ValueAssessor:
     
     def _assess_cost_benefit(self, knowledge_item: Dict[str, Any]) -> float:
         """评估成本效益"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 效益相关词汇
-        benefit_words = ['效益', '收益', '节约', '效率', '优化', '改善']
-        benefit_count = sum(1 for word in benefit_words if word in text)
+        benefit_count = self.keyword_matcher.count('benefit', text)
         
         # 成本相关词汇
-        cost_words = ['成本', '费用', '投入', '投资']
-        cost_count = sum(1 for word in cost_words if word in text)
+        cost_count = self.keyword_matcher.count('cost', text)
         
         if cost_count > 0:
             benefit_ratio = benefit_count / cost_count
@@ -465,24 +537,19 @@ class ValueAssessor:
     
     def _assess_investment_value(self, knowledge_item: Dict[str, Any]) -> float:
         """评估投资价值"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 投资相关词汇
-        investment_indicators = ['投资', '融资', '资本', '资金', '回报', '收益']
-        investment_score = sum(1 for indicator in investment_indicators if indicator in text)
+        investment_score = self.keyword_matcher.count('investment', text)
         
         # 时间因子
-        collection_time = knowledge_item.get('_collection_time', '')
+        time_obj = self._get_document(knowledge_item).collection_time
         time_factor = 0.5  # 默认时间因子
         
-        if collection_time:
-            try:
-                time_obj = datetime.fromisoformat(collection_time.replace('Z', '+00:00'))
-                days_old = (datetime.now() - time_obj.replace(tzinfo=None)).days
-                # 较新的知识通常有更好的投资价值
-                time_factor = max(0.3, 1 - days_old / 365)
-            except:
-                pass
+        if time_obj is not None:
+            days_old = (datetime.now() - time_obj.replace(tzinfo=None)).days
+            # 较新的知识通常有更好的投资价值
+            time_factor = max(0.3, 1 - days_old / 365)
         
         return min(investment_score / 5 * time_factor, 1.0)
     
@@ -500,62 +567,51 @@ class ValueAssessor:
     
     def _assess_public_benefit(self, knowledge_item: Dict[str, Any]) -> float:
         """评估公共利益"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 公共利益相关词汇
-        public_indicators = ['公共', '社会', '大众', '全民', '普遍', '广泛']
-        public_score = sum(1 for indicator in public_indicators if indicator in text)
+        public_score = self.keyword_matcher.count('public', text)
         
         return min(public_score / 5, 1.0)
     
     def _assess_educational_value(self, knowledge_item: Dict[str, Any]) -> float:
         """评估教育价值"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 教育相关词汇
-        education_indicators = ['教育', '学习', '培训', '知识', '技能', '能力', '理解']
-        education_score = sum(1 for indicator in education_indicators if indicator in text)
+        education_score = self.keyword_matcher.count('education', text)
         
         # 结构化程度
-        structured_indicators = ['定义', '概念', '原理', '方法', '步骤', '框架']
-        structure_score = sum(1 for indicator in structured_indicators if indicator in text)
+        structure_score = self.keyword_matcher.count('structured', text)
         
         return min((education_score + structure_score) / 10, 1.0)
     
     def _assess_cultural_value(self, knowledge_item: Dict[str, Any]) -> float:
         """评估文化价值"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 文化相关词汇
-        culture_indicators = ['文化', '传统', '历史', '遗产', '价值观', '精神']
-        culture_score = sum(1 for indicator in culture_indicators if indicator in text)
+        culture_score = self.keyword_matcher.count('culture', text)
         
         return min(culture_score / 5, 1.0)
     
     def _assess_impact_scope(self, knowledge_item: Dict[str, Any]) -> float:
         """评估影响范围"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 影响范围相关词汇
-        scope_indicators = ['全球', '国际', '全国', '广泛', '深远', '重大']
-        scope_score = sum(1 for indicator in scope_indicators if indicator in text)
+        scope_score = self.keyword_matcher.count('scope', text)
         
         return min(scope_score / 5, 1.0)
     
     def _assess_technology_maturity(self, knowledge_item: Dict[str, Any]) -> float:
         """评估技术成熟度"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 成熟度指示词
-        maturity_indicators = {
-            'high': ['成熟', '稳定', '标准', '商业化', '规模化'],
-            'medium': ['发展中', '改进', '优化', '完善'],
-            'low': ['实验', '概念', '原型', '设想']
-        }
-        
         maturity_score = 0
-        for level, indicators in maturity_indicators.items():
-            count = sum(1 for indicator in indicators if indicator in text)
+        for level in self.maturity_indicators:
+            count = self.keyword_matcher.count(f'maturity_{level}', text)
             if level == 'high':
                 maturity_score += count * 1.0
             elif level == 'medium':
@@ -568,73 +624,61 @@ class ValueAssessor:
     def _assess_feasibility(self, knowledge_item: Dict[str, Any], 
                           context: Dict[str, Any] = None) -> float:
         """评估可实施性"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 可实施性指示词
-        feasibility_positive = ['可行', '容易', '简单', '直接', '立即', '快速']
-        feasibility_negative = ['困难', '复杂', '困难', '耗时', '昂贵']
-        
-        positive_count = sum(1 for word in feasibility_positive if word in text)
-        negative_count = sum(1 for word in feasibility_negative if word in text)
+        positive_count = self.keyword_matcher.count('feasibility_positive', text)
+        negative_count = self.keyword_matcher.count('feasibility_negative', text)
         
         feasibility_score = positive_count - negative_count * 0.5
         return max(0, min(feasibility_score / 5, 1.0))
     
     def _assess_tool_potential(self, knowledge_item: Dict[str, Any]) -> float:
         """评估工具化潜力"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 工具化指示词
-        tool_indicators = ['工具', '软件', '系统', '平台', '框架', '库', '接口']
-        tool_score = sum(1 for indicator in tool_indicators if indicator in text)
+        tool_score = self.keyword_matcher.count('tool', text)
         
         return min(tool_score / 5, 1.0)
     
     def _assess_originality(self, knowledge_item: Dict[str, Any]) -> float:
         """评估原创性"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 原创性指示词
-        originality_indicators = ['原创', '首创', '独特', '新颖', '首次', '独创']
-        originality_score = sum(1 for indicator in originality_indicators if indicator in text)
+        originality_score = self.keyword_matcher.count('originality', text)
         
         # 避免常见表述
-        common_phrases = ['众所周知', '一般认为', '通常', '常见']
-        common_count = sum(1 for phrase in common_phrases if phrase in text)
+        common_count = self.keyword_matcher.count('common_phrases', text)
         
         originality_final = originality_score - common_count * 0.3
         return max(0, min(originality_final / 5, 1.0))
     
     def _assess_disruption_potential(self, knowledge_item: Dict[str, Any]) -> float:
         """评估颠覆性潜力"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 颠覆性指示词
-        disruption_indicators = ['颠覆', '革命性', '突破性', '变革', '重新定义', '改变游戏规则']
-        disruption_score = sum(1 for indicator in disruption_indicators if indicator in text)
+        disruption_score = self.keyword_matcher.count('disruption', text)
         
         return min(disruption_score / 5, 1.0)
     
     def _assess_cutting_edge(self, knowledge_item: Dict[str, Any], 
                            context: Dict[str, Any] = None) -> float:
         """评估前沿性"""
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
+        text = self._get_document(knowledge_item).text
         
         # 前沿性指示词
-        cutting_edge_indicators = ['前沿', '先进', '最新', '新兴', '未来', '下一代']
-        cutting_edge_score = sum(1 for indicator in cutting_edge_indicators if indicator in text)
+        cutting_edge_score = self.keyword_matcher.count('cutting_edge', text)
         
         # 时间因子
-        collection_time = knowledge_item.get('_collection_time', '')
+        time_obj = self._get_document(knowledge_item).collection_time
         time_factor = 0.5
         
-        if collection_time:
-            try:
-                time_obj = datetime.fromisoformat(collection_time.replace('Z', '+00:00'))
-                days_old = (datetime.now() - time_obj.replace(tzinfo=None)).days
-                time_factor = max(0.3, 1 - days_old / 180)  # 半年内的知识
-            except:
-                pass
+        if time_obj is not None:
+            days_old = (datetime.now() - time_obj.replace(tzinfo=None)).days
+            time_factor = max(0.3, 1 - days_old / 180)  # 半年内的知识
         
         return min(cutting_edge_score / 5 * time_factor, 1.0)
     
@@ -707,9 +751,8 @@ class ValueAssessor:
             risk_factors.append("创新价值有限，竞争力不足")
         
         # 检查文本中的风险提示
-        text = knowledge_item.get('content', '') + ' ' + knowledge_item.get('title', '')
-        risk_keywords = ['风险', '挑战', '问题', '困难', '限制', '不足']
-        if any(keyword in text for keyword in risk_keywords):
+        text = self._get_document(knowledge_item).text
+        if self.keyword_matcher.contains_any('risk', text):
             risk_factors.append("知识内容本身包含风险提示，需要谨慎评估")
         
         return risk_factors
@@ -3,6 +3,7 @@
 生成各种图表和可视化结果
 """
 
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import seaborn as sns
@@ -13,9 +14,15 @@ from datetime import datetime, timedelta
 import logging
 from pathlib import Path
 import json
+import os
+import shutil
+import hashlib
 from collections import Counter, defaultdict
 import warnings
 
+from parallel import map_batches_in_processes, resolve_workers
+from downsampling import lttb_indices, percentile_bands
+
 # 设置中文字体
 plt.rcParams['font.sans-serif'] = ['SimHei', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
@@ -23,6 +30,28 @@ plt.rcParams['axes.unicode_minus'] = False
 # 忽略警告
 warnings.filterwarnings('ignore')
 
+# 图表绘制逻辑变化时递增，使旧的渲染缓存失效
+RENDER_CACHE_VERSION = 1
+
+# 每次运行都会变化但不参与绘图的字段，计算数据指纹时忽略
+FINGERPRINT_IGNORED_KEYS = frozenset({'calculation_time', 'assessment_time', 'analysis_time'})
+
+
+def _strip_ignored_keys(data: Any) -> Any:
+    """递归移除不参与绘图的字段"""
+    if isinstance(data, dict):
+        return {key: _strip_ignored_keys(value) for key, value in data.items()
+                if key not in FINGERPRINT_IGNORED_KEYS}
+    if isinstance(data, (list, tuple)):
+        return [_strip_ignored_keys(value) for value in data]
+    return data
+
+
+def _create_render_worker(config: Dict[str, Any]) -> 'Visualizer':
+    """在渲染进程中切换到无界面的 Agg 后端并创建可视化生成器"""
+    plt.switch_backend('Agg')
+    return Visualizer(config)
+
 
 class Visualizer:
     """知识涌现可视化生成器"""
@@ -41,9 +70,31 @@ class Visualizer:
         }
         
         # 输出目录
-        self.output_dir = Path(config.get('output_dir', 'visualizations'))
+        self.output_dir = Path(self.config.get('output_dir', 'visualizations'))
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # 图片输出分辨率和格式（png、svg、pdf 等 matplotlib 支持的格式）
+        self.output_dpi = self.config.get('output_dpi', 300)
+        self.image_format = self.config.get('image_format', 'png')
+        
+        # 渲染模式：'sequential' 顺序渲染；'parallel' 在进程池中并行渲染互相独立的图表；
+        # 'auto' 在有多个CPU核心时并行
+        self.render_mode = self.config.get('render_mode', 'auto')
+        self.render_workers = self.config.get('render_workers')
+        
+        # 大序列绘图：数据点超过 max_plot_points 时，'bands' 按 aggregate_bins 个区间绘制分位数带，
+        # 'lttb' 把折线降采样到 max_plot_points 个点
+        self.max_plot_points = self.config.get('max_plot_points', 2000)
+        self.aggregate_bins = self.config.get('aggregate_bins', 200)
+        self.large_series_mode = self.config.get('large_series_mode', 'bands')
+        
+        # 渲染缓存：以图表输入数据的指纹为键保存已渲染的图片，数据未变化时直接复制
+        self.render_cache_enabled = self.config.get('render_cache', True)
+        self.render_cache_dir = Path(self.config.get('render_cache_dir') or self.output_dir / '.render_cache')
+        self.render_cache_max_entries = self.config.get('render_cache_max_entries', 200)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
         # 图表类型配置
         self.chart_configs = {
             'timeline': {'type': 'line', 'color': '#2E86AB'},
@@ -82,9 +133,7 @@ class Visualizer:
             
             plt.tight_layout()
             
-            output_path = self.output_dir / output_filename
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_path = self._save_figure(output_filename)
             
             self.logger.info(f"指标概览可视化已保存: {output_path}")
             return str(output_path)
@@ -119,9 +168,7 @@ class Visualizer:
             
             plt.tight_layout()
             
-            output_path = self.output_dir / output_filename
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_path = self._save_figure(output_filename)
             
             self.logger.info(f"模式分析可视化已保存: {output_path}")
             return str(output_path)
@@ -156,9 +203,7 @@ class Visualizer:
             
             plt.tight_layout()
             
-            output_path = self.output_dir / output_filename
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_path = self._save_figure(output_filename)
             
             self.logger.info(f"质量分析可视化已保存: {output_path}")
             return str(output_path)
@@ -193,9 +238,7 @@ class Visualizer:
             
             plt.tight_layout()
             
-            output_path = self.output_dir / output_filename
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_path = self._save_figure(output_filename)
             
             self.logger.info(f"价值分析可视化已保存: {output_path}")
             return str(output_path)
@@ -243,9 +286,7 @@ class Visualizer:
             ax7 = fig.add_subplot(gs[2, :])
             self._create_key_indicators_chart(ax7, analysis_results)
             
-            output_path = self.output_dir / output_filename
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_path = self._save_figure(output_filename)
             
             self.logger.info(f"综合仪表板已保存: {output_path}")
             return str(output_path)
@@ -296,6 +337,129 @@ class Visualizer:
             self.logger.error(f"导出数据可视化失败: {e}")
             return ""
     
+    def render_charts(self, jobs: List[Tuple[str, Any, str]]) -> List[str]:
+        """渲染多个互相独立的图表
+        
+        jobs 为 (生成方法名, 数据, 输出文件名) 列表，返回成功生成的文件路径，顺序与 jobs 一致。
+        并行模式下每个图表在独立进程中以 Agg 后端渲染，进程池不可用时退回顺序渲染
+        """
+        if not jobs:
+            return []
+        
+        # 先从渲染缓存中取出输入数据未变化的图表
+        output_files = [None] * len(jobs)
+        fingerprints = [None] * len(jobs)
+        if self.render_cache_enabled:
+            for i, (method_name, data, output_filename) in enumerate(jobs):
+                fingerprints[i] = self._fingerprint(method_name, data)
+                output_files[i] = self._load_cached_chart(fingerprints[i], output_filename)
+        
+        pending = [i for i, output_file in enumerate(output_files) if output_file is None]
+        if self.render_cache_enabled:
+            self.cache_hits += len(jobs) - len(pending)
+            self.cache_misses += len(pending)
+        
+        for i, output_file in zip(pending, self._render_uncached([jobs[i] for i in pending])):
+            output_files[i] = output_file
+            if output_file and self.render_cache_enabled:
+                self._store_cached_chart(fingerprints[i], output_file)
+        
+        return [output_file for output_file in output_files if output_file]
+    
+    def _render_uncached(self, jobs: List[Tuple[str, Any, str]]) -> List[str]:
+        """按渲染模式顺序或在进程池中渲染图表"""
+        if not jobs:
+            return []
+        
+        workers = min(resolve_workers(self.render_workers), len(jobs))
+        parallel = self.render_mode == 'parallel' or (self.render_mode == 'auto' and workers > 1)
+        
+        if parallel and len(jobs) > 1:
+            try:
+                self.logger.info(f"并行渲染 {len(jobs)} 个图表，进程数: {workers}")
+                worker_config = dict(self.config, output_dir=str(self.output_dir))
+                return map_batches_in_processes(
+                    _create_render_worker, worker_config, '_render_jobs', jobs,
+                    max_workers=workers, chunk_size=1
+                )
+            except Exception as e:
+                self.logger.warning(f"并行渲染失败，改为顺序渲染: {e}")
+        
+        return self._render_jobs(jobs)
+    
+    def _render_jobs(self, jobs: List[Tuple[str, Any, str]]) -> List[str]:
+        """依次渲染图表"""
+        return [getattr(self, method_name)(data, output_filename) for method_name, data, output_filename in jobs]
+    
+    def _fingerprint(self, method_name: str, data: Any) -> str:
+        """图表输入数据及渲染参数的指纹"""
+        payload = json.dumps(
+            [RENDER_CACHE_VERSION, matplotlib.__version__, method_name,
+             self.output_dpi, self.image_format, _strip_ignored_keys(data)],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _cache_path(self, fingerprint: str) -> Path:
+        return self.render_cache_dir / f"{fingerprint}.{self.image_format}"
+    
+    def _load_cached_chart(self, fingerprint: str, output_filename: str) -> Optional[str]:
+        """缓存命中时把已渲染的图片复制到输出路径，未命中返回 None"""
+        cache_path = self._cache_path(fingerprint)
+        if not cache_path.exists():
+            return None
+        
+        try:
+            output_path = self._output_path(output_filename)
+            shutil.copyfile(cache_path, output_path)
+            os.utime(cache_path)  # 更新访问顺序，清理时优先删除最久未使用的条目
+            self.logger.info(f"图表数据未变化，复用缓存: {output_path}")
+            return str(output_path)
+        except OSError as e:
+            self.logger.warning(f"读取渲染缓存失败: {e}")
+            return None
+    
+    def _store_cached_chart(self, fingerprint: str, output_file: str):
+        """把新渲染的图片写入缓存，并清理超出数量上限的旧条目"""
+        try:
+            self.render_cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_path = self._cache_path(fingerprint)
+            temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            shutil.copyfile(output_file, temp_path)
+            os.replace(temp_path, cache_path)
+            
+            entries = sorted(self.render_cache_dir.glob(f"*.{self.image_format}"),
+                             key=lambda path: path.stat().st_mtime)
+            for path in entries[:max(0, len(entries) - self.render_cache_max_entries)]:
+                path.unlink()
+        except OSError as e:
+            self.logger.warning(f"写入渲染缓存失败: {e}")
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """获取渲染缓存命中统计"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'enabled': self.render_cache_enabled,
+            'cache_dir': str(self.render_cache_dir),
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': round(self.cache_hits / lookups, 4) if lookups else 0.0
+        }
+    
+    def _output_path(self, output_filename: str) -> Path:
+        """输出文件路径，扩展名与配置的图片格式保持一致"""
+        output_path = self.output_dir / output_filename
+        if self.image_format and output_path.suffix.lower() != f'.{self.image_format}':
+            output_path = output_path.with_suffix(f'.{self.image_format}')
+        return output_path
+    
+    def _save_figure(self, output_filename: str) -> Path:
+        """按配置的分辨率和格式保存当前图表并关闭"""
+        output_path = self._output_path(output_filename)
+        plt.savefig(output_path, dpi=self.output_dpi, format=self.image_format, bbox_inches='tight')
+        plt.close()
+        return output_path
+    
     # 私有方法：具体图表生成方法
     
     def _create_radar_chart(self, ax, metrics_data: Dict[str, Any]):
@@ -634,8 +798,6 @@ class Visualizer:
                 ax.text(0.5, 0.5, '数据点不足', ha='center', va='center', transform=ax.transAxes)
                 return
             
-            # 模拟时间序列
-            indices = range(len(quality_scores))
             trend_values = []
             
             for i, qs in enumerate(quality_scores):
@@ -645,7 +807,7 @@ class Visualizer:
                     scores = [qs.get(dim, 0) for dim in ['accuracy', 'completeness', 'consistency', 'credibility', 'relevance']]
                     trend_values.append(np.mean(scores))
             
-            ax.plot(indices, trend_values, marker='o', color='#C73E1D', linewidth=2)
+            self._plot_trend(ax, trend_values)
             ax.set_title('质量变化趋势', fontweight='bold')
             ax.set_xlabel('时间顺序')
             ax.set_ylabel('质量评分')
@@ -655,6 +817,26 @@ class Visualizer:
             self.logger.error(f"创建质量趋势图失败: {e}")
             ax.text(0.5, 0.5, '质量趋势图生成失败', ha='center', va='center', transform=ax.transAxes)
     
+    def _plot_trend(self, ax, values: List[float], color: str = '#C73E1D'):
+        """按时间顺序绘制趋势，数据点过多时降采样或改为分位数带，绘图耗时与数据量无关"""
+        values = np.asarray(values, dtype=float)
+        indices = np.arange(len(values))
+        
+        if len(values) <= self.max_plot_points:
+            ax.plot(indices, values, marker='o', color=color, linewidth=2)
+            return
+        
+        if self.large_series_mode == 'lttb':
+            selected = lttb_indices(indices, values, self.max_plot_points)
+            ax.plot(selected, values[selected], color=color, linewidth=1)
+            return
+        
+        centers, bands = percentile_bands(values, self.aggregate_bins, (10, 25, 50, 75, 90))
+        ax.fill_between(centers, bands[0], bands[4], color=color, alpha=0.15, linewidth=0, label='P10-P90')
+        ax.fill_between(centers, bands[1], bands[3], color=color, alpha=0.3, linewidth=0, label='P25-P75')
+        ax.plot(centers, bands[2], color=color, linewidth=2, label='中位数')
+        ax.legend(loc='best', fontsize=8)
+    
     def _create_quality_comparison_chart(self, ax, quality_scores: List[Dict[str, Any]]):
         """创建质量对比图"""
         try:
@@ -759,7 +941,6 @@ class Visualizer:
                 ax.text(0.5, 0.5, '数据点不足', ha='center', va='center', transform=ax.transAxes)
                 return
             
-            indices = range(len(value_assessments))
             trend_values = []
             
             for va in value_assessments:
@@ -769,7 +950,7 @@ class Visualizer:
                     scores = [va.get(dim, 0) for dim in ['economic_value', 'social_value', 'application_value', 'innovation_value']]
                     trend_values.append(np.mean(scores))
             
-            ax.plot(indices, trend_values, marker='o', color='#C73E1D', linewidth=2)
+            self._plot_trend(ax, trend_values)
             ax.set_title('价值变化趋势', fontweight='bold')
             ax.set_xlabel('时间顺序')
             ax.set_ylabel('价值评分')